@@ -0,0 +1,85 @@
+"""
+Time building each form with uic.loadUi() against the cached form classes
+
+Run from the project root (no display needed):
+
+    python benchmarks/bench_form_loading.py [--repeat N]
+
+For every .ui file the script reports the mean time of:
+    loadUi     - uic.loadUi() on every open (the previous behaviour)
+    first open - load_form() with an empty cache (class compiled or imported)
+    reopen     - load_form() with the class cached (what users see afterwards)
+
+Precompile with `python -m src.ui.base.form_loader` first to measure the
+precompiled modules instead of the in-memory loadUiType() fallback.
+"""
+
+import argparse
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6 import uic
+from PyQt6.QtWidgets import QApplication, QDialog, QMainWindow, QWidget
+
+from src.config import Settings
+from src.ui.base import form_loader
+
+
+ROOT_CLASSES = {'QMainWindow': QMainWindow, 'QDialog': QDialog}
+
+
+def root_class(ui_path):
+    """Widget class of a form's top-level widget"""
+    widget = ET.parse(ui_path).getroot().find('widget')
+    return ROOT_CLASSES.get(widget.get('class'), QWidget)
+
+
+def timed(build, widget_class, repeat):
+    """Mean milliseconds to build a form on a fresh widget"""
+    total = 0.0
+    for _ in range(repeat):
+        widget = widget_class()
+        start = time.perf_counter()
+        build(widget)
+        total += time.perf_counter() - start
+        widget.deleteLater()
+    QApplication.processEvents()
+    return total / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20, help="Opens per form")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    names = sorted(n for n in os.listdir(Settings.UI_FORMS_DIR) if n.endswith(".ui"))
+    print(f"{'form':32} {'loadUi':>9} {'first open':>11} {'reopen':>9} {'speedup':>8}")
+
+    totals = [0.0, 0.0, 0.0]
+    for name in names:
+        ui_path = Settings.get_ui_file(name)
+        widget_class = root_class(ui_path)
+
+        before = timed(lambda w: uic.loadUi(ui_path, w), widget_class, args.repeat)
+        form_loader.clear_cache()
+        first = timed(lambda w: form_loader.load_form(w, name), widget_class, 1)
+        after = timed(lambda w: form_loader.load_form(w, name), widget_class, args.repeat)
+
+        for i, value in enumerate((before, first, after)):
+            totals[i] += value
+        print(f"{name:32} {before:8.2f}ms {first:10.2f}ms {after:8.2f}ms {before / after:7.1f}x")
+
+    before, first, after = totals
+    print(f"{'total':32} {before:8.2f}ms {first:10.2f}ms {after:8.2f}ms {before / after:7.1f}x")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Measure PDF report rendering time and memory against the number of rows
+
+Run from the project root (no display or database needed):
+
+    python benchmarks/bench_report_rendering.py [--rows N] [--steps K] [--memory]
+
+Renders stock-report-shaped rows with TablePdfRenderer at K evenly spaced
+sizes up to N (default 100,000), fed from a generator as ReportService does
+with DBManager.iter_rows(). Time per row should stay flat as the size grows.
+
+--memory adds a second pass under tracemalloc (several times slower) that
+records the peak memory of the streamed render and of the same render fed
+from a list built first, as the reports did with fetchall(). The streamed
+run does not hold the rows, but its peak still grows with the row count:
+reportlab keeps the finished pages, compressed by the renderer, until the
+file is saved.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.table_pdf_renderer import TablePdfRenderer
+
+
+def stock_rows(count):
+    """Yield rows shaped like the stock report's"""
+    start = date(2025, 1, 1)
+    for i in range(count):
+        yield (
+            f"Medicine {i:06d} 500mg",
+            "box",
+            i % 997,
+            f"LOT-{i % 5000:05d}",
+            Decimal(1000 + i % 90000),
+            start + timedelta(days=i % 700),
+        )
+
+
+def render(renderer, count, materialize=False):
+    """
+    Render count rows to a temporary file
+
+    Returns:
+        tuple: (seconds, pages, file bytes)
+    """
+    pages = []
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        rows = stock_rows(count)
+        if materialize:
+            rows = list(rows)
+        renderer.render(path, rows, on_page=pages.append)
+        return time.perf_counter() - start, len(pages), os.path.getsize(path)
+    finally:
+        os.remove(path)
+
+
+def peak_memory(renderer, count, materialize):
+    """Peak traced bytes of one render"""
+    tracemalloc.start()
+    try:
+        render(renderer, count, materialize)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000, help="Largest report size")
+    parser.add_argument("--steps", type=int, default=4, help="Sizes measured up to --rows")
+    parser.add_argument("--memory", action="store_true", help="Also trace peak memory (slow)")
+    args = parser.parse_args()
+
+    # Helvetica is built into reportlab, so no font file is needed
+    renderer = TablePdfRenderer(
+        "STOCK REPORT",
+        ["Medicine", "Unit", "Stock", "Batch", "Price", "Expires"],
+        [50, 190, 240, 290, 370, 450],
+        font_name="Helvetica",
+    )
+
+    header = f"{'Rows':>8} {'Pages':>6} {'Seconds':>8} {'us/row':>7} {'PDF MB':>7}"
+    if args.memory:
+        header += f" {'Peak MB (stream)':>17} {'Peak MB (list)':>15}"
+    print(header)
+
+    for step in range(1, args.steps + 1):
+        count = args.rows * step // args.steps
+        seconds, pages, size = render(renderer, count)
+        line = (f"{count:>8} {pages:>6} {seconds:>8.2f} {seconds / count * 1e6:>7.1f} "
+                f"{size / 2**20:>7.1f}")
+        if args.memory:
+            streamed = peak_memory(renderer, count, materialize=False)
+            listed = peak_memory(renderer, count, materialize=True)
+            line += f" {streamed / 2**20:>17.1f} {listed / 2**20:>15.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
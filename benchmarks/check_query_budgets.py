@@ -0,0 +1,94 @@
+"""
+Check the query-count budgets of UI actions against a development database
+
+Run from the project root with .env pointing at a database that has at
+least one invoice (nothing is written):
+
+    python benchmarks/check_query_budgets.py
+
+Every scenario runs inside a QueryRecorder; the script exits 1 if one issues
+more statements than its budget or repeats a statement (N+1). Functions
+decorated with @query_budget are checked strictly while it runs.
+"""
+
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ["QUERY_BUDGETS"] = "1"  # Before src is imported: instruments the connections
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+
+from src.core import AppContext
+from src.core import query_recorder
+from src.core.query_recorder import QueryRecorder, QueryBudgetExceeded
+
+
+def settle(context):
+    """Wait for background queries and deliver their results"""
+    context.query_runner.thread_pool.waitForDone()
+    QApplication.processEvents()
+
+
+def open_invoice_detail(context):
+    """Open the detail dialog of the latest invoice"""
+    from src.ui.dialogs import InvoiceInformationDialog
+
+    with context.db_manager.pooled_cursor() as cur:
+        cur.execute("SELECT max(invoice_id) FROM invoice")
+        invoice_id = cur.fetchone()[0]
+    if invoice_id is None:
+        raise RuntimeError("The database has no invoice to open")
+
+    with QueryRecorder("open invoice detail") as recorder:
+        dialog = InvoiceInformationDialog(context, invoice_id)
+        settle(context)
+    dialog.close()
+    return recorder
+
+
+def read_cached_lookups(context):
+    """Read every lookup dataset once it is cached"""
+    cache = context.reference_cache
+    settle(context)  # Initial preload
+    cache.refresh()
+    with QueryRecorder("read cached lookups") as recorder:
+        for name in cache.queries:
+            cache.get(name)
+    return recorder
+
+
+# (scenario, most statements allowed)
+SCENARIOS = [
+    (open_invoice_detail, 1),
+    (read_cached_lookups, 0),
+]
+
+
+def main():
+    app = QApplication(sys.argv)
+    context = AppContext()
+    query_recorder.raise_on_violation = True
+
+    failures = 0
+    for scenario, budget in SCENARIOS:
+        try:
+            recorder = scenario(context)
+            recorder.check(budget)
+            print(f"✅ {recorder.action}: {recorder.count} statement(s), budget {budget}")
+        except QueryBudgetExceeded as e:
+            failures += 1
+            print(f"❌ {e}")
+
+    print("\nDeclared budgets (@query_budget):")
+    for action, budget in sorted(query_recorder.BUDGETS.items()):
+        print(f"  {action:<32} {budget}")
+
+    context.close()
+    app.quit()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
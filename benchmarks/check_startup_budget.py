@@ -0,0 +1,128 @@
+"""
+Fail when the time from launch to the login dialog exceeds the budget
+
+Run from the project root (no display or database needed):
+
+    python benchmarks/check_startup_budget.py [--runs N] [--budget MS] [--imports N]
+
+Each run starts a fresh interpreter that performs run.py's imports, creates
+the QApplication and shows the login dialog, then exits. run.py connects to
+the database in the background, off that path, so no connection is made.
+The median wall time of the runs, interpreter start included, is compared
+against Settings.STARTUP_BUDGET_MS (STARTUP_BUDGET_MS in .env); the exit
+status is 1 when it is over, so the script can gate CI. --imports N also lists the N
+slowest imports as reported by `python -X importtime`.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.config import Settings
+
+
+# Launch sequence of run.py up to the login dialog. The database connects in
+# the background in run.py, so it is left out here
+CHILD = """
+import json, sys
+sys.path.insert(0, {root!r})
+import run
+from run import startup_timer
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+startup_timer.mark("QApplication")
+dialog = run.LoginDialog(run.AppContext(connect=False))
+dialog.show()
+startup_timer.mark("login dialog")
+app.processEvents()
+startup_timer.mark("first paint")
+print(json.dumps(startup_timer.phases()))
+"""
+
+
+def child_env():
+    """Environment for the launched interpreters"""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return env
+
+
+def launch():
+    """
+    Start the login sequence once
+
+    Returns:
+        tuple: (wall milliseconds, phases reported by the child)
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD.format(root=ROOT)],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True, check=True
+    )
+    wall = (time.perf_counter() - start) * 1000
+    return wall, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(count):
+    """
+    Profile the imports of one launch with -X importtime
+
+    Returns:
+        list: (cumulative microseconds, module) pairs, slowest first
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD.format(root=ROOT)],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True, check=True
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, module = line[len("import time:"):].split("|")
+        imports.append((int(cumulative), module.strip()))
+    imports.sort(reverse=True)
+    return imports[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="Launches to take the median of")
+    parser.add_argument("--budget", type=float, default=Settings.STARTUP_BUDGET_MS,
+                        help="Budget in milliseconds")
+    parser.add_argument("--imports", type=int, default=0, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    runs = [launch() for _ in range(args.runs)]
+    walls = [wall for wall, _phases in runs]
+    median = statistics.median(walls)
+
+    # Phase breakdown of the median run (in-process, after interpreter start)
+    _wall, phases = sorted(runs, key=lambda run: run[0])[len(runs) // 2]
+    print("Phase                      ms")
+    for label, duration, _at in phases:
+        print(f"  {label:<24} {duration:8.1f}")
+
+    if args.imports:
+        print("\nSlowest imports (cumulative):")
+        for cumulative, module in slowest_imports(args.imports):
+            print(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+    print(f"\nTime to login dialog: median {median:.0f} ms "
+          f"(min {min(walls):.0f}, max {max(walls):.0f}), budget {args.budget:.0f} ms")
+    if median > args.budget:
+        print("❌ Over budget")
+        return 1
+    print("✅ Within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,17 +7,57 @@ Author: Trần Tiến Thạnh
 Version: 2.0.0
 """
 
+import multiprocessing
 import sys
 import os
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+from src.utils import startup_timer  # First, so the timer covers the imports below
+
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from src.config import Settings, DatabaseConfig
 from src.core import AppContext
 from src.ui.dialogs import LoginDialog
 
+startup_timer.mark("imports")
+
+
+def report_startup():
+    """Report startup time once the event loop has painted the login dialog"""
+    startup_timer.mark("first paint")
+    startup_timer.report(Settings.STARTUP_BUDGET_MS, verbose=Settings.STARTUP_TRACE)
+
+
+def on_connected():
+    """Report the background connection"""
+    print(f"✅ Connected to database successfully! ({startup_timer.elapsed_ms():.0f} ms after launch)")
+    print()
+
+
+def show_connection_error(error):
+    """
+    Report a failed background connection
+
+    The login dialog stays open; logging in tries to connect again.
+
+    Args:
+        error (Exception): Connection error
+    """
+    print(f"❌ Database Connection Error: {error}")
+    print("\n📝 Please check your .env configuration")
+
+    # Show error dialog
+    msg = QMessageBox()
+    msg.setIcon(QMessageBox.Icon.Critical)
+    msg.setWindowTitle("Connection Error")
+    msg.setText("Failed to connect to database")
+    msg.setInformativeText(str(error))
+    msg.setDetailedText("Please check your .env file configuration.")
+    msg.exec()
+
 
 def main():
     """Main application entry point"""
@@ -37,6 +77,7 @@ def main():
     app = QApplication(sys.argv)
     app.setApplicationName(Settings.APP_NAME)
     app.setApplicationVersion(Settings.APP_VERSION)
+    startup_timer.mark("QApplication")
 
     # Show startup message
     print("=" * 60)
@@ -46,35 +87,26 @@ def main():
     print()
 
     try:
-        # Create application context
+        # Connect and migrate in the background while the login dialog shows;
+        # logging in waits for the connection
         print("🔌 Connecting to Supabase...")
-        context = AppContext()
-        print("✅ Connected to database successfully!")
-        print()
+        context = AppContext(connect=False)
+        context.when_ready(on_connected, show_connection_error)
+
+        # Flush queued activity logs before the process exits
+        app.aboutToQuit.connect(context.close)
 
         # Show login window
         print("🚀 Starting application...")
         login_window = LoginDialog(context)
         login_window.show()
+        startup_timer.mark("login dialog")
+
+        QTimer.singleShot(0, report_startup)
 
         # Run application event loop
         sys.exit(app.exec())
 
-    except ConnectionError as e:
-        print(f"❌ Database Connection Error: {e}")
-        print("\n📝 Please check your .env configuration")
-
-        # Show error dialog
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Icon.Critical)
-        msg.setWindowTitle("Connection Error")
-        msg.setText("Failed to connect to database")
-        msg.setInformativeText(str(e))
-        msg.setDetailedText("Please check your .env file configuration.")
-        msg.exec()
-
-        sys.exit(1)
-
     except Exception as e:
         print(f"❌ Fatal Error: {e}")
         import traceback
@@ -92,4 +124,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Report workers are spawned processes; frozen builds must not rerun main() in them
+    multiprocessing.freeze_support()
     main()
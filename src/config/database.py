@@ -26,6 +26,30 @@ class DatabaseConfig:
     # Connection Pool Settings
     MIN_CONNECTIONS = 1
     MAX_CONNECTIONS = 10
+    POOL_HEALTH_CHECK_INTERVAL = 60  # Ping connections idle longer than this
+    QUERY_WORKERS = 4  # Background query threads, each holds one pooled connection
+
+    # Streaming Settings (DBManager.stream)
+    STREAM_BATCH_SIZE = 2000  # Most rows fetched per server-side cursor round trip
+    STREAM_BATCH_BYTES = 8 * 1024 * 1024  # Approximate client memory per batch
+
+    # Activity Log Writer Settings
+    LOG_BATCH_SIZE = 50  # Entries per multi-row INSERT
+    LOG_FLUSH_INTERVAL = 2.0  # Seconds before a partial batch is flushed
+
+    # Activity Log Partition Settings
+    LOG_RETENTION_MONTHS = 12  # Full months kept online besides the current one
+    LOG_PARTITIONS_AHEAD = 3  # Future monthly partitions created in advance
+    LOG_MAINTENANCE_INTERVAL = 24 * 3600  # Seconds between partition maintenance runs
+
+    # Query Instrumentation Settings (off unless QUERY_STATS=1)
+    QUERY_STATS = os.getenv('QUERY_STATS', '0') == '1'
+    QUERY_BUDGETS = os.getenv('QUERY_BUDGETS', '0') == '1'  # Check @query_budget actions
+    SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', 500))  # Statements logged with their plan
+    SLOW_QUERY_EXPLAIN_INTERVAL = 600  # Seconds before the same statement is explained again
+    SLOW_QUERY_LOG_BYTES = 1024 * 1024  # Slow-query log size before rotating
+    SLOW_QUERY_LOG_BACKUPS = 5  # Rotated slow-query logs kept
+    QUERY_STATS_SAMPLES = 1000  # Latest latencies kept per statement for percentiles
 
     # Timeout Settings (seconds)
     CONNECTION_TIMEOUT = 30
@@ -34,13 +58,18 @@ class DatabaseConfig:
     @classmethod
     def get_connection_params(cls):
         """Get database connection parameters as dictionary"""
-        return {
+        params = {
             'host': cls.DB_HOST,
             'port': cls.DB_PORT,
             'database': cls.DB_NAME,
             'user': cls.DB_USER,
-            'password': cls.DB_PASSWORD
+            'password': cls.DB_PASSWORD,
+            'connect_timeout': cls.CONNECTION_TIMEOUT
         }
+        if cls.QUERY_STATS or cls.QUERY_BUDGETS:
+            from ..core.query_stats import InstrumentedCursor
+            params['cursor_factory'] = InstrumentedCursor
+        return params
 
     @classmethod
     def validate_config(cls):
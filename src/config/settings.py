@@ -23,10 +23,43 @@ class Settings:
     ICONS_DIR = os.path.join(ASSETS_DIR, "icons")
     FONTS_DIR = os.path.join(ASSETS_DIR, "fonts")
     EXPORTS_DIR = os.path.join(BASE_DIR, "exports")
+    DATA_DIR = os.path.join(BASE_DIR, "data")
+    ACTIVITY_LOG_SPILL_FILE = os.path.join(DATA_DIR, "activity_log_spill.jsonl")
+    ACTIVITY_LOG_REJECTED_FILE = os.path.join(DATA_DIR, "activity_log_rejected.jsonl")
+    ACTIVITY_LOG_ARCHIVE_DIR = os.path.join(EXPORTS_DIR, "activity_log")
+    SLOW_QUERY_LOG = os.path.join(DATA_DIR, "slow_queries.log")
     UI_FORMS_DIR = os.path.join(BASE_DIR, "src", "ui", "forms")
 
     # UI Settings
     WINDOW_TITLE = "MediManager - Quản lý nhà thuốc"
+    WINDOW_STALE_AFTER = 300  # Seconds hidden before a window reloads when shown again
+
+    # Search Settings
+    SEARCH_DEBOUNCE_MS = 250  # Wait for typing to pause before querying
+    SEARCH_PAGE_SIZE = 100  # Ranked hits fetched per page
+
+    # POS Catalog Settings
+    CATALOG_MAX_RESULTS = 50  # Hits shown in the medicine picker
+    CATALOG_MIN_SIMILARITY = 0.3  # Share of trigrams a fuzzy hit must contain
+    CATALOG_REFRESH_OVERLAP = 60  # Seconds re-read before the last updated_at seen
+    CATALOG_DELETE_SCAN_INTERVAL = 600  # Seconds between full id diffs finding deleted medicines
+
+    # Reference Data Cache Settings
+    REFERENCE_CACHE_TTL = 300  # Seconds suppliers, categories, etc. are served from memory
+
+    # Activity Log Viewer Settings
+    LOG_PAGE_SIZE = 200  # Entries fetched per scroll page
+    LOG_TAIL_INTERVAL_MS = 3000  # Live tail polling interval
+
+    # Dashboard Settings
+    EXPIRY_WARNING_DAYS = 60  # Medicines expiring within this many days are flagged
+
+    # Report Export Settings
+    REPORT_WORKERS = int(os.getenv('REPORT_WORKERS', 2))  # Reports drawn at once, one process each
+
+    # Startup Settings
+    STARTUP_BUDGET_MS = int(os.getenv('STARTUP_BUDGET_MS', 1500))  # Launch to login dialog
+    STARTUP_TRACE = os.getenv('STARTUP_TRACE', '0') == '1'  # Print startup phase timings
 
     @staticmethod
     def get_icon_path(theme='dark'):
@@ -4,5 +4,8 @@ Core business logic module
 
 from .db_manager import DBManager
 from .app_context import AppContext
+from .connection_pool import ConnectionPool
+from .catalog_index import CatalogIndex
+from .reference_cache import ReferenceCache
 
-__all__ = ['DBManager', 'AppContext']
+__all__ = ['DBManager', 'AppContext', 'ConnectionPool', 'CatalogIndex', 'ReferenceCache']
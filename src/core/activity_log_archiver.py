@@ -0,0 +1,253 @@
+"""
+Partition maintenance and retention for the activity_log audit trail
+"""
+
+import gzip
+import os
+import threading
+from datetime import datetime
+
+from psycopg2 import sql
+
+from ..config.database import DatabaseConfig
+from ..config.settings import Settings
+
+
+# Only one terminal maintains partitions at a time
+ARCHIVE_LOCK_KEY = 7_340_002
+
+ENSURE_PARTITIONS_SQL = """
+    SELECT create_activity_log_partitions(
+        CURRENT_DATE, (CURRENT_DATE + make_interval(months => %s))::date
+    )
+"""
+
+# Monthly partitions (attached or left detached by an interrupted run) whose
+# month ended more than the retention period ago
+EXPIRED_PARTITIONS_SQL = r"""
+    SELECT c.relname, c.relispartition
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema()
+      AND c.relkind = 'r'
+      AND c.relname ~ '^activity_log_[0-9]{6}$'
+      AND to_date(right(c.relname, 6), 'YYYYMM')
+          < date_trunc('month', CURRENT_DATE) - make_interval(months => %s)
+    ORDER BY c.relname
+"""
+
+# Rows of the default partition (months without a partition of their own)
+# past the same retention period
+EXPIRED_DEFAULT_CUTOFF = "date_trunc('month', CURRENT_DATE) - make_interval(months => {})"
+
+
+class ActivityLogArchiver:
+    """
+    Keeps activity_log partitions ahead of the clock and archives old ones
+
+    activity_log is range-partitioned by month. On start and then once per
+    maintenance interval, a background thread creates the partitions for
+    the coming months, and detaches every partition older than the
+    retention period, exports it to a gzipped CSV under exports/ and drops
+    it. Expired rows of the default partition, which can never be detached,
+    are exported and deleted the same way. Inserts and log queries
+    therefore only ever touch recent months.
+    """
+
+    def __init__(self, db_manager, retention_months=None, months_ahead=None,
+                 archive_dir=None, interval=None):
+        """
+        Initialize archiver
+
+        Args:
+            db_manager: DBManager providing pooled connections
+            retention_months (int, optional): Full months kept besides the current one
+            months_ahead (int, optional): Future months to keep partitions for
+            archive_dir (str, optional): Directory for exported partitions
+            interval (float, optional): Seconds between maintenance runs
+        """
+        self.db_manager = db_manager
+        self.retention_months = retention_months or DatabaseConfig.LOG_RETENTION_MONTHS
+        self.months_ahead = months_ahead or DatabaseConfig.LOG_PARTITIONS_AHEAD
+        self.archive_dir = archive_dir or Settings.ACTIVITY_LOG_ARCHIVE_DIR
+        self.interval = interval or DatabaseConfig.LOG_MAINTENANCE_INTERVAL
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start periodic maintenance on a background thread"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="ActivityLogArchiver", daemon=True
+        )
+        self._thread.start()
+
+    def close(self, timeout=5.0):
+        """
+        Stop periodic maintenance
+
+        Args:
+            timeout (float): Seconds to wait for a run in progress
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run(self):
+        """
+        Run maintenance once
+
+        Returns:
+            list: Paths of the partitions archived by this run
+        """
+        with self.db_manager.pooled_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_lock(%s)", (ARCHIVE_LOCK_KEY,))
+                locked = cur.fetchone()[0]
+            conn.commit()
+            if not locked:
+                return []
+
+            try:
+                created = self.ensure_partitions(conn)
+                if created:
+                    print(f"✔ Created {created} activity_log partition(s)")
+                archived = [self.archive_partition(conn, name, attached)
+                            for name, attached in self.expired_partitions(conn)]
+                path = self.archive_default(conn)
+                if path:
+                    archived.append(path)
+                return archived
+            finally:
+                conn.rollback()  # Leave a failed transaction before unlocking
+                with conn.cursor() as cur:
+                    cur.execute("SELECT pg_advisory_unlock(%s)", (ARCHIVE_LOCK_KEY,))
+                conn.commit()
+
+    def ensure_partitions(self, conn):
+        """
+        Create partitions from the current month to months_ahead
+
+        Returns:
+            int: Number of partitions created
+        """
+        with conn.cursor() as cur:
+            cur.execute(ENSURE_PARTITIONS_SQL, (self.months_ahead,))
+            created = cur.fetchone()[0]
+        conn.commit()
+        return created
+
+    def expired_partitions(self, conn):
+        """
+        List partitions past the retention period
+
+        Returns:
+            list: (table name, still attached) pairs, oldest first
+        """
+        with conn.cursor() as cur:
+            cur.execute(EXPIRED_PARTITIONS_SQL, (self.retention_months,))
+            rows = cur.fetchall()
+        conn.commit()
+        return rows
+
+    def archive_partition(self, conn, name, attached=True):
+        """
+        Detach a partition, export it to gzipped CSV and drop it
+
+        The table is only dropped once the file is complete; if the export
+        fails, the detached table is picked up again by the next run.
+
+        Args:
+            conn: psycopg2 connection
+            name (str): Partition table name (activity_log_YYYYMM)
+            attached (bool): Whether the table is still attached
+
+        Returns:
+            str: Path of the exported file
+        """
+        table = sql.Identifier(name)
+
+        if attached:
+            with conn.cursor() as cur:
+                # Give up rather than queue inserts behind the lock for long
+                cur.execute("SET LOCAL lock_timeout = '5s'")
+                cur.execute(sql.SQL("ALTER TABLE activity_log DETACH PARTITION {}").format(table))
+            conn.commit()
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        path = os.path.join(self.archive_dir, f"{name}.csv.gz")
+        partial = path + ".part"
+        with conn.cursor() as cur:
+            with gzip.open(partial, "wb") as f:
+                cur.copy_expert(
+                    sql.SQL("COPY (SELECT * FROM {} ORDER BY log_time, log_id) "
+                            "TO STDOUT WITH CSV HEADER").format(table),
+                    f
+                )
+        conn.commit()
+        os.replace(partial, path)
+
+        with conn.cursor() as cur:
+            cur.execute(sql.SQL("DROP TABLE {}").format(table))
+        conn.commit()
+
+        print(f"✔ Archived {name} to {path}")
+        return path
+
+    def archive_default(self, conn):
+        """
+        Export expired rows of the default partition and delete them
+
+        The file is in place before the delete is committed, so a failure
+        can at worst export rows twice, never lose them.
+
+        Args:
+            conn: psycopg2 connection
+
+        Returns:
+            str: Path of the exported file, or None if nothing had expired
+        """
+        cutoff = sql.SQL(EXPIRED_DEFAULT_CUTOFF).format(sql.Literal(self.retention_months))
+        with conn.cursor() as cur:
+            cur.execute(sql.SQL(
+                "SELECT EXISTS (SELECT 1 FROM activity_log_default WHERE log_time < {})"
+            ).format(cutoff))
+            expired = cur.fetchone()[0]
+        conn.commit()
+        if not expired:
+            return None
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        name = f"activity_log_default_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        path = os.path.join(self.archive_dir, f"{name}.csv.gz")
+        partial = path + ".part"
+        try:
+            with conn.cursor() as cur:
+                with gzip.open(partial, "wb") as f:
+                    cur.copy_expert(
+                        sql.SQL("COPY (DELETE FROM activity_log_default WHERE log_time < {} "
+                                "RETURNING *) TO STDOUT WITH CSV HEADER").format(cutoff),
+                        f
+                    )
+        except Exception:
+            conn.rollback()
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        os.replace(partial, path)
+        conn.commit()
+
+        print(f"✔ Archived expired activity_log_default rows to {path}")
+        return path
+
+    def _run(self):
+        """Worker loop: maintain now, then once per interval"""
+        while not self._stop.is_set():
+            try:
+                self.run()
+            except Exception as e:
+                print(f"❌ Activity log maintenance failed: {e}")
+            self._stop.wait(self.interval)
@@ -0,0 +1,246 @@
+"""
+Background writer for the activity_log audit trail
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from ..config.database import DatabaseConfig
+from ..config.settings import Settings
+
+
+INSERT_SQL = "INSERT INTO activity_log (staff_id, action, log_time) VALUES %s"
+
+# The database could not be reached: entries are spilled and retried later
+TRANSIENT_ERRORS = (psycopg2.OperationalError, psycopg2.InterfaceError, TimeoutError)
+
+# The database refused the rows themselves: retrying would fail forever
+REJECTED_ERRORS = (psycopg2.IntegrityError, psycopg2.DataError)
+
+
+class ActivityLogWriter:
+    """
+    Queues audit log entries and writes them in batches on a worker thread
+
+    Entries are flushed with one multi-row INSERT when the batch is full or
+    the flush interval elapses. If the database is unreachable, the batch is
+    appended to a local spill file and replayed on the next flush. Rows the
+    database rejects (e.g. a staff_id that was deleted) go to a separate
+    rejected file instead, so they cannot block later batches.
+    Logging an action therefore never waits on the network.
+    """
+
+    def __init__(self, db_manager, batch_size=None, flush_interval=None, spill_path=None,
+                 rejected_path=None):
+        """
+        Initialize log writer
+
+        Args:
+            db_manager: DBManager providing pooled connections
+            batch_size (int, optional): Entries per INSERT before an early flush
+            flush_interval (float, optional): Maximum seconds an entry waits in memory
+            spill_path (str, optional): JSON-lines file for entries that could not be written
+            rejected_path (str, optional): JSON-lines file for entries the database refused
+        """
+        self.db_manager = db_manager
+        self.batch_size = batch_size or DatabaseConfig.LOG_BATCH_SIZE
+        self.flush_interval = flush_interval or DatabaseConfig.LOG_FLUSH_INTERVAL
+        self.spill_path = spill_path or Settings.ACTIVITY_LOG_SPILL_FILE
+        self.rejected_path = rejected_path or Settings.ACTIVITY_LOG_REJECTED_FILE
+
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the background writer thread"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="ActivityLogWriter", daemon=True
+        )
+        self._thread.start()
+
+    def log(self, staff_id, action):
+        """
+        Queue an action for writing
+
+        Args:
+            staff_id (str): Staff who performed the action
+            action (str): Description of the action
+        """
+        # Timestamp now, not at flush time, so batching does not skew log_time
+        self._queue.put((staff_id, action, datetime.now()))
+
+    def close(self, timeout=5.0):
+        """
+        Stop the writer and flush everything still queued
+
+        Args:
+            timeout (float): Seconds to wait for the worker thread
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        # Anything left (thread not started or timed out) is written or spilled here
+        remaining = self._drain()
+        if remaining:
+            self._flush(remaining)
+
+    def _run(self):
+        """Worker loop: collect entries and flush by size or time"""
+        self._flush([])  # Replay entries spilled by a previous session
+
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+
+        while not self._stop.is_set():
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                pass
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                batch.extend(self._drain(self.batch_size - len(batch)))
+                if batch:
+                    self._flush(batch)
+                    batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+        batch.extend(self._drain())
+        if batch:
+            self._flush(batch)
+
+    def _drain(self, limit=None):
+        """Take queued entries without blocking"""
+        entries = []
+        while limit is None or len(entries) < limit:
+            try:
+                entries.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return entries
+
+    def _flush(self, batch):
+        """
+        Replay spilled entries, then write the batch
+
+        The spill is replayed in its own statement, so a bad spilled row
+        cannot fail the new entries. Entries are spilled (again) only while
+        the database is unreachable; rows it rejects are moved to the
+        rejected file.
+        """
+        spilled = self._read_spill()
+        if spilled:
+            pending = self._write(spilled)
+            if pending:
+                # Still unreachable: keep what is left and don't try the batch
+                self._replace_spill(pending)
+                self._write_spill(batch)
+                return
+            self._clear_spill()
+
+        if batch:
+            self._write_spill(self._write(batch))
+
+    def _write(self, rows):
+        """
+        Insert entries, setting aside the ones the database rejects
+
+        Returns:
+            list: Entries not written because the database is unreachable
+        """
+        try:
+            self._insert(rows)
+            return []
+        except TRANSIENT_ERRORS as e:
+            print(f"[LOG ERROR] {e} - keeping {len(rows)} entries in {self.spill_path}")
+            return rows
+        except REJECTED_ERRORS as e:
+            if len(rows) == 1:
+                self._reject(rows, e)
+                return []
+        except Exception as e:
+            self._reject(rows, e)
+            return []
+
+        # Some row was refused: find it by inserting one at a time
+        for i, row in enumerate(rows):
+            try:
+                self._insert([row])
+            except TRANSIENT_ERRORS as e:
+                print(f"[LOG ERROR] {e} - keeping {len(rows) - i} entries in {self.spill_path}")
+                return rows[i:]
+            except Exception as e:
+                self._reject([row], e)
+        return []
+
+    def _insert(self, rows):
+        """Write entries with one multi-row INSERT"""
+        with self.db_manager.pooled_cursor() as cur:
+            execute_values(cur, INSERT_SQL, rows, page_size=max(len(rows), 1))
+
+    def _reject(self, rows, error):
+        """Move entries the database refused to the rejected file"""
+        print(f"[LOG ERROR] {error} - moving {len(rows)} entries to {self.rejected_path}")
+        self._append(self.rejected_path, rows, error=str(error).strip())
+
+    def _read_spill(self):
+        """Load entries from the spill file"""
+        if not os.path.exists(self.spill_path):
+            return []
+
+        rows = []
+        try:
+            with open(self.spill_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        staff_id, action, log_time = json.loads(line)
+                        rows.append((staff_id, action, datetime.fromisoformat(log_time)))
+        except (OSError, ValueError) as e:
+            print(f"[LOG ERROR] Cannot read spill file: {e}")
+        return rows
+
+    def _write_spill(self, batch):
+        """Append entries to the spill file"""
+        if batch:
+            self._append(self.spill_path, batch)
+
+    def _replace_spill(self, rows):
+        """Rewrite the spill file with the entries still to be written"""
+        temp_path = self.spill_path + ".tmp"
+        self._append(temp_path, rows)
+        try:
+            os.replace(temp_path, self.spill_path)
+        except OSError as e:
+            print(f"[LOG ERROR] Cannot write spill file: {e}")
+
+    def _append(self, path, rows, error=None):
+        """Append entries to a JSON-lines file, with the error if given"""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                for staff_id, action, log_time in rows:
+                    entry = [staff_id, action, log_time.isoformat()]
+                    if error is not None:
+                        entry.append(error)
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"[LOG ERROR] Cannot write {path}: {e}")
+
+    def _clear_spill(self):
+        """Remove the spill file after its entries were written"""
+        try:
+            os.remove(self.spill_path)
+        except OSError:
+            pass
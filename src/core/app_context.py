@@ -11,24 +11,163 @@ class AppContext:
     and user session information.
     """
 
-    def __init__(self, staff_id=None):
+    def __init__(self, staff_id=None, connect=True):
         """
         Initialize application context
 
         Args:
             staff_id (str, optional): Current logged-in staff ID
+            connect (bool): Connect and migrate before returning. Pass False
+                to show UI first and connect with connect_async().
         """
         self.staff_id = staff_id
         self.db_manager = DBManager()
-        self.connection = self.db_manager.connect()
+        self._query_runner = None
+        self._catalog_index = None
+        self._reference_cache = None
+        self._navigator = None
+        self._report_jobs = None
+        self.connection = None
+        self._connect_task = None
+        self._waiters = []  # (on_ready, on_error) waiting for the connection
 
-        if not self.connection:
-            raise ConnectionError("Failed to establish database connection")
+        if connect:
+            self.connection = self.db_manager.connect()
+            if not self.connection:
+                raise ConnectionError("Failed to establish database connection")
 
     def __del__(self):
         """Cleanup: close database connection when context is destroyed"""
+        self.close()
+
+    def close(self):
+        """Stop background work, flush pending audit logs and close the database"""
+        self._navigator = None
+        if self._report_jobs:
+            self._report_jobs.shutdown()
+            self._report_jobs = None
+        if self._query_runner:
+            self._query_runner.shutdown()
+            self._query_runner = None
+        self._catalog_index = None
+        self._reference_cache = None
         self.db_manager.close()
 
+    @property
+    def ready(self):
+        """Whether the database is connected and migrated"""
+        return self.connection is not None
+
+    def connect_async(self):
+        """
+        Connect and migrate on a background thread
+
+        The caller can show windows right away; anything that needs the
+        database waits with when_ready(). Calling it again after a failure
+        retries.
+
+        Returns:
+            QueryTask: Task handle, or None if already connected or connecting
+        """
+        if self.ready or self._connect_task is not None:
+            return None
+
+        def work(_conn):
+            connection = self.db_manager.connect()
+            if not connection:
+                self.db_manager.close()  # Drop the partly opened pool before a retry
+                raise ConnectionError("Failed to establish database connection")
+            return connection
+
+        self._connect_task = self.query_runner.submit_call(
+            work, self._on_connected, self._on_connect_failed, use_connection=False
+        )
+        return self._connect_task
+
+    def when_ready(self, on_ready, on_error=None):
+        """
+        Run a callback once the database is ready
+
+        Starts connecting if needed (or again, after a failure).
+
+        Args:
+            on_ready (callable): Called on the GUI thread without arguments
+            on_error (callable, optional): Called with the exception if connecting fails
+        """
+        if self.ready:
+            on_ready()
+            return
+        self._waiters.append((on_ready, on_error))
+        self.connect_async()
+
+    def _on_connected(self, connection):
+        """Store the connection and release the waiters"""
+        self._connect_task = None
+        self.connection = connection
+        waiters, self._waiters = self._waiters, []
+        for on_ready, _on_error in waiters:
+            on_ready()
+
+    def _on_connect_failed(self, error):
+        """Report the failure to the waiters"""
+        self._connect_task = None
+        waiters, self._waiters = self._waiters, []
+        for _on_ready, on_error in waiters:
+            if on_error:
+                on_error(error)
+
+    @property
+    def query_runner(self):
+        """Background query runner, created on first use"""
+        if self._query_runner is None:
+            from .query_runner import QueryRunner
+            self._query_runner = QueryRunner(self.db_manager)
+        return self._query_runner
+
+    @property
+    def catalog_index(self):
+        """
+        Resident medicine catalog for the POS picker
+
+        Created and loaded in the background on first use; callers refresh
+        it incrementally with refresh_async().
+        """
+        if self._catalog_index is None:
+            from .catalog_index import CatalogIndex
+            self._catalog_index = CatalogIndex(self.db_manager)
+            self._catalog_index.refresh_async(self.query_runner)
+        return self._catalog_index
+
+    @property
+    def reference_cache(self):
+        """
+        Lookup data (suppliers, payment methods, categories, medicine names)
+
+        Created and preloaded in the background on first use. Dialogs that
+        change one of these tables call invalidate() after saving.
+        """
+        if self._reference_cache is None:
+            from .reference_cache import ReferenceCache
+            self._reference_cache = ReferenceCache(self.db_manager)
+            self._reference_cache.refresh_async(self.query_runner)
+        return self._reference_cache
+
+    @property
+    def report_jobs(self):
+        """Report job queue running exports in worker processes, created on first use"""
+        if self._report_jobs is None:
+            from .report_jobs import ReportJobQueue
+            self._report_jobs = ReportJobQueue(self)
+        return self._report_jobs
+
+    @property
+    def navigator(self):
+        """Window navigator keeping one instance per window type, created on first use"""
+        if self._navigator is None:
+            from ..ui.navigator import Navigator
+            self._navigator = Navigator(self)
+        return self._navigator
+
     def set_user(self, staff_id):
         """
         Set current logged-in user
@@ -0,0 +1,418 @@
+"""
+In-memory medicine catalog for point-of-sale lookups
+"""
+
+import bisect
+import heapq
+import threading
+import time
+import unicodedata
+from datetime import timedelta
+
+from ..config.settings import Settings
+
+
+CATALOG_COLUMNS = """
+    medicine_id, medicine_name, generic_name, brand_name, unit,
+    sale_price, stock_quantity, batch_number, expiration_date, updated_at,
+    barcode
+"""
+
+FULL_LOAD_SQL = f"SELECT {CATALOG_COLUMNS} FROM medicine"
+
+# Rows changed since the watermark. The overlap re-reads rows whose updated_at
+# (the transaction start time) is older than a commit we have already seen.
+CHANGES_SQL = f"""
+    SELECT {CATALOG_COLUMNS}
+    FROM medicine
+    WHERE updated_at > %s
+"""
+
+# Deleted rows leave no updated_at behind. Diffing the resident ids against
+# the table's reads the whole id column, so refreshes only do it once per
+# CATALOG_DELETE_SCAN_INTERVAL; checkout evicts the ids it finds missing
+# (evict_missing) in between.
+IDS_SQL = "SELECT medicine_id FROM medicine"
+
+EXISTING_IDS_SQL = "SELECT medicine_id FROM medicine WHERE medicine_id = ANY(%s)"
+
+
+def fold(text):
+    """
+    Normalize text for accent- and case-insensitive matching
+
+    Vietnamese diacritics are removed ("Thuốc" -> "thuoc") and đ is mapped
+    to d, which Unicode decomposition alone does not do.
+
+    Args:
+        text (str): Text to normalize
+
+    Returns:
+        str: Lowercase ASCII-like text
+    """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFD", text.replace("đ", "d").replace("Đ", "D"))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def trigrams(text):
+    """Get the set of 3-character substrings of folded text (padded like pg_trgm)"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CatalogEntry:
+    """One medicine batch as seen by the point-of-sale picker"""
+
+    __slots__ = (
+        'medicine_id', 'medicine_name', 'generic_name', 'brand_name', 'unit',
+        'sale_price', 'stock_quantity', 'batch_number', 'expiration_date',
+        'updated_at', 'barcode', 'key', 'name_key',
+    )
+
+    def __init__(self, row):
+        """
+        Initialize catalog entry
+
+        Args:
+            row (tuple): Row selected with CATALOG_COLUMNS
+        """
+        (self.medicine_id, self.medicine_name, self.generic_name, self.brand_name,
+         self.unit, self.sale_price, self.stock_quantity, self.batch_number,
+         self.expiration_date, self.updated_at, self.barcode) = row
+        self.stock_quantity = self.stock_quantity or 0
+        self.name_key = fold(self.medicine_name)
+        self.key = " ".join(
+            fold(text) for text in (self.medicine_name, self.generic_name, self.brand_name)
+            if text
+        )
+
+    def tokens(self):
+        """Words that prefix queries are matched against"""
+        return set(self.key.split())
+
+    def label(self):
+        """Text shown in the picker"""
+        return (f"{self.medicine_name} ({self.unit or '-'}) - "
+                f"Price: {self.sale_price} - Stock: {self.stock_quantity}")
+
+
+class CatalogIndex:
+    """
+    Resident medicine catalog with prefix and trigram lookup
+
+    Loaded once, then kept fresh with incremental reads of rows whose
+    updated_at moved. Deleted medicines are dropped when checkout reports
+    them (evict_missing()) and by an id diff run by a refresh at most once
+    per CATALOG_DELETE_SCAN_INTERVAL. Lookups never touch the database.
+    refresh() may run on a worker thread; lookups are safe to run
+    concurrently with it.
+    """
+
+    def __init__(self, db_manager):
+        """
+        Initialize catalog index
+
+        Args:
+            db_manager: DBManager providing pooled connections
+        """
+        self.db_manager = db_manager
+        self._lock = threading.Lock()
+        self._entries = {}      # medicine_id -> CatalogEntry
+        self._names = []        # Sorted (name_key, medicine_id) pairs
+        self._prefix = []       # Sorted (token, medicine_id) pairs
+        self._trigrams = {}     # trigram -> set of medicine_ids
+        self._barcodes = {}     # barcode -> medicine_id
+        self._watermark = None  # Highest updated_at seen
+        self._ids_scanned = 0.0  # time.monotonic() of the last full load or id diff
+        self._refresh_lock = threading.Lock()
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, medicine_id):
+        """Get the entry for a medicine, or None"""
+        return self._entries.get(medicine_id)
+
+    def by_barcode(self, barcode):
+        """
+        Get the batch a scanned barcode belongs to
+
+        A dict lookup against the resident catalog, so a scanner burst never
+        waits on the database.
+
+        Args:
+            barcode (str): Scanned code
+
+        Returns:
+            CatalogEntry: Matching batch, or None if the code is unknown
+        """
+        medicine_id = self._barcodes.get(barcode.strip())
+        return self._entries.get(medicine_id) if medicine_id is not None else None
+
+    def refresh(self, conn=None):
+        """
+        Load the catalog, or read only the rows changed since the last refresh
+
+        Args:
+            conn: Optional psycopg2 connection (e.g. from a QueryRunner task)
+
+        Returns:
+            int: Number of entries loaded or updated
+        """
+        if conn is None:
+            with self.db_manager.pooled_connection() as pooled:
+                return self.refresh(pooled)
+
+        with self._refresh_lock:
+            return self._refresh(conn)
+
+    def _refresh(self, conn):
+        """Read and apply changes (one refresh at a time)"""
+        with conn.cursor() as cur:
+            if self._watermark is None:
+                cur.execute(FULL_LOAD_SQL)
+            else:
+                since = self._watermark - timedelta(seconds=Settings.CATALOG_REFRESH_OVERLAP)
+                cur.execute(CHANGES_SQL, (since,))
+            rows = cur.fetchall()
+
+            # Read after the changes, so a row inserted in between is in both
+            existing = None
+            now = time.monotonic()
+            if self._watermark is not None \
+                    and now - self._ids_scanned >= Settings.CATALOG_DELETE_SCAN_INTERVAL:
+                cur.execute(IDS_SQL)
+                existing = {row[0] for row in cur.fetchall()}
+
+        entries = [CatalogEntry(row) for row in rows]
+        if self._watermark is None:
+            self._rebuild(entries)
+            self._ids_scanned = now
+        else:
+            self._update(entries)
+            if existing is not None:
+                self._remove(set(self._entries) - existing)
+                self._ids_scanned = now
+
+        stamps = [e.updated_at for e in entries if e.updated_at is not None]
+        if stamps:
+            newest = max(stamps)
+            if self._watermark is None or newest > self._watermark:
+                self._watermark = newest
+        self.loaded = True
+        return len(entries)
+
+    def evict_missing(self, medicine_ids, conn=None):
+        """
+        Drop entries whose medicines no longer exist
+
+        Used when checkout reports medicines as short: a batch deleted since
+        the last refresh is reported the same way as one without stock.
+
+        Args:
+            medicine_ids (iterable): IDs to check
+            conn: Optional psycopg2 connection
+
+        Returns:
+            set: IDs that were deleted and have been dropped
+        """
+        medicine_ids = list(medicine_ids)
+        if not medicine_ids:
+            return set()
+        if conn is None:
+            with self.db_manager.pooled_connection() as pooled:
+                return self.evict_missing(medicine_ids, pooled)
+
+        with conn.cursor() as cur:
+            cur.execute(EXISTING_IDS_SQL, (medicine_ids,))
+            existing = {row[0] for row in cur.fetchall()}
+
+        missing = set(medicine_ids) - existing
+        self._remove(missing)
+        return missing
+
+    def refresh_async(self, query_runner, on_done=None):
+        """
+        Refresh on the query runner's thread pool
+
+        Args:
+            query_runner: QueryRunner to submit the work to
+            on_done (callable, optional): Called on the GUI thread with the
+                number of changed entries
+
+        Returns:
+            QueryTask: Task handle
+        """
+        return query_runner.submit_call(self.refresh, on_result=on_done,
+                                        on_error=lambda e: print(f"❌ Catalog refresh failed: {e}"))
+
+    def search(self, query, limit=None, in_stock_only=True):
+        """
+        Find medicines matching typed text
+
+        Every word of the query must prefix a word of the name, generic name
+        or brand name; names starting with the query rank first. If that
+        gives fewer than `limit` hits, trigram similarity fills the rest so
+        typos still match.
+
+        Args:
+            query (str): Typed text, accents and case are ignored
+            limit (int, optional): Maximum hits, defaults to Settings.CATALOG_MAX_RESULTS
+            in_stock_only (bool): Skip medicines with no stock
+
+        Returns:
+            list: CatalogEntry objects, best match first
+        """
+        limit = limit or Settings.CATALOG_MAX_RESULTS
+        words = fold(query).split()
+
+        with self._lock:
+            entries = self._entries
+
+            def usable(entry):
+                return not in_stock_only or entry.stock_quantity > 0
+
+            # Names starting with the phrase come straight off the sorted name list
+            phrase = " ".join(words)
+            hits = self._name_prefix_hits(phrase, limit, usable)
+            if len(hits) >= limit or not words:
+                return hits
+
+            # Then names where every word prefixes some word of the name,
+            # generic name or brand name
+            ids = None
+            for word in words:
+                matched = self._prefix_ids(word)
+                ids = matched if ids is None else ids & matched
+                if not ids:
+                    break
+
+            seen = {e.medicine_id for e in hits}
+            hits.extend(heapq.nsmallest(
+                limit - len(hits),
+                (entries[i] for i in ids or () if i not in seen and usable(entries[i])),
+                key=lambda e: e.name_key
+            ))
+
+            if len(hits) < limit and len(phrase) >= 3:
+                hits.extend(self._fuzzy(phrase, limit - len(hits),
+                                        {e.medicine_id for e in hits}, usable))
+            return hits
+
+    def _name_prefix_hits(self, phrase, limit, usable):
+        """Entries whose folded name starts with phrase, in name order"""
+        names = self._names
+        index = bisect.bisect_left(names, (phrase,))
+        hits = []
+        while index < len(names) and len(hits) < limit:
+            name_key, medicine_id = names[index]
+            if not name_key.startswith(phrase):
+                break
+            entry = self._entries[medicine_id]
+            if usable(entry):
+                hits.append(entry)
+            index += 1
+        return hits
+
+    def _prefix_ids(self, word):
+        """Ids having a token that starts with word (binary search on sorted tokens)"""
+        prefix = self._prefix
+        index = bisect.bisect_left(prefix, (word,))
+        ids = set()
+        while index < len(prefix) and prefix[index][0].startswith(word):
+            ids.add(prefix[index][1])
+            index += 1
+        return ids
+
+    def _fuzzy(self, phrase, limit, exclude, usable):
+        """Rank entries by the share of the phrase's trigrams they contain"""
+        grams = trigrams(phrase)
+        counts = {}
+        for gram in grams:
+            for medicine_id in self._trigrams.get(gram, ()):
+                counts[medicine_id] = counts.get(medicine_id, 0) + 1
+
+        threshold = Settings.CATALOG_MIN_SIMILARITY * len(grams)
+        scored = [
+            (count, medicine_id) for medicine_id, count in counts.items()
+            if count >= threshold and medicine_id not in exclude
+            and usable(self._entries[medicine_id])
+        ]
+        scored.sort(key=lambda item: (-item[0], self._entries[item[1]].name_key))
+        return [self._entries[medicine_id] for _, medicine_id in scored[:limit]]
+
+    def _rebuild(self, entries):
+        """Build all structures off to the side, then swap them in"""
+        by_id = {e.medicine_id: e for e in entries}
+        names = sorted((e.name_key, e.medicine_id) for e in entries)
+        prefix = sorted((token, e.medicine_id) for e in entries for token in e.tokens())
+        grams = {}
+        for e in entries:
+            for gram in trigrams(e.key):
+                grams.setdefault(gram, set()).add(e.medicine_id)
+        barcodes = {e.barcode: e.medicine_id for e in entries if e.barcode}
+
+        with self._lock:
+            self._entries = by_id
+            self._names = names
+            self._prefix = prefix
+            self._trigrams = grams
+            self._barcodes = barcodes
+
+    def _update(self, entries):
+        """Apply changed rows in place (small deltas)"""
+        with self._lock:
+            for entry in entries:
+                old = self._entries.get(entry.medicine_id)
+                if old is not None and old.barcode != entry.barcode \
+                        and self._barcodes.get(old.barcode) == entry.medicine_id:
+                    del self._barcodes[old.barcode]
+                if entry.barcode:
+                    self._barcodes[entry.barcode] = entry.medicine_id
+                if old is not None and (old.key, old.name_key) != (entry.key, entry.name_key):
+                    self._unindex(old)
+                    old = None
+                self._entries[entry.medicine_id] = entry
+                if old is None:
+                    self._index(entry)
+
+    def _remove(self, medicine_ids):
+        """Drop deleted medicines from every structure"""
+        if not medicine_ids:
+            return
+        with self._lock:
+            for medicine_id in medicine_ids:
+                entry = self._entries.pop(medicine_id, None)
+                if entry is None:
+                    continue
+                self._unindex(entry)
+                if entry.barcode and self._barcodes.get(entry.barcode) == medicine_id:
+                    del self._barcodes[entry.barcode]
+
+    def _index(self, entry):
+        """Add an entry's name, tokens and trigrams"""
+        bisect.insort(self._names, (entry.name_key, entry.medicine_id))
+        for token in entry.tokens():
+            bisect.insort(self._prefix, (token, entry.medicine_id))
+        for gram in trigrams(entry.key):
+            self._trigrams.setdefault(gram, set()).add(entry.medicine_id)
+
+    def _unindex(self, entry):
+        """Remove an entry's name, tokens and trigrams"""
+        self._remove_pair(self._names, (entry.name_key, entry.medicine_id))
+        for token in entry.tokens():
+            self._remove_pair(self._prefix, (token, entry.medicine_id))
+        for gram in trigrams(entry.key):
+            ids = self._trigrams.get(gram)
+            if ids is not None:
+                ids.discard(entry.medicine_id)
+
+    @staticmethod
+    def _remove_pair(pairs, pair):
+        """Remove a pair from a sorted list"""
+        index = bisect.bisect_left(pairs, pair)
+        if index < len(pairs) and pairs[index] == pair:
+            del pairs[index]
@@ -0,0 +1,187 @@
+"""
+Thread-safe PostgreSQL connection pool with checkout statistics
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from psycopg2 import pool as pg_pool
+
+
+class ConnectionPool:
+    """
+    Bounded pool of psycopg2 connections.
+
+    Wraps psycopg2's ThreadedConnectionPool with:
+    - Blocking checkout (waits for a free slot instead of failing)
+    - Health check on checkout for connections idle too long
+    - Statistics for sizing the pool (wait time, in-use count, latency)
+    """
+
+    def __init__(self, min_connections, max_connections, checkout_timeout=30,
+                 health_check_interval=60, **connect_params):
+        """
+        Initialize connection pool
+
+        Args:
+            min_connections (int): Connections opened up front
+            max_connections (int): Hard limit on open connections
+            checkout_timeout (float): Seconds to wait for a free connection
+            health_check_interval (float): Idle seconds after which a
+                connection is pinged before being handed out
+            **connect_params: Arguments passed to psycopg2.connect()
+        """
+        self.max_connections = max_connections
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+
+        self._pool = pg_pool.ThreadedConnectionPool(
+            min_connections, max_connections, **connect_params
+        )
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self._last_used = {}
+
+        # Statistics
+        self._checkouts = 0
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._timeouts = 0
+        self._discarded = 0
+
+    def getconn(self):
+        """
+        Check out a healthy connection, blocking until one is free
+
+        Returns:
+            connection: psycopg2 connection
+
+        Raises:
+            TimeoutError: If no connection is freed within checkout_timeout
+        """
+        started = time.perf_counter()
+
+        if not self._slots.acquire(blocking=False):
+            if not self._slots.acquire(timeout=self.checkout_timeout):
+                with self._lock:
+                    self._timeouts += 1
+                raise TimeoutError(
+                    f"No database connection available after {self.checkout_timeout}s "
+                    f"({self.max_connections} in use)"
+                )
+            waited = time.perf_counter() - started
+            with self._lock:
+                self._waits += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+
+        try:
+            conn = self._get_healthy_connection()
+        except Exception:
+            self._slots.release()
+            raise
+
+        latency = time.perf_counter() - started
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+
+        return conn
+
+    def putconn(self, conn, close=False):
+        """
+        Return a connection to the pool
+
+        Args:
+            conn: Connection previously obtained from getconn()
+            close (bool): Discard the connection instead of reusing it
+        """
+        close = close or bool(conn.closed)
+        try:
+            self._pool.putconn(conn, close=close)
+        finally:
+            with self._lock:
+                if close:
+                    self._last_used.pop(id(conn), None)
+                else:
+                    self._last_used[id(conn)] = time.monotonic()
+                self._in_use -= 1
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that checks a connection out and back in"""
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def _get_healthy_connection(self):
+        """Get a connection from the pool, replacing dead ones"""
+        for _ in range(self.max_connections + 1):
+            conn = self._pool.getconn()
+            if self._is_healthy(conn):
+                return conn
+
+            with self._lock:
+                self._discarded += 1
+                self._last_used.pop(id(conn), None)
+            self._pool.putconn(conn, close=True)
+
+        raise ConnectionError("Unable to obtain a healthy database connection")
+
+    def _is_healthy(self, conn):
+        """Check connection state; ping it if it has been idle too long"""
+        if conn.closed:
+            return False
+
+        # Connections never handed out before were just opened by the pool
+        last_used = self._last_used.get(id(conn))
+        if last_used is None or time.monotonic() - last_used < self.health_check_interval:
+            return True
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def stats(self):
+        """
+        Get pool statistics
+
+        Returns:
+            dict: Checkout counts, in-use count and wait/latency timings (ms)
+        """
+        with self._lock:
+            checkouts = self._checkouts
+            return {
+                'max_connections': self.max_connections,
+                'in_use': self._in_use,
+                'peak_in_use': self._peak_in_use,
+                'checkouts': checkouts,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'discarded': self._discarded,
+                'avg_wait_ms': (self._total_wait / self._waits * 1000) if self._waits else 0.0,
+                'max_wait_ms': self._max_wait * 1000,
+                'avg_checkout_ms': (self._total_latency / checkouts * 1000) if checkouts else 0.0,
+                'max_checkout_ms': self._max_latency * 1000,
+            }
+
+    def closeall(self):
+        """Close every connection in the pool"""
+        if not self._pool.closed:
+            self._pool.closeall()
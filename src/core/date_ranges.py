@@ -0,0 +1,75 @@
+"""
+Index-friendly date filters
+
+Wrapping a column in a function or expression, as in DATE(invoice_date) or
+expiration_date::date - CURRENT_DATE, hides it from its B-tree index, so
+PostgreSQL scans the whole table. These helpers compare the bare column
+against half-open [start, end) bounds instead, which the planner can turn
+into an index range scan.
+"""
+
+from datetime import date, datetime, timedelta
+
+
+def on_day(column, day="CURRENT_DATE"):
+    """
+    Predicate matching timestamps that fall on one calendar day
+
+    Args:
+        column (str): Timestamp column, e.g. "invoice_date"
+        day (str): SQL date expression, CURRENT_DATE by default
+
+    Returns:
+        str: SQL predicate, e.g. "invoice_date >= CURRENT_DATE AND
+            invoice_date < CURRENT_DATE + 1"
+    """
+    return f"{column} >= {day} AND {column} < {day} + 1"
+
+
+def days_from_today(column, first, last):
+    """
+    Predicate matching timestamps between two days relative to today
+
+    Equivalent to (column::date - CURRENT_DATE) BETWEEN first AND last.
+
+    Args:
+        column (str): Timestamp column, e.g. "expiration_date"
+        first (int): First day, 0 for today
+        last (int): Last day, inclusive
+
+    Returns:
+        str: SQL predicate
+    """
+    return (f"{column} >= CURRENT_DATE + {int(first)} "
+            f"AND {column} < CURRENT_DATE + {int(last) + 1}")
+
+
+def between(column):
+    """
+    Half-open range predicate taking its bounds as query parameters
+
+    Args:
+        column (str): Timestamp column
+
+    Returns:
+        str: "column >= %s AND column < %s", to be used with day_bounds()
+    """
+    return f"{column} >= %s AND {column} < %s"
+
+
+def day_bounds(day):
+    """
+    Get the [start, end) timestamps of a calendar day
+
+    Args:
+        day: date, datetime or "YYYY-MM-DD" string
+
+    Returns:
+        tuple: (start, end) datetimes for between()
+    """
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    elif isinstance(day, datetime):
+        day = day.date()
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
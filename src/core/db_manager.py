@@ -1,168 +1,218 @@
-import psycopg2
-import bcrypt
-import os
-from dotenv import load_dotenv
+import itertools
+import sys
+from contextlib import contextmanager
+
+from ..config.database import DatabaseConfig
+from .activity_log_archiver import ActivityLogArchiver
+from .activity_log_writer import ActivityLogWriter
+from .connection_pool import ConnectionPool
+from .migrations import MigrationRunner
+
+
+# Unique names for server-side cursors
+_stream_ids = itertools.count(1)
 
-# Load environment variables from .env file
-load_dotenv()
 
 class DBManager:
     def __init__(self):
+        self.pool = None
         self.connection = None
         self.cursor = None
+        self.log_writer = None
+        self.log_archiver = None
 
     def connect(self):
         try:
-            # Connect to Supabase PostgreSQL database
-            self.connection = psycopg2.connect(
-                host=os.getenv('DB_HOST'),
-                port=os.getenv('DB_PORT', 5432),
-                database=os.getenv('DB_NAME', 'postgres'),
-                user=os.getenv('DB_USER', 'postgres'),
-                password=os.getenv('DB_PASSWORD')
+            # Open connection pool to Supabase PostgreSQL database
+            self.pool = ConnectionPool(
+                DatabaseConfig.MIN_CONNECTIONS,
+                DatabaseConfig.MAX_CONNECTIONS,
+                checkout_timeout=DatabaseConfig.CONNECTION_TIMEOUT,
+                health_check_interval=DatabaseConfig.POOL_HEALTH_CHECK_INTERVAL,
+                **DatabaseConfig.get_connection_params()
             )
+
+            # Pinned connection backing the shared-cursor API (execute/fetchall)
+            self.connection = self.pool.getconn()
             self.cursor = self.connection.cursor()
 
-            # Create necessary tables
-            self.create_tables()
+            # Apply pending schema migrations
+            self.migrate()
+
+            # Audit log entries are written in batches on a background thread
+            self.log_writer = ActivityLogWriter(self)
+            self.log_writer.start()
+
+            # Future partitions and retention of activity_log, off the startup path
+            self.log_archiver = ActivityLogArchiver(self)
+            self.log_archiver.start()
             return self.connection
         except Exception as e:
             print("Database connection failed:", e)
             return None
 
-    def create_tables(self):
-        try:
-            # Create staff table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS staff (
-                    staff_id VARCHAR(10) PRIMARY KEY,
-                    staff_psw TEXT NOT NULL,
-                    staff_name TEXT,
-                    staff_position TEXT DEFAULT 'staff',
-                    staff_phone TEXT,
-                    staff_email TEXT,
-                    staff_salary DECIMAL(10,0),
-                    hire_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-            """)
-
-            # Insert default admin account if it doesn't exist
-            self.cursor.execute("SELECT COUNT(*) FROM staff WHERE staff_id = 'admin';")
-            if self.cursor.fetchone()[0] == 0:
-                hashed_password = bcrypt.hashpw(b"admin", bcrypt.gensalt()).decode('utf-8')
-                self.cursor.execute("""
-                    INSERT INTO staff (staff_id, staff_psw, staff_name, staff_position, staff_phone, staff_email)
-                    VALUES (%s, %s, %s, %s, %s, %s);
-                """, ('admin', hashed_password, 'Administrator', 'admin', '0000000000', 'admin@example.com'))
-                print("✔ Admin account created (username: admin / password: admin)")
-
-            # Create supplier table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS supplier (
-                    supplier_id SERIAL PRIMARY KEY,
-                    supplier_name TEXT,
-                    contact_name TEXT,
-                    contact_phone TEXT,
-                    contact_email TEXT,
-                    supplier_address TEXT,
-                    payment_terms TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-            """)
-
-            # Create customer table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS customer (
-                    customer_id SERIAL PRIMARY KEY,
-                    customer_name TEXT,
-                    customer_phone VARCHAR(11),
-                    customer_email TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-            """)
-
-            # Create medicine table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS medicine (
-                    medicine_id SERIAL PRIMARY KEY,
-                    medicine_name TEXT,
-                    generic_name TEXT,
-                    brand_name TEXT,
-                    supplier_id INT REFERENCES supplier(supplier_id),
-                    category_id INT,
-                    unit_price DECIMAL(10,0),
-                    sale_price DECIMAL(10,0),
-                    stock_quantity INT,
-                    expiration_date TIMESTAMP,
-                    batch_number TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    unit TEXT
-                );
-            """)
-
-            # Create stock table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS stock (
-                    stock_id SERIAL PRIMARY KEY,
-                    medicine_id INT REFERENCES medicine(medicine_id),
-                    supplier_id INT REFERENCES supplier(supplier_id),
-                    quantity INT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-            """)
-
-            # Create invoice table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS invoice (
-                    invoice_id SERIAL PRIMARY KEY,
-                    invoice_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    customer_id INT REFERENCES customer(customer_id),
-                    staff_id VARCHAR(10) REFERENCES staff(staff_id),
-                    total_amount DECIMAL(10,0),
-                    payment_status TEXT,
-                    due_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-            """)
-
-            # Create invoice_detail table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS invoice_detail (
-                    invoice_detail_id SERIAL PRIMARY KEY,
-                    invoice_id INT REFERENCES invoice(invoice_id),
-                    medicine_id INT REFERENCES medicine(medicine_id),
-                    quantity INT,
-                    sale_price DECIMAL(10,0),
-                    total_price DECIMAL(10,0)
-                );
-            """)
-
-            # Create activity_log table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS activity_log (
-                    log_id SERIAL PRIMARY KEY,
-                    staff_id VARCHAR(10) REFERENCES staff(staff_id),
-                    action TEXT,
-                    log_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                );
-            """)
-
-            self.connection.commit()
-            print("✔ Database and tables created successfully.")
+    def migrate(self):
+        """
+        Bring the database schema up to date
 
+        Reads schema_version in one round trip and runs only the pending
+        migrations, so an up-to-date database costs a single query.
+        """
+        try:
+            runner = MigrationRunner(self.connection)
+            applied = runner.run()
+            if applied:
+                print("✔ Database schema migrated to version", applied[-1])
+                for table, column in runner.unindexed_foreign_keys():
+                    print(f"⚠ Foreign key {table}.{column} has no index")
         except Exception as e:
-            print("❌ Error creating tables:", e)
+            print("❌ Error migrating database schema:", e)
             self.connection.rollback()
 
+    def create_tables(self):
+        """Create all tables (kept for compatibility, same as migrate())"""
+        self.migrate()
+
+    def fetch_all(self, query, params=None, conn=None):
+        """
+        Run a statement on its own cursor and return every row
+
+        Args:
+            query (str): SQL statement
+            params (tuple or dict, optional): Query parameters
+            conn: Connection to run on (e.g. a QueryRunner task's); by
+                default a pooled connection is checked out and the statement
+                committed
+
+        Returns:
+            list: Row tuples
+        """
+        with self._cursor(conn) as cur:
+            cur.execute(query, params or ())
+            return cur.fetchall()
+
+    def fetch_one(self, query, params=None, conn=None):
+        """
+        Run a statement on its own cursor and return its first row
+
+        Also the way to run INSERT/UPDATE ... RETURNING outside a transaction() block.
+
+        Args:
+            query (str): SQL statement
+            params (tuple or dict, optional): Query parameters
+            conn: Connection to run on, see fetch_all()
+
+        Returns:
+            tuple: First row, or None if there is none
+        """
+        with self._cursor(conn) as cur:
+            cur.execute(query, params or ())
+            return cur.fetchone() if cur.description else None
+
+    def iter_rows(self, query, params=None, batch_size=None):
+        """
+        Run a query and yield its rows one by one, one batch held at a time
+
+        Rows come from a server-side cursor (see stream()); the pooled
+        connection is held until the generator is exhausted or closed.
+
+        Args:
+            query (str): SQL statement
+            params (tuple or dict, optional): Query parameters
+            batch_size (int, optional): Rows fetched per round trip
+
+        Yields:
+            tuple: Rows
+        """
+        for batch in self.stream(query, params, batch_size):
+            yield from batch
+
+    def stream(self, query, params=None, batch_size=None, conn=None, max_batch_bytes=None):
+        """
+        Run a query on a server-side (named) cursor and yield its rows in batches
+
+        A plain psycopg2 cursor copies the whole result into Python memory on
+        execute(); a named cursor keeps it on the server and each batch is
+        one FETCH. Only one batch is held at a time, and batches shrink when
+        rows are wide so a batch stays under max_batch_bytes.
+
+        Args:
+            query (str): SELECT statement
+            params (tuple or dict, optional): Query parameters
+            batch_size (int, optional): Most rows per batch, defaults to
+                DatabaseConfig.STREAM_BATCH_SIZE
+            conn: Connection to run on (e.g. a QueryRunner task's), must not
+                be in autocommit; by default a pooled connection is held until
+                the generator is exhausted or closed
+            max_batch_bytes (int, optional): Approximate memory cap per batch,
+                defaults to DatabaseConfig.STREAM_BATCH_BYTES
+
+        Yields:
+            list: Row tuples, never empty
+        """
+        batch_size = batch_size or DatabaseConfig.STREAM_BATCH_SIZE
+        max_batch_bytes = max_batch_bytes or DatabaseConfig.STREAM_BATCH_BYTES
+
+        if conn is not None:
+            yield from self._stream(conn, query, params, batch_size, max_batch_bytes)
+            return
+        with self.pooled_connection() as pooled:
+            yield from self._stream(pooled, query, params, batch_size, max_batch_bytes)
+
+    @staticmethod
+    def _stream(conn, query, params, batch_size, max_batch_bytes):
+        """Fetch batches from a named cursor on the connection"""
+        with conn.cursor(name=f"stream_{next(_stream_ids)}") as cur:
+            cur.itersize = batch_size
+            cur.execute(query, params or ())
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+
+                # Size the next batch from this one's first row
+                sample = rows[0]
+                row_bytes = sys.getsizeof(sample) + sum(sys.getsizeof(v) for v in sample)
+                batch_size = max(1, min(batch_size, max_batch_bytes // row_bytes))
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run several statements atomically on one pooled connection
+
+        Commits when the block succeeds and rolls back if it raises.
+
+        Example:
+            with db.transaction() as cur:
+                cur.execute("UPDATE ...", params)
+                cur.execute("DELETE ...", params)
+
+        Yields:
+            cursor: psycopg2 cursor of the transaction
+        """
+        with self.pooled_cursor() as cur:
+            yield cur
+
+    @contextmanager
+    def _cursor(self, conn=None):
+        """Cursor on the given connection, or a pooled autocommit one"""
+        if conn is not None:
+            with conn.cursor() as cur:
+                yield cur
+        else:
+            # Single statements need no BEGIN/COMMIT round trips
+            with self.pooled_connection(autocommit=True) as pooled:
+                with pooled.cursor() as cur:
+                    yield cur
+
+    # Shared-cursor API, kept for legacy callers. A statement issued between
+    # execute() and fetchall() - from a timer, a nested dialog or another
+    # thread - replaces the pending result; use fetch_all(), fetch_one(),
+    # iter_rows() and transaction() instead.
+
     def execute(self, query, params=None):
-        """Execute a query with optional parameters"""
+        """Execute a query with optional parameters (shared cursor, deprecated)"""
         try:
             self.cursor.execute(query, params or ())
             return self.cursor
@@ -171,7 +221,7 @@ class DBManager:
             raise
 
     def executemany(self, query, params_list):
-        """Execute a query with multiple parameter sets"""
+        """Execute a query with multiple parameter sets (shared cursor, deprecated)"""
         try:
             self.cursor.executemany(query, params_list)
             return self.cursor
@@ -180,11 +230,11 @@ class DBManager:
             raise
 
     def fetchall(self):
-        """Fetch all rows from the last query"""
+        """Fetch all rows from the last query (shared cursor, deprecated)"""
         return self.cursor.fetchall()
 
     def fetchone(self):
-        """Fetch one row from the last query"""
+        """Fetch one row from the last query (shared cursor, deprecated)"""
         return self.cursor.fetchone()
 
     def rollback(self):
@@ -192,23 +242,97 @@ class DBManager:
         if self.connection:
             self.connection.rollback()
 
-    def commit(self):
-        """Commit the current transaction"""
-        if self.connection:
-            self.connection.commit()
+    @contextmanager
+    def pooled_connection(self, autocommit=False):
+        """
+        Check out a connection from the pool for one unit of work
+
+        Commits when the block succeeds, rolls back if it raises, and
+        always returns the connection to the pool.
+
+        Args:
+            autocommit (bool): Run each statement in its own transaction. Saves
+                the BEGIN/COMMIT round trips for single-statement work.
+
+        Yields:
+            connection: psycopg2 connection
+        """
+        conn = self.pool.getconn()
+        if autocommit:
+            conn.autocommit = True
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if autocommit and not conn.closed:
+                conn.autocommit = False
+            self.pool.putconn(conn)
+
+    @contextmanager
+    def pooled_cursor(self):
+        """
+        Open a dedicated cursor on a pooled connection
+
+        Yields:
+            cursor: psycopg2 cursor, closed when the block exits
+        """
+        with self.pooled_connection() as conn:
+            with conn.cursor() as cur:
+                yield cur
+
+    def pool_stats(self):
+        """
+        Get connection pool statistics
+
+        Returns:
+            dict: Pool statistics, empty if not connected
+        """
+        return self.pool.stats() if self.pool else {}
+
+    def query_stats(self):
+        """
+        Get the per-statement statistics
+
+        Returns:
+            QueryStats: Statistics of every instrumented cursor, or None
+                unless DatabaseConfig.QUERY_STATS is on
+        """
+        if not DatabaseConfig.QUERY_STATS:
+            return None
+        from .query_stats import query_stats
+        return query_stats
 
     def close(self):
         """Close database connection"""
+        stats = self.query_stats()
+        if stats is not None and self.pool:
+            print("✔ Query statistics written to", stats.dump())
+        if self.log_archiver:
+            self.log_archiver.close()
+            self.log_archiver = None
+        if self.log_writer:
+            self.log_writer.close()
+            self.log_writer = None
         if self.cursor:
             self.cursor.close()
+            self.cursor = None
         if self.connection:
-            self.connection.close()
+            self.pool.putconn(self.connection)
+            self.connection = None
+        if self.pool:
+            self.pool.closeall()
 
     def log_action(self, staff_id, action):
-        """Log user actions to activity_log table"""
-        try:
-            sql = "INSERT INTO activity_log (staff_id, action, log_time) VALUES (%s, %s, NOW())"
-            self.execute(sql, (staff_id, action))
-            self.connection.commit()
-        except Exception as e:
-            print(f"[LOG ERROR] {e}")
+        """
+        Log user actions to activity_log table
+
+        Entries are queued and written in batches by the background
+        ActivityLogWriter, so this never waits on the database.
+        """
+        if self.log_writer:
+            self.log_writer.log(staff_id, action)
+        else:
+            print(f"[LOG ERROR] Log writer not running, dropped: {staff_id} - {action}")
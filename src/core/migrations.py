@@ -0,0 +1,615 @@
+"""
+Versioned schema migrations
+
+The applied version is stored in the schema_version table. On startup the
+runner reads it in one round trip and only touches the schema when
+migrations are pending. supabase_schema.sql is generated from this module:
+
+    python -m src.core.migrations > supabase_schema.sql
+"""
+
+from psycopg2 import errors
+
+
+# Advisory lock key so two terminals starting at once don't migrate twice
+MIGRATION_LOCK_KEY = 7_340_001
+
+
+class Migration:
+    """A numbered schema change made of one or more SQL statements"""
+
+    def __init__(self, version, description, statements, transactional=True):
+        """
+        Initialize migration
+
+        Args:
+            version (int): Schema version reached after this migration
+            description (str): Short human readable summary
+            statements (list): SQL statements, executed in order
+            transactional (bool): Run inside a transaction. Set to False for
+                statements that cannot, such as CREATE INDEX CONCURRENTLY
+        """
+        self.version = version
+        self.description = description
+        self.statements = statements
+        self.transactional = transactional
+
+
+SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INT PRIMARY KEY,
+    description TEXT,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)"""
+
+# Updated_at trigger shared by all tables that carry the column
+_UPDATED_AT_FUNCTION = """
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql"""
+
+
+def _updated_at_trigger(table):
+    """Build the statements (re)creating the updated_at trigger for a table"""
+    return [
+        f"DROP TRIGGER IF EXISTS update_{table}_updated_at ON {table}",
+        f"CREATE TRIGGER update_{table}_updated_at BEFORE UPDATE ON {table}\n"
+        f"    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()",
+    ]
+
+
+_BASELINE = [
+    "CREATE EXTENSION IF NOT EXISTS pgcrypto",
+    _UPDATED_AT_FUNCTION,
+
+    """
+CREATE TABLE IF NOT EXISTS staff (
+    staff_id VARCHAR(10) PRIMARY KEY,
+    staff_psw TEXT NOT NULL,
+    staff_name TEXT,
+    staff_position TEXT DEFAULT 'staff',
+    staff_phone TEXT,
+    staff_email TEXT,
+    staff_salary DECIMAL(10,0),
+    hire_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)""",
+
+    """
+CREATE TABLE IF NOT EXISTS supplier (
+    supplier_id SERIAL PRIMARY KEY,
+    supplier_name TEXT,
+    contact_name TEXT,
+    contact_phone TEXT,
+    contact_email TEXT,
+    supplier_address TEXT,
+    payment_terms TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)""",
+
+    """
+CREATE TABLE IF NOT EXISTS customer (
+    customer_id SERIAL PRIMARY KEY,
+    customer_name TEXT,
+    customer_phone VARCHAR(11),
+    customer_email TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)""",
+
+    """
+CREATE TABLE IF NOT EXISTS category (
+    category_id SERIAL PRIMARY KEY,
+    category_name TEXT NOT NULL
+)""",
+
+    """
+CREATE TABLE IF NOT EXISTS payment_method (
+    payment_method_id SERIAL PRIMARY KEY,
+    payment_name TEXT NOT NULL
+)""",
+
+    """
+CREATE TABLE IF NOT EXISTS medicine (
+    medicine_id SERIAL PRIMARY KEY,
+    medicine_name TEXT,
+    generic_name TEXT,
+    brand_name TEXT,
+    supplier_id INT REFERENCES supplier(supplier_id) ON DELETE SET NULL,
+    category_id INT,
+    unit_price DECIMAL(10,0),
+    sale_price DECIMAL(10,0),
+    stock_quantity INT DEFAULT 0,
+    expiration_date TIMESTAMP,
+    batch_number TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    unit TEXT
+)""",
+
+    """
+CREATE TABLE IF NOT EXISTS stock (
+    stock_id SERIAL PRIMARY KEY,
+    medicine_id INT REFERENCES medicine(medicine_id) ON DELETE CASCADE,
+    supplier_id INT REFERENCES supplier(supplier_id) ON DELETE SET NULL,
+    staff_id VARCHAR(10) REFERENCES staff(staff_id) ON DELETE SET NULL,
+    payment_method_id INT REFERENCES payment_method(payment_method_id),
+    quantity INT DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)""",
+    # Columns used by the stock dialogs but missing from older databases
+    "ALTER TABLE stock ADD COLUMN IF NOT EXISTS staff_id VARCHAR(10) REFERENCES staff(staff_id) ON DELETE SET NULL",
+    "ALTER TABLE stock ADD COLUMN IF NOT EXISTS payment_method_id INT REFERENCES payment_method(payment_method_id)",
+
+    """
+CREATE TABLE IF NOT EXISTS stock_detail (
+    stock_detail_id SERIAL PRIMARY KEY,
+    stock_id INT REFERENCES stock(stock_id) ON DELETE CASCADE,
+    medicine_id INT REFERENCES medicine(medicine_id) ON DELETE CASCADE,
+    quantity INT DEFAULT 0,
+    price DECIMAL(10,0) DEFAULT 0,
+    batch_number TEXT,
+    expiration_date TIMESTAMP,
+    note TEXT
+)""",
+
+    """
+CREATE TABLE IF NOT EXISTS invoice (
+    invoice_id SERIAL PRIMARY KEY,
+    invoice_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    customer_id INT REFERENCES customer(customer_id) ON DELETE SET NULL,
+    staff_id VARCHAR(10) REFERENCES staff(staff_id) ON DELETE SET NULL,
+    total_amount DECIMAL(10,0) DEFAULT 0,
+    payment_method_id INT REFERENCES payment_method(payment_method_id),
+    payment_status TEXT DEFAULT 'pending',
+    due_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)""",
+    "ALTER TABLE invoice ADD COLUMN IF NOT EXISTS payment_method_id INT REFERENCES payment_method(payment_method_id)",
+
+    """
+CREATE TABLE IF NOT EXISTS invoice_detail (
+    invoice_detail_id SERIAL PRIMARY KEY,
+    invoice_id INT REFERENCES invoice(invoice_id) ON DELETE CASCADE,
+    medicine_id INT REFERENCES medicine(medicine_id) ON DELETE SET NULL,
+    quantity INT DEFAULT 0,
+    sale_price DECIMAL(10,0) DEFAULT 0,
+    total_price DECIMAL(10,0) DEFAULT 0
+)""",
+
+    """
+CREATE TABLE IF NOT EXISTS activity_log (
+    log_id SERIAL PRIMARY KEY,
+    staff_id VARCHAR(10) REFERENCES staff(staff_id) ON DELETE SET NULL,
+    action TEXT,
+    log_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)""",
+
+    *_updated_at_trigger('staff'),
+    *_updated_at_trigger('supplier'),
+    *_updated_at_trigger('customer'),
+    *_updated_at_trigger('medicine'),
+    *_updated_at_trigger('stock'),
+    *_updated_at_trigger('invoice'),
+
+    "CREATE INDEX IF NOT EXISTS idx_medicine_supplier ON medicine(supplier_id)",
+    "CREATE INDEX IF NOT EXISTS idx_medicine_category ON medicine(category_id)",
+    "CREATE INDEX IF NOT EXISTS idx_medicine_expiration ON medicine(expiration_date)",
+    "CREATE INDEX IF NOT EXISTS idx_invoice_customer ON invoice(customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_invoice_staff ON invoice(staff_id)",
+    "CREATE INDEX IF NOT EXISTS idx_invoice_date ON invoice(invoice_date)",
+    "CREATE INDEX IF NOT EXISTS idx_activity_log_staff ON activity_log(staff_id)",
+    "CREATE INDEX IF NOT EXISTS idx_activity_log_time ON activity_log(log_time)",
+
+    # Default admin account (password: admin), hashed server-side with bcrypt
+    """
+INSERT INTO staff (staff_id, staff_psw, staff_name, staff_position, staff_phone, staff_email)
+VALUES ('admin', crypt('admin', gen_salt('bf', 12)), 'Administrator', 'admin',
+        '0000000000', 'admin@example.com')
+ON CONFLICT (staff_id) DO NOTHING""",
+]
+
+
+# Accent- and case-insensitive search. unaccent() is only STABLE (its
+# dictionary can change), so expression indexes go through an IMMUTABLE
+# wrapper that pins the dictionary explicitly.
+_SEARCH_INDEXES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS unaccent SCHEMA public",
+    """
+CREATE OR REPLACE FUNCTION f_unaccent(text)
+RETURNS text AS $$
+    SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT""",
+    "CREATE INDEX IF NOT EXISTS idx_medicine_name_trgm ON medicine "
+    "USING gin (lower(f_unaccent(medicine_name)) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_medicine_generic_trgm ON medicine "
+    "USING gin (lower(f_unaccent(generic_name)) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_medicine_brand_trgm ON medicine "
+    "USING gin (lower(f_unaccent(brand_name)) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_customer_name_trgm ON customer "
+    "USING gin (lower(f_unaccent(customer_name)) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_customer_phone_trgm ON customer "
+    "USING gin (customer_phone gin_trgm_ops)",
+]
+
+
+# Scanned GTIN/EAN per medicine batch; NULL for batches without a barcode
+_BARCODE = [
+    "ALTER TABLE medicine ADD COLUMN IF NOT EXISTS barcode TEXT",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_medicine_barcode ON medicine(barcode) "
+    "WHERE barcode IS NOT NULL",
+]
+
+
+def _concurrent_index(name, table, columns, using=None, unique=False):
+    """
+    Build an index without blocking writes to a live table
+
+    A failed CREATE INDEX CONCURRENTLY leaves an invalid index behind, which
+    IF NOT EXISTS would then skip, so any leftover is dropped first. The
+    migration only runs once, so the drop never discards a finished index.
+    """
+    method = f" USING {using} " if using else ""
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    return [
+        f"DROP INDEX CONCURRENTLY IF EXISTS {name}",
+        f"CREATE {kind} CONCURRENTLY {name} ON {table}{method}({columns})",
+    ]
+
+
+# Foreign keys (joins and ON DELETE cascades) and filter columns that had no
+# index. Built concurrently, so terminals keep selling while it runs.
+_FOREIGN_KEY_INDEXES = [
+    *_concurrent_index("idx_invoice_detail_invoice", "invoice_detail", "invoice_id"),
+    *_concurrent_index("idx_invoice_detail_medicine", "invoice_detail", "medicine_id"),
+    *_concurrent_index("idx_invoice_payment_method", "invoice", "payment_method_id"),
+    *_concurrent_index("idx_stock_medicine", "stock", "medicine_id"),
+    *_concurrent_index("idx_stock_supplier", "stock", "supplier_id"),
+    *_concurrent_index("idx_stock_staff", "stock", "staff_id"),
+    *_concurrent_index("idx_stock_payment_method", "stock", "payment_method_id"),
+    *_concurrent_index("idx_stock_detail_stock", "stock_detail", "stock_id"),
+    *_concurrent_index("idx_stock_detail_medicine", "stock_detail", "medicine_id"),
+    *_concurrent_index("idx_customer_phone", "customer", "customer_phone"),
+    *_concurrent_index("idx_medicine_updated_at", "medicine", "updated_at"),
+]
+
+# Keyset pagination of the log viewer walks (log_time, log_id) downwards,
+# optionally for one staff member, and filters actions by substring. The
+# composite indexes supersede the single-column ones from the baseline.
+_ACTIVITY_LOG_INDEXES = [
+    *_concurrent_index("idx_activity_log_time_id", "activity_log", "log_time, log_id"),
+    *_concurrent_index("idx_activity_log_staff_time", "activity_log",
+                       "staff_id, log_time, log_id"),
+    *_concurrent_index("idx_activity_log_action_trgm", "activity_log",
+                       "action gin_trgm_ops", using="gin"),
+    "DROP INDEX IF EXISTS idx_activity_log_time",
+    "DROP INDEX IF EXISTS idx_activity_log_staff",
+]
+
+# Monthly partitions of activity_log, named activity_log_YYYYMM. Creates the
+# missing ones from first_month to last_month; used by the migration below
+# and by ActivityLogArchiver to keep partitions ahead of the clock. Rows the
+# default partition took in while a month had no partition would make
+# CREATE TABLE ... PARTITION OF fail, so the month is built as a plain table,
+# those rows are moved into it, and it is attached.
+_CREATE_LOG_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_activity_log_partitions(first_month DATE, last_month DATE)
+RETURNS INT AS $$
+DECLARE
+    part_start DATE := date_trunc('month', first_month)::date;
+    part_end DATE;
+    part_name TEXT;
+    created INT := 0;
+BEGIN
+    WHILE part_start <= last_month LOOP
+        part_end := (part_start + INTERVAL '1 month')::date;
+        part_name := 'activity_log_' || to_char(part_start, 'YYYYMM');
+        IF to_regclass(part_name) IS NULL THEN
+            EXECUTE format('CREATE TABLE %I (LIKE activity_log INCLUDING DEFAULTS)', part_name);
+            IF to_regclass('activity_log_default') IS NOT NULL THEN
+                EXECUTE format(
+                    'WITH moved AS (DELETE FROM activity_log_default '
+                    'WHERE log_time >= %L AND log_time < %L RETURNING *) '
+                    'INSERT INTO %I SELECT * FROM moved',
+                    part_start, part_end, part_name
+                );
+            END IF;
+            EXECUTE format(
+                'ALTER TABLE activity_log ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                part_name, part_start, part_end
+            );
+            created := created + 1;
+        END IF;
+        part_start := part_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql"""
+
+# Everything already in activity_log becomes one partition, bounded above by
+# the start of next month and named after the current month, so retention
+# archives it with that month. Nothing is copied: the slow parts run first,
+# without blocking inserts, and leave the table in the shape ATTACH PARTITION
+# can accept without scanning it.
+# - NULL log_time (never written by the app) is set to the epoch
+# - a NOT VALID check, validated under a lock that lets writes through,
+#   proves the partition bound and lets SET NOT NULL skip its scan
+# - the primary key of the partitioned table must include log_time
+_PARTITION_BOUND_CHECK = """
+DO $$
+BEGIN
+    ALTER TABLE activity_log DROP CONSTRAINT IF EXISTS activity_log_partition_bound;
+    EXECUTE format(
+        'ALTER TABLE activity_log ADD CONSTRAINT activity_log_partition_bound '
+        'CHECK (log_time IS NOT NULL AND log_time < %L) NOT VALID',
+        (date_trunc('month', CURRENT_DATE) + INTERVAL '1 month')::date
+    );
+END
+$$"""
+
+_PREPARE_ACTIVITY_LOG = [
+    "UPDATE activity_log SET log_time = 'epoch' WHERE log_time IS NULL",
+    _PARTITION_BOUND_CHECK,
+    "ALTER TABLE activity_log VALIDATE CONSTRAINT activity_log_partition_bound",
+    *_concurrent_index("activity_log_log_id_log_time_key", "activity_log",
+                       "log_id, log_time", unique=True),
+]
+
+# Swap in the partitioned parent. Only catalog changes, so the lock is held
+# for moments: the old table keeps its rows, ids, sequence and the keyset
+# indexes built by migration 5, which the parent's indexes adopt on attach.
+_PARTITION_ACTIVITY_LOG = """
+DO $$
+DECLARE
+    bound DATE := (date_trunc('month', CURRENT_DATE) + INTERVAL '1 month')::date;
+    old_name TEXT := 'activity_log_' || to_char(CURRENT_DATE, 'YYYYMM');
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'activity_log'::regclass) = 'p' THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE activity_log ALTER COLUMN log_time SET NOT NULL;
+    ALTER TABLE activity_log DROP CONSTRAINT activity_log_pkey;
+    EXECUTE format(
+        'ALTER TABLE activity_log ADD CONSTRAINT %I PRIMARY KEY '
+        'USING INDEX activity_log_log_id_log_time_key', old_name || '_pkey'
+    );
+    EXECUTE format('ALTER INDEX idx_activity_log_time_id RENAME TO %I',
+                   old_name || '_log_time_log_id_idx');
+    EXECUTE format('ALTER INDEX idx_activity_log_staff_time RENAME TO %I',
+                   old_name || '_staff_id_log_time_log_id_idx');
+    EXECUTE format('ALTER INDEX idx_activity_log_action_trgm RENAME TO %I',
+                   old_name || '_action_idx');
+    EXECUTE format('ALTER TABLE activity_log RENAME TO %I', old_name);
+
+    CREATE TABLE activity_log (
+        log_id INT NOT NULL DEFAULT nextval('activity_log_log_id_seq'),
+        staff_id VARCHAR(10) REFERENCES staff(staff_id) ON DELETE SET NULL,
+        action TEXT,
+        log_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (log_id, log_time)
+    ) PARTITION BY RANGE (log_time);
+    -- Created on the parent, so every partition gets its own copy
+    CREATE INDEX idx_activity_log_time_id ON activity_log(log_time, log_id);
+    CREATE INDEX idx_activity_log_staff_time ON activity_log(staff_id, log_time, log_id);
+    CREATE INDEX idx_activity_log_action_trgm ON activity_log USING gin (action gin_trgm_ops);
+
+    EXECUTE format(
+        'ALTER TABLE activity_log ATTACH PARTITION %I FOR VALUES FROM (MINVALUE) TO (%L)',
+        old_name, bound
+    );
+    EXECUTE format('ALTER TABLE %I DROP CONSTRAINT activity_log_partition_bound', old_name);
+    CREATE TABLE activity_log_default PARTITION OF activity_log DEFAULT;
+    ALTER SEQUENCE activity_log_log_id_seq OWNED BY activity_log.log_id;
+
+    PERFORM create_activity_log_partitions(bound, (CURRENT_DATE + INTERVAL '3 months')::date);
+END
+$$"""
+
+_ACTIVITY_LOG_PARTITIONS = [
+    _CREATE_LOG_PARTITIONS_FUNCTION,
+    _PARTITION_ACTIVITY_LOG,
+]
+
+# Foreign key columns not covered by the leading column of any index
+UNINDEXED_FOREIGN_KEYS_SQL = """
+    SELECT c.conrelid::regclass::text, a.attname
+    FROM pg_constraint c
+    JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]
+    JOIN pg_namespace n ON n.oid = c.connamespace
+    WHERE c.contype = 'f'
+      AND n.nspname = current_schema()
+      AND NOT EXISTS (
+          SELECT 1 FROM pg_index i
+          WHERE i.indrelid = c.conrelid
+            AND i.indisvalid
+            AND i.indkey[0] = c.conkey[1]
+      )
+    ORDER BY 1, 2
+"""
+
+
+MIGRATIONS = [
+    Migration(1, "Baseline schema", _BASELINE),
+    Migration(2, "Trigram search indexes", _SEARCH_INDEXES),
+    Migration(3, "Medicine barcode", _BARCODE),
+    Migration(4, "Foreign key and filter indexes", _FOREIGN_KEY_INDEXES,
+              transactional=False),
+    Migration(5, "Activity log keyset indexes", _ACTIVITY_LOG_INDEXES,
+              transactional=False),
+    Migration(6, "Prepare activity_log for partitioning", _PREPARE_ACTIVITY_LOG,
+              transactional=False),
+    Migration(7, "Monthly activity_log partitions", _ACTIVITY_LOG_PARTITIONS),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+class MigrationRunner:
+    """Applies pending migrations on a psycopg2 connection"""
+
+    def __init__(self, connection, migrations=None):
+        """
+        Initialize migration runner
+
+        Args:
+            connection: psycopg2 connection (not in a transaction)
+            migrations (list, optional): Migrations to apply, defaults to MIGRATIONS
+        """
+        self.connection = connection
+        self.migrations = migrations if migrations is not None else MIGRATIONS
+
+    def current_version(self):
+        """
+        Read the applied schema version in a single round trip
+
+        Returns:
+            int: Applied version, 0 for a database without schema_version
+        """
+        autocommit = self.connection.autocommit
+        self.connection.autocommit = True
+        try:
+            with self.connection.cursor() as cur:
+                cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+                return cur.fetchone()[0]
+        except errors.UndefinedTable:
+            return 0
+        finally:
+            self.connection.autocommit = autocommit
+
+    def pending(self, current=None):
+        """Get migrations newer than the applied version"""
+        if current is None:
+            current = self.current_version()
+        return [m for m in self.migrations if m.version > current]
+
+    def unindexed_foreign_keys(self):
+        """
+        List foreign key columns that no valid index starts with
+
+        Returns:
+            list: (table, column) pairs
+        """
+        with self.connection.cursor() as cur:
+            cur.execute(UNINDEXED_FOREIGN_KEYS_SQL)
+            rows = cur.fetchall()
+        self.connection.commit()
+        return rows
+
+    def run(self):
+        """
+        Apply all pending migrations
+
+        Returns:
+            list: Versions applied by this call (empty when up to date)
+        """
+        pending = self.pending()
+        if not pending:
+            return []
+
+        with self.connection.cursor() as cur:
+            cur.execute(SCHEMA_VERSION_TABLE)
+        self.connection.commit()
+
+        applied = []
+        for migration in pending:
+            if self._apply(migration):
+                applied.append(migration.version)
+        return applied
+
+    def _apply(self, migration):
+        """
+        Apply one migration under the migration advisory lock
+
+        Returns:
+            bool: False if another process applied it first
+        """
+        conn = self.connection
+        autocommit = conn.autocommit
+        conn.autocommit = not migration.transactional
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+                try:
+                    cur.execute("SELECT 1 FROM schema_version WHERE version = %s",
+                                (migration.version,))
+                    if cur.fetchone():
+                        return False
+
+                    for statement in migration.statements:
+                        cur.execute(statement)
+
+                    cur.execute(
+                        "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                        (migration.version, migration.description)
+                    )
+                    if migration.transactional:
+                        conn.commit()
+                    print(f"✔ Applied migration {migration.version}: {migration.description}")
+                    return True
+                except Exception:
+                    if migration.transactional:
+                        conn.rollback()
+                    raise
+                finally:
+                    cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+                    if migration.transactional:
+                        conn.commit()
+        finally:
+            conn.autocommit = autocommit
+
+
+def render_sql(migrations=None):
+    """
+    Render migrations as a standalone SQL script
+
+    Args:
+        migrations (list, optional): Migrations to render, defaults to MIGRATIONS
+
+    Returns:
+        str: SQL script equivalent to running all migrations
+    """
+    migrations = migrations if migrations is not None else MIGRATIONS
+    lines = [
+        "-- MediManager Database Schema for Supabase (PostgreSQL)",
+        "-- Generated from src/core/migrations.py - do not edit by hand:",
+        "--     python -m src.core.migrations > supabase_schema.sql",
+        "",
+        SCHEMA_VERSION_TABLE.strip() + ";",
+    ]
+
+    for migration in migrations:
+        lines.append("")
+        lines.append(f"-- Migration {migration.version}: {migration.description}")
+        for statement in migration.statements:
+            if not migration.transactional:
+                # The script targets a new database, where there are no
+                # writers to keep going, and SQL editors that wrap scripts
+                # in a transaction would reject CONCURRENTLY
+                if statement.startswith("DROP INDEX CONCURRENTLY"):
+                    continue
+                if statement.startswith("CREATE"):
+                    statement = statement.replace("INDEX CONCURRENTLY",
+                                                  "INDEX IF NOT EXISTS")
+            lines.append(statement.strip() + ";")
+        lines.append(
+            f"INSERT INTO schema_version (version, description) "
+            f"VALUES ({migration.version}, '{migration.description}') "
+            f"ON CONFLICT (version) DO NOTHING;"
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    print(render_sql(), end="")
@@ -0,0 +1,166 @@
+"""
+Query-count budgets per UI action - catches N+1 loops and repeated statements
+"""
+
+import functools
+import threading
+from collections import Counter
+
+from ..config.database import DatabaseConfig
+
+
+# Action name -> most statements it may issue, filled by @query_budget
+BUDGETS = {}
+
+# Raise QueryBudgetExceeded instead of printing a warning (the budget check
+# script turns this on)
+raise_on_violation = False
+
+
+class QueryBudgetExceeded(AssertionError):
+    """An action issued more statements than its budget, or repeated one"""
+
+
+class QueryRecorder:
+    """
+    Records the statements issued while it is active
+
+    Statements from every thread are recorded, so work an action hands to
+    the QueryRunner counts too. Needs instrumented connections
+    (QUERY_BUDGETS=1 or QUERY_STATS=1 before connecting).
+
+    Example:
+        with QueryRecorder("open invoice detail") as recorder:
+            InvoiceInformationDialog(context, invoice_id)
+        recorder.check(max_queries=1)
+    """
+
+    def __init__(self, action=None):
+        """
+        Initialize recorder
+
+        Args:
+            action (str, optional): Name of the action, used in messages
+        """
+        self.action = action or "action"
+        self.statements = []  # (normalized sql, parameter shape, caller, seconds)
+        self._calls = Counter()  # (normalized sql, repr(params)) -> executions
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        from .query_stats import query_stats
+        query_stats.add_listener(self._add)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        from .query_stats import query_stats
+        query_stats.remove_listener(self._add)
+        return False
+
+    @property
+    def count(self):
+        """Number of statements recorded"""
+        return len(self.statements)
+
+    def repeated(self):
+        """
+        Find statements issued more than once
+
+        Returns:
+            dict: Normalized SQL -> (executions, distinct parameter sets).
+                Distinct sets > 1 is the N+1 pattern (one query per row);
+                equal counts of 1 set mean the same query was simply re-run
+        """
+        with self._lock:
+            per_sql = Counter()
+            distinct = Counter()
+            for (sql, _params), n in self._calls.items():
+                per_sql[sql] += n
+                distinct[sql] += 1
+        return {sql: (n, distinct[sql]) for sql, n in per_sql.items() if n > 1}
+
+    def violations(self, max_queries=None, allow_repeats=False):
+        """
+        List the ways the recorded statements break a budget
+
+        Args:
+            max_queries (int, optional): Most statements allowed
+            allow_repeats (bool): Accept statements issued more than once
+
+        Returns:
+            list: Messages, empty if within budget
+        """
+        problems = []
+        if max_queries is not None and self.count > max_queries:
+            problems.append(f"{self.count} statements, budget {max_queries}")
+        if not allow_repeats:
+            for sql, (n, distinct) in self.repeated().items():
+                kind = "N+1" if distinct > 1 else "repeated"
+                problems.append(f"{kind}: {n} x {sql[:120]}")
+        return problems
+
+    def check(self, max_queries=None, allow_repeats=False):
+        """
+        Report a budget violation
+
+        Raises QueryBudgetExceeded when raise_on_violation is set, otherwise
+        prints a warning.
+
+        Returns:
+            bool: True if within budget
+        """
+        problems = self.violations(max_queries, allow_repeats)
+        if not problems:
+            return True
+
+        message = f"Query budget exceeded by '{self.action}':\n" + "\n".join(
+            f"    {problem}" for problem in problems
+        ) + "\n" + self.format_statements()
+        if raise_on_violation:
+            raise QueryBudgetExceeded(message)
+        print(f"⚠ {message}")
+        return False
+
+    def format_statements(self):
+        """List the recorded statements with their callers"""
+        return "\n".join(
+            f"    {i}. {seconds * 1000:.1f} ms {caller}: {sql[:120]}"
+            for i, (sql, _shape, caller, seconds) in enumerate(self.statements, 1)
+        )
+
+    def _add(self, normalized, params, shape, caller, seconds):
+        """query_stats listener"""
+        with self._lock:
+            self.statements.append((normalized, shape, caller, seconds))
+            self._calls[(normalized, repr(params))] += 1
+
+
+def query_budget(max_queries, action=None, allow_repeats=False):
+    """
+    Declare the most statements a UI action may issue
+
+    The budget is checked only when QUERY_BUDGETS=1; otherwise the function
+    is returned unchanged.
+
+    Args:
+        max_queries (int): Most statements allowed
+        action (str, optional): Action name, defaults to the function's name
+        allow_repeats (bool): Accept statements issued more than once
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(func):
+        name = action or func.__qualname__
+        BUDGETS[name] = max_queries
+        if not DatabaseConfig.QUERY_BUDGETS:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with QueryRecorder(name) as recorder:
+                result = func(*args, **kwargs)
+            recorder.check(max_queries, allow_repeats)
+            return result
+        return wrapper
+    return decorator
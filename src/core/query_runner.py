@@ -0,0 +1,219 @@
+"""
+Background query execution on a Qt thread pool
+"""
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from ..config.database import DatabaseConfig
+
+
+class QueryTaskSignals(QObject):
+    """Signals emitted by a QueryTask (QRunnable cannot emit signals itself)"""
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    progress = pyqtSignal(object)  # Intermediate results, e.g. streamed batches
+    done = pyqtSignal()  # Always emitted last, even when cancelled
+
+
+class QueryTask(QRunnable):
+    """
+    Unit of database work executed on a worker thread
+
+    The work function receives its own pooled connection. Results are
+    delivered through `signals`, which are queued back to the GUI thread.
+    """
+
+    def __init__(self, db_manager, work):
+        """
+        Initialize query task
+
+        Args:
+            db_manager: DBManager providing pooled connections, or None to
+                run the work function without a connection
+            work (callable): Function taking a connection and returning a result
+        """
+        super().__init__()
+        self.setAutoDelete(False)
+
+        self.db_manager = db_manager
+        self.work = work
+        self.signals = QueryTaskSignals()
+        self._cancelled = False
+        self._connection = None
+
+    @property
+    def cancelled(self):
+        """Whether cancel() has been called"""
+        return self._cancelled
+
+    def cancel(self):
+        """
+        Cancel the task
+
+        A queued task will not run; a running query is interrupted on the
+        server. No signal is emitted after cancellation.
+        """
+        self._cancelled = True
+        conn = self._connection
+        if conn is not None:
+            try:
+                conn.cancel()
+            except Exception:
+                pass
+
+    def emit_progress(self, value):
+        """Send an intermediate result to the GUI thread (called by the work function)"""
+        if not self._cancelled:
+            self.signals.progress.emit(value)
+
+    def run(self):
+        """Execute the work function (called on a worker thread)"""
+        try:
+            if not self._cancelled:
+                self._execute()
+        finally:
+            self.signals.done.emit()
+
+    def _execute(self):
+        """Run the work function and emit its outcome"""
+        try:
+            if self.db_manager is None:
+                result = self.work(None)
+            else:
+                with self.db_manager.pooled_connection() as conn:
+                    self._connection = conn
+                    try:
+                        result = self.work(conn)
+                    finally:
+                        self._connection = None
+        except Exception as e:
+            if not self._cancelled:
+                self.signals.failed.emit(e)
+            return
+
+        if not self._cancelled:
+            self.signals.finished.emit(result)
+
+
+class QueryRunner:
+    """
+    Submits database work to a dedicated thread pool
+
+    Each task checks out its own connection from the DBManager pool, so
+    background queries never share a cursor with the GUI thread.
+    """
+
+    def __init__(self, db_manager, max_workers=None):
+        """
+        Initialize query runner
+
+        Args:
+            db_manager: DBManager providing pooled connections
+            max_workers (int, optional): Worker threads, defaults to
+                DatabaseConfig.QUERY_WORKERS
+        """
+        self.db_manager = db_manager
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max_workers or DatabaseConfig.QUERY_WORKERS)
+        self._tasks = set()
+
+    def submit(self, sql, params=None, on_result=None, on_error=None):
+        """
+        Run a SELECT in the background
+
+        Args:
+            sql (str): Query to execute
+            params (tuple, optional): Query parameters
+            on_result (callable, optional): Called on the GUI thread with the rows
+            on_error (callable, optional): Called on the GUI thread with the exception
+
+        Returns:
+            QueryTask: Task handle, can be cancelled
+        """
+        def work(conn):
+            with conn.cursor() as cur:
+                cur.execute(sql, params or ())
+                return cur.fetchall()
+
+        return self.submit_call(work, on_result, on_error)
+
+    def submit_call(self, work, on_result=None, on_error=None, use_connection=True):
+        """
+        Run an arbitrary function in the background
+
+        Args:
+            work (callable): Function taking a pooled connection (or None)
+            on_result (callable, optional): Called on the GUI thread with the result
+            on_error (callable, optional): Called on the GUI thread with the exception
+            use_connection (bool): Check out a pooled connection for the function
+
+        Returns:
+            QueryTask: Task handle, can be cancelled
+        """
+        task = QueryTask(self.db_manager if use_connection else None, work)
+        return self._start(task, on_result, on_error)
+
+    def submit_stream(self, sql, params=None, on_batch=None, on_result=None, on_error=None,
+                      batch_size=None):
+        """
+        Run a SELECT in the background and deliver its rows batch by batch
+
+        Rows are read with DBManager.stream(), so the first batch reaches the
+        GUI while later ones are still being fetched, and the worker holds
+        one batch at a time.
+
+        Args:
+            sql (str): Query to execute
+            params (tuple, optional): Query parameters
+            on_batch (callable, optional): Called on the GUI thread with each list of rows
+            on_result (callable, optional): Called on the GUI thread with the row count
+            on_error (callable, optional): Called on the GUI thread with the exception
+            batch_size (int, optional): Most rows per batch
+
+        Returns:
+            QueryTask: Task handle, can be cancelled
+        """
+        def work(conn):
+            count = 0
+            for batch in self.db_manager.stream(sql, params, batch_size, conn=conn):
+                if task.cancelled:
+                    break
+                task.emit_progress(batch)
+                count += len(batch)
+            return count
+
+        task = QueryTask(self.db_manager, work)
+        if on_batch:
+            task.signals.progress.connect(on_batch)
+        return self._start(task, on_result, on_error)
+
+    def _start(self, task, on_result, on_error):
+        """Connect a task's callbacks and queue it"""
+        if on_result:
+            task.signals.finished.connect(on_result)
+        if on_error:
+            task.signals.failed.connect(on_error)
+        # Keep a reference until the worker is done with the task
+        task.signals.done.connect(lambda: self._tasks.discard(task))
+
+        self._tasks.add(task)
+        self.thread_pool.start(task)
+        return task
+
+    def cancel_all(self):
+        """Cancel every queued or running task"""
+        for task in list(self._tasks):
+            task.cancel()
+            if self.thread_pool.tryTake(task):
+                self._tasks.discard(task)
+
+    def shutdown(self, timeout_ms=5000):
+        """
+        Cancel outstanding work and wait for worker threads to finish
+
+        Args:
+            timeout_ms (int): Maximum time to wait
+        """
+        self.cancel_all()
+        self.thread_pool.waitForDone(timeout_ms)
@@ -0,0 +1,409 @@
+"""
+Opt-in query instrumentation - per-statement timing, slow-query log and EXPLAIN capture
+
+Enabled with QUERY_STATS=1 (or QUERY_BUDGETS=1): every connection the pool opens then creates
+InstrumentedCursor cursors, so statements from the shared cursor, pooled
+cursors and QueryRunner tasks are all recorded. Nothing is wrapped when it
+is off.
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from psycopg2.extensions import cursor as pg_cursor
+
+from ..config.database import DatabaseConfig
+from ..config.settings import Settings
+
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ROWS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+_WRITE = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+# Modules that pass statements through rather than issue them
+_PLUMBING = {"db_manager.py", "connection_pool.py", "query_runner.py", "query_stats.py"}
+_SRC_DIR = os.path.join(Settings.BASE_DIR, "src") + os.sep
+
+
+def normalize_sql(sql):
+    """
+    Reduce a statement to its shape, so calls with different values group together
+
+    Literals and placeholders become ?, lists of them (...), and multi-row
+    VALUES one (...).
+
+    Args:
+        sql (str or bytes): Statement text
+
+    Returns:
+        str: Normalized statement
+    """
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _LIST.sub("(...)", sql)
+    sql = _ROWS.sub("(...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def param_shape(params):
+    """
+    Describe the parameters without their values
+
+    Args:
+        params: Query parameters (sequence, mapping or None)
+
+    Returns:
+        str: e.g. '(str, int)', '{staff_id: str}', or '' for no parameters
+    """
+    if not params:
+        return ""
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in params.items()) + "}"
+    if isinstance(params, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in params) + ")"
+    return type(params).__name__
+
+
+def caller():
+    """
+    Find the application code that issued the current statement
+
+    Returns:
+        str: 'module:Qualified.name' of the first frame in src/ outside the
+            database plumbing, or '?' if there is none
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_SRC_DIR) and os.path.basename(filename) not in _PLUMBING:
+            code = frame.f_code
+            module = os.path.splitext(os.path.basename(filename))[0]
+            return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+        frame = frame.f_back
+    return "?"
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class StatementStats:
+    """Running totals for one normalized statement"""
+
+    __slots__ = ('calls', 'total', 'rows', 'latencies', 'callers', 'shapes')
+
+    def __init__(self, samples):
+        self.calls = 0
+        self.total = 0.0
+        self.rows = 0
+        self.latencies = deque(maxlen=samples)  # Most recent latencies, seconds
+        self.callers = Counter()
+        self.shapes = Counter()
+
+
+class QueryStats:
+    """
+    Aggregates statement timings and writes slow statements to a rotating log
+
+    A statement slower than the threshold is logged with its parameters'
+    shape and caller. Read-only SELECTs also get an EXPLAIN (ANALYZE,
+    BUFFERS) plan, at most once per statement per SLOW_QUERY_EXPLAIN_INTERVAL;
+    statements that write anything, data-modifying CTEs included, are never
+    explained, as ANALYZE would execute them again.
+
+    Only QUERY_STATS=1 logs slow statements. QUERY_BUDGETS=1 alone just
+    counts them for QueryRecorder and runs nothing extra.
+    """
+
+    def __init__(self, slow_ms=None, log_path=None, samples=None, log_slow=None):
+        """
+        Initialize query statistics
+
+        Args:
+            slow_ms (float, optional): Slow statement threshold in milliseconds
+            log_path (str, optional): Slow-query log file
+            samples (int, optional): Latencies kept per statement for percentiles
+            log_slow (bool, optional): Log and explain slow statements,
+                defaults to DatabaseConfig.QUERY_STATS
+        """
+        self.slow_ms = slow_ms or DatabaseConfig.SLOW_QUERY_MS
+        self.log_path = log_path or Settings.SLOW_QUERY_LOG
+        self.samples = samples or DatabaseConfig.QUERY_STATS_SAMPLES
+        self.log_slow = DatabaseConfig.QUERY_STATS if log_slow is None else log_slow
+
+        self._lock = threading.Lock()
+        self._statements = {}  # normalized sql -> StatementStats
+        self._explained = {}   # normalized sql -> monotonic time of the last EXPLAIN
+        self._started = datetime.now()
+        self._logger = None
+        self._listeners = []  # Called with every statement (see QueryRecorder)
+
+    def record(self, sql, params, seconds, rows, cursor=None, many=False):
+        """
+        Record one execution
+
+        Args:
+            sql (str or bytes): Statement as executed
+            params: Its parameters (the parameter list for executemany)
+            seconds (float): Latency
+            rows (int): Rows returned or affected (-1 if unknown)
+            cursor: Cursor that ran it successfully, used to EXPLAIN slow
+                SELECTs; None when it failed
+            many (bool): Whether it was an executemany()
+        """
+        normalized = normalize_sql(sql)
+        if many:
+            params = list(params)
+            shape = f"{len(params)} x {param_shape(params[0]) if params else '()'}"
+        else:
+            shape = param_shape(params)
+        where = caller()
+
+        with self._lock:
+            stats = self._statements.get(normalized)
+            if stats is None:
+                stats = self._statements[normalized] = StatementStats(self.samples)
+            stats.calls += 1
+            stats.total += seconds
+            stats.rows += max(rows, 0)
+            stats.latencies.append(seconds)
+            stats.callers[where] += 1
+            stats.shapes[shape] += 1
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener(normalized, params, shape, where, seconds)
+
+        if self.log_slow and seconds * 1000 >= self.slow_ms:
+            plan = None
+            if cursor is not None and not many and self._should_explain(normalized):
+                plan = self._explain(cursor, sql, params)
+            self._log_slow(normalized, shape, where, seconds, rows, plan)
+
+    def report(self, limit=None):
+        """
+        Summarize the statements, most total time first
+
+        Args:
+            limit (int, optional): Number of statements returned
+
+        Returns:
+            list: Dicts with sql, calls, total_ms, p50/p95/p99/max_ms, avg_rows,
+                callers and shapes
+        """
+        with self._lock:
+            items = [(sql, s.calls, s.total, s.rows, sorted(s.latencies),
+                      s.callers.most_common(3), s.shapes.most_common(3))
+                     for sql, s in self._statements.items()]
+
+        rows = []
+        for sql, calls, total, row_count, latencies, callers, shapes in items:
+            rows.append({
+                'sql': sql,
+                'calls': calls,
+                'total_ms': total * 1000,
+                'p50_ms': percentile(latencies, 0.50) * 1000,
+                'p95_ms': percentile(latencies, 0.95) * 1000,
+                'p99_ms': percentile(latencies, 0.99) * 1000,
+                'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+                'avg_rows': row_count / calls,
+                'callers': callers,
+                'shapes': shapes,
+            })
+        rows.sort(key=lambda row: row['total_ms'], reverse=True)
+        return rows[:limit] if limit else rows
+
+    def format_report(self, limit=None):
+        """
+        Render report() as text
+
+        Returns:
+            str: Report with one block per statement
+        """
+        rows = self.report(limit)
+        lines = [
+            f"Query statistics since {self._started:%Y-%m-%d %H:%M:%S} "
+            f"({len(rows)} statements, slow >= {self.slow_ms} ms)",
+            "",
+        ]
+        for row in rows:
+            lines.append(
+                f"{row['calls']:>7} calls {row['total_ms']:>10.1f} ms total  "
+                f"p50 {row['p50_ms']:.1f}  p95 {row['p95_ms']:.1f}  p99 {row['p99_ms']:.1f}  "
+                f"max {row['max_ms']:.1f} ms  {row['avg_rows']:.1f} rows/call"
+            )
+            lines.append(f"    {row['sql']}")
+            lines.append("    callers: " + ", ".join(f"{c} ({n})" for c, n in row['callers']))
+            shapes = ", ".join(f"{s or '()'} ({n})" for s, n in row['shapes'])
+            lines.append(f"    params: {shapes}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def dump(self, path=None):
+        """
+        Write the text report to a file
+
+        Args:
+            path (str, optional): Output file, defaults to exports/query_stats_<time>.txt
+
+        Returns:
+            str: Path written
+        """
+        if path is None:
+            Settings.ensure_exports_dir()
+            path = os.path.join(
+                Settings.EXPORTS_DIR, f"query_stats_{datetime.now():%Y%m%d_%H%M%S}.txt"
+            )
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.format_report())
+        return path
+
+    def add_listener(self, listener):
+        """
+        Receive every statement recorded from now on
+
+        Args:
+            listener (callable): Called as listener(normalized, params, shape,
+                caller, seconds) on the thread that ran the statement
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stop sending statements to a listener"""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def reset(self):
+        """Forget all recorded statements"""
+        with self._lock:
+            self._statements.clear()
+            self._explained.clear()
+            self._started = datetime.now()
+
+    def _should_explain(self, normalized):
+        """Whether a slow statement is a read-only SELECT not explained recently"""
+        head = normalized.lstrip("(").split(" ", 1)[0].upper()
+        if head not in ("SELECT", "WITH") or " FOR UPDATE" in normalized.upper():
+            return False
+        if _WRITE.search(normalized):
+            return False  # Data-modifying CTE, e.g. WITH ... INSERT ... ) SELECT
+
+        now = time.monotonic()
+        with self._lock:
+            last = self._explained.get(normalized)
+            if last is not None and now - last < DatabaseConfig.SLOW_QUERY_EXPLAIN_INTERVAL:
+                return False
+            self._explained[normalized] = now
+        return True
+
+    @staticmethod
+    def _explain(cursor, sql, params):
+        """
+        Run EXPLAIN (ANALYZE, BUFFERS) on the statement's connection
+
+        ANALYZE executes the statement, so it always runs in a transaction
+        that is rolled back: a savepoint inside the caller's transaction, or
+        its own transaction on an autocommit connection. Nothing it does is
+        kept, and a failure does not abort the caller's work.
+        """
+        conn = cursor.connection
+        if conn.autocommit:
+            begin, rollback = "BEGIN", "ROLLBACK"
+        else:
+            begin = "SAVEPOINT query_stats_explain"
+            rollback = ("ROLLBACK TO SAVEPOINT query_stats_explain; "
+                        "RELEASE SAVEPOINT query_stats_explain")
+        # A plain cursor, so the EXPLAIN itself is not recorded
+        with pg_cursor(conn) as cur:
+            try:
+                cur.execute(begin)
+            except Exception as e:
+                return f"(EXPLAIN skipped: {e})"
+            try:
+                cur.execute(b"EXPLAIN (ANALYZE, BUFFERS) " + cursor.mogrify(sql, params))
+                return "\n".join(row[0] for row in cur.fetchall())
+            except Exception as e:
+                return f"(EXPLAIN failed: {e})"
+            finally:
+                try:
+                    cur.execute(rollback)
+                except Exception:
+                    pass
+
+    def _log_slow(self, normalized, shape, where, seconds, rows, plan):
+        """Append a slow statement to the rotating log"""
+        if self._logger is None:
+            self._logger = self._open_log()
+        message = (f"{seconds * 1000:.1f} ms, {rows} rows, {where}, params {shape or '()'}\n"
+                   f"    {normalized}")
+        if plan:
+            message += "\n" + "\n".join("    | " + line for line in plan.splitlines())
+        self._logger.warning(message)
+
+    def _open_log(self):
+        """Create the slow-query logger writing to a rotating file"""
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        logger = logging.getLogger("medimanager.slow_queries")
+        logger.propagate = False
+        if not logger.handlers:
+            handler = RotatingFileHandler(
+                self.log_path,
+                maxBytes=DatabaseConfig.SLOW_QUERY_LOG_BYTES,
+                backupCount=DatabaseConfig.SLOW_QUERY_LOG_BACKUPS,
+                encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+        return logger
+
+
+# Process-wide statistics, shared by every instrumented cursor
+query_stats = QueryStats()
+
+
+class InstrumentedCursor(pg_cursor):
+    """psycopg2 cursor that reports each statement to query_stats"""
+
+    def execute(self, query, vars=None):
+        if hasattr(query, 'as_string'):
+            query = query.as_string(self)  # psycopg2.sql.Composed
+        started = time.perf_counter()
+        try:
+            result = super().execute(query, vars)
+        except Exception:
+            query_stats.record(query, vars, time.perf_counter() - started, -1)
+            raise
+        query_stats.record(query, vars, time.perf_counter() - started, self.rowcount,
+                           cursor=self)
+        return result
+
+    def executemany(self, query, vars_list):
+        if hasattr(query, 'as_string'):
+            query = query.as_string(self)
+        vars_list = list(vars_list)
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            query_stats.record(query, vars_list, time.perf_counter() - started, self.rowcount,
+                               many=True)
@@ -0,0 +1,152 @@
+"""
+Cache of small lookup tables shared by the dialogs
+"""
+
+import threading
+import time
+
+from ..config.settings import Settings
+
+
+# Lookup data the dialogs fill their combo boxes from
+REFERENCE_QUERIES = {
+    'suppliers': "SELECT supplier_id, supplier_name FROM supplier ORDER BY supplier_name",
+    'payment_methods': "SELECT payment_method_id, payment_name FROM payment_method "
+                       "ORDER BY payment_name",
+    'categories': "SELECT category_id, category_name FROM category ORDER BY category_name",
+    'medicine_names': "SELECT DISTINCT medicine_name FROM medicine "
+                      "WHERE medicine_name IS NOT NULL ORDER BY medicine_name",
+}
+
+
+class ReferenceCache:
+    """
+    Lookup rows kept in memory for a limited time
+
+    Each dataset is read once and served from memory until its TTL expires
+    or it is invalidated by a dialog that changed the underlying table, so
+    opening a dialog does not query the database for its combo boxes.
+    """
+
+    def __init__(self, db_manager, ttl=None, queries=None):
+        """
+        Initialize reference cache
+
+        Args:
+            db_manager: DBManager providing pooled connections
+            ttl (float, optional): Seconds a dataset stays fresh,
+                defaults to Settings.REFERENCE_CACHE_TTL
+            queries (dict, optional): Dataset name -> SQL, defaults to REFERENCE_QUERIES
+        """
+        self.db_manager = db_manager
+        self.ttl = ttl or Settings.REFERENCE_CACHE_TTL
+        self.queries = queries or REFERENCE_QUERIES
+
+        self._lock = threading.Lock()
+        self._data = {}  # name -> (rows, loaded_at)
+        self._hits = dict.fromkeys(self.queries, 0)
+        self._misses = dict.fromkeys(self.queries, 0)
+
+    def get(self, name):
+        """
+        Get the rows of a dataset, reading them only if missing or expired
+
+        Args:
+            name (str): Dataset name, a key of REFERENCE_QUERIES
+
+        Returns:
+            list: Row tuples
+        """
+        with self._lock:
+            cached = self._data.get(name)
+            if cached is not None and time.monotonic() - cached[1] < self.ttl:
+                self._hits[name] += 1
+                return cached[0]
+            self._misses[name] += 1
+
+        return self._load(name)
+
+    def refresh(self, conn=None):
+        """
+        Load every dataset that is missing or expired
+
+        Args:
+            conn: Optional psycopg2 connection (e.g. from a QueryRunner task)
+
+        Returns:
+            int: Number of datasets loaded
+        """
+        now = time.monotonic()
+        with self._lock:
+            stale = [name for name in self.queries
+                     if name not in self._data or now - self._data[name][1] >= self.ttl]
+        for name in stale:
+            self._load(name, conn)
+        return len(stale)
+
+    def refresh_async(self, query_runner):
+        """
+        Preload the datasets on the query runner's thread pool
+
+        Args:
+            query_runner: QueryRunner to submit the work to
+
+        Returns:
+            QueryTask: Task handle
+        """
+        return query_runner.submit_call(
+            self.refresh,
+            on_error=lambda e: print(f"❌ Reference data preload failed: {e}")
+        )
+
+    def invalidate(self, *names):
+        """
+        Drop datasets so the next get() reads them again
+
+        Args:
+            *names: Dataset names, none to drop everything
+        """
+        with self._lock:
+            for name in names or list(self._data):
+                self._data.pop(name, None)
+
+    def stats(self):
+        """
+        Get hit/miss counts
+
+        Returns:
+            dict: Totals and per-dataset hits, misses and age in seconds
+        """
+        now = time.monotonic()
+        with self._lock:
+            datasets = {
+                name: {
+                    'hits': self._hits[name],
+                    'misses': self._misses[name],
+                    'age': round(now - self._data[name][1], 1) if name in self._data else None,
+                }
+                for name in self.queries
+            }
+        hits = sum(d['hits'] for d in datasets.values())
+        misses = sum(d['misses'] for d in datasets.values())
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'datasets': datasets,
+        }
+
+    def _load(self, name, conn=None):
+        """Read a dataset and store it with the current time"""
+        if conn is None:
+            with self.db_manager.pooled_cursor() as cur:
+                cur.execute(self.queries[name])
+                rows = cur.fetchall()
+        else:
+            with conn.cursor() as cur:
+                cur.execute(self.queries[name])
+                rows = cur.fetchall()
+
+        with self._lock:
+            self._data[name] = (rows, time.monotonic())
+        return rows
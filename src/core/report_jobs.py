@@ -0,0 +1,220 @@
+"""
+Report jobs - generates PDF reports in worker processes
+"""
+
+import itertools
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from ..config.settings import Settings
+
+
+class ReportJob:
+    """A report queued or running in the report process pool"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, job_id, report, filepath, date=None):
+        """
+        Initialize job
+
+        Args:
+            job_id (int): Identifier, unique within the queue
+            report (Report): What the job draws
+            filepath (str): Output file path
+            date (str, optional): Day of an invoice report
+        """
+        self.id = job_id
+        self.report = report
+        self.filepath = filepath
+        self.date = date
+        self.state = self.QUEUED
+        self.rows = 0  # Rows drawn so far
+        self.error = None
+        self.future = None
+        self.cancel_event = None
+
+    @property
+    def active(self):
+        """Whether the job is still queued or running"""
+        return self.state in (self.QUEUED, self.RUNNING)
+
+
+class ReportJobQueue(QObject):
+    """
+    Runs report jobs in a pool of worker processes
+
+    Drawing a PDF with reportlab is CPU-bound and holds the GIL, so a report
+    on a thread would still stall the GUI. Each job runs in a worker process
+    with its own read-only connection (see run_report_job); up to
+    REPORT_WORKERS jobs run at once and the rest wait in the pool's queue.
+    Workers are spawned, never forked from the Qt process, and the pool
+    starts with the first job.
+
+    Signals are delivered on the GUI thread:
+        progress(job): the job started or drew more rows
+        finished(job): the job is done, failed or cancelled
+    """
+
+    progress = pyqtSignal(object)
+    finished = pyqtSignal(object)
+    _completed = pyqtSignal(object, object)  # (job, future), from the executor's thread
+
+    POLL_INTERVAL_MS = 200
+
+    def __init__(self, context, workers=None, parent=None):
+        """
+        Initialize queue
+
+        Args:
+            context: Application context, used to log finished exports
+            workers (int, optional): Worker processes, defaults to
+                Settings.REPORT_WORKERS
+            parent (QObject, optional): Qt parent
+        """
+        super().__init__(parent)
+        self.context = context
+        self.workers = workers or Settings.REPORT_WORKERS
+        self._jobs = {}  # Job id -> active job
+        self._ids = itertools.count(1)
+        self._executor = None
+        self._manager = None
+        self._progress = None
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self._drain_progress)
+        self._completed.connect(self._on_completed)
+
+    @property
+    def jobs(self):
+        """Jobs still queued or running, oldest first"""
+        return list(self._jobs.values())
+
+    def submit(self, kind, date=None, filepath=None):
+        """
+        Queue a report and return at once
+
+        Args:
+            kind (str): Report kind ('stock', 'invoice' or 'expiry')
+            date (str, optional): Day of an invoice report, YYYY-MM-DD
+            filepath (str, optional): Output file path, defaults to a name
+                in the exports folder that no other job or file uses
+
+        Returns:
+            ReportJob: The queued job
+
+        Raises:
+            ValueError: filepath is being written by another active job
+        """
+        from ..services.report_service import build_report, run_report_job
+
+        report = build_report(kind, date)
+        # Jobs of the same kind would otherwise write, or on cancel delete,
+        # each other's file
+        taken = {os.path.abspath(job.filepath) for job in self._jobs.values()}
+        if filepath is None:
+            filepath = report.default_path(taken)
+        elif os.path.abspath(filepath) in taken:
+            raise ValueError(f"{filepath} is already being written by another report")
+        job = ReportJob(next(self._ids), report, filepath, date)
+
+        self._start_pool()
+        job.cancel_event = self._manager.Event()
+        job.future = self._executor.submit(
+            run_report_job, kind, date, job.filepath, self._progress, job.cancel_event, job.id
+        )
+        self._jobs[job.id] = job
+        job.future.add_done_callback(lambda future: self._completed.emit(job, future))
+
+        self._poll_timer.start()
+        return job
+
+    def cancel(self, job):
+        """
+        Cancel a job
+
+        A queued job is dropped; a running one stops after its current page
+        and writes no file. finished is emitted either way.
+        """
+        if not job.active:
+            return
+        if not job.future.cancel():
+            job.cancel_event.set()
+
+    def shutdown(self):
+        """Cancel every job and stop the worker processes"""
+        for job in self.jobs:
+            self.cancel(job)
+        self._poll_timer.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+            self._progress = None
+
+    def _start_pool(self):
+        """Start the worker pool and the manager sharing progress and cancel flags"""
+        if self._executor is not None:
+            return
+
+        spawn = multiprocessing.get_context('spawn')
+        if self._manager is None:
+            self._manager = spawn.Manager()
+            self._progress = self._manager.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=spawn)
+
+    def _drain_progress(self):
+        """Apply progress messages sent by the workers"""
+        if self._progress is None:
+            return
+        while True:
+            try:
+                job_id, rows = self._progress.get_nowait()
+            except (queue.Empty, EOFError, OSError):
+                return
+            job = self._jobs.get(job_id)
+            if job is None or not job.active:
+                continue
+            job.state = ReportJob.RUNNING
+            job.rows = rows
+            self.progress.emit(job)
+
+    def _on_completed(self, job, future):
+        """Record a job's outcome and log finished exports"""
+        from ..services.report_service import ReportCancelled
+
+        self._drain_progress()
+        self._jobs.pop(job.id, None)
+
+        if future.cancelled():
+            job.state = ReportJob.CANCELLED
+        else:
+            error = future.exception()
+            if error is None:
+                job.state = ReportJob.DONE
+                job.rows = future.result()
+                self.context.log_action(job.report.log_entry(job.filepath))
+            elif isinstance(error, ReportCancelled):
+                job.state = ReportJob.CANCELLED
+            else:
+                job.state = ReportJob.FAILED
+                job.error = error
+                if isinstance(error, BrokenProcessPool):
+                    # A worker died; the next job starts a new pool
+                    self._executor = None
+
+        if not self._jobs:
+            self._poll_timer.stop()
+        self.finished.emit(job)
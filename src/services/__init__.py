@@ -2,6 +2,12 @@
 Business logic services
 """
 
-from .report_service import ReportService
+from .report_service import ReportService, ReportCancelled
+from .table_pdf_renderer import TablePdfRenderer
+from .invoice_service import InvoiceService, InsufficientStockError
+from .stock_service import StockService
+from .search_service import SearchService
+from .activity_log_service import ActivityLogService
 
-__all__ = ['ReportService']
+__all__ = ['ReportService', 'ReportCancelled', 'TablePdfRenderer', 'InvoiceService', 'InsufficientStockError', 'StockService', 'SearchService',
+           'ActivityLogService']
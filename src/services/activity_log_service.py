@@ -0,0 +1,139 @@
+"""
+Activity log service - keyset-paginated audit trail queries
+"""
+
+from ..config.settings import Settings
+from .search_service import escape_like
+
+
+LOG_COLUMNS = "log_id, staff_id, action, log_time"
+
+
+def _filter_clauses(staff_id=None, action=None, since=None, until=None):
+    """
+    Build WHERE clauses for the log filters
+
+    Args:
+        staff_id (str, optional): Exact staff ID
+        action (str, optional): Text the action must contain (case-insensitive)
+        since (datetime, optional): Earliest log_time, inclusive
+        until (datetime, optional): Latest log_time, exclusive
+
+    Returns:
+        tuple: (clauses, params)
+    """
+    clauses, params = [], []
+    if staff_id:
+        clauses.append("staff_id = %s")
+        params.append(staff_id)
+    if action:
+        clauses.append("action ILIKE %s")
+        params.append(f"%{escape_like(action)}%")
+    if since is not None:
+        clauses.append("log_time >= %s")
+        params.append(since)
+    if until is not None:
+        clauses.append("log_time < %s")
+        params.append(until)
+    return clauses, params
+
+
+class ActivityLogService:
+    """
+    Service for browsing the activity log
+
+    Pages are read newest first with keyset pagination on (log_time, log_id):
+    each page starts below the last row of the previous one, so reading a
+    page costs the same at the top of the log as a million rows down.
+    """
+
+    def __init__(self, context):
+        """
+        Initialize activity log service
+
+        Args:
+            context: Application context with database connection
+        """
+        self.context = context
+        self.db = context.db_manager
+
+    def page(self, before=None, staff_id=None, action=None, since=None, until=None,
+             limit=None, conn=None):
+        """
+        Get one page of log entries, newest first
+
+        Args:
+            before (tuple, optional): (log_time, log_id) of the last row already
+                shown; None for the first page
+            staff_id (str, optional): Only this staff member's actions
+            action (str, optional): Text the action must contain
+            since (datetime, optional): Earliest log_time, inclusive
+            until (datetime, optional): Latest log_time, exclusive
+            limit (int, optional): Page size, defaults to Settings.LOG_PAGE_SIZE
+            conn: Optional psycopg2 connection (e.g. from a QueryRunner task)
+
+        Returns:
+            tuple: (rows, has_more) with rows of (log_id, staff_id, action, log_time)
+        """
+        limit = limit or Settings.LOG_PAGE_SIZE
+        clauses, params = _filter_clauses(staff_id, action, since, until)
+        if before is not None:
+            clauses.append("(log_time, log_id) < (%s, %s)")
+            params.extend(before)
+
+        sql = f"""
+            SELECT {LOG_COLUMNS}
+            FROM activity_log
+            {"WHERE " + " AND ".join(clauses) if clauses else ""}
+            ORDER BY log_time DESC, log_id DESC
+            LIMIT %s
+        """
+        rows = self._fetch(sql, params + [limit + 1], conn)
+        return rows[:limit], len(rows) > limit
+
+    def newer_than(self, log_id, staff_id=None, action=None, since=None, until=None,
+                   limit=None, conn=None):
+        """
+        Get entries written after a given entry, for live tailing
+
+        Polling by primary key only reads the new rows, however large the
+        table is.
+
+        Args:
+            log_id (int): Highest log_id already shown (0 for none)
+            staff_id (str, optional): Only this staff member's actions
+            action (str, optional): Text the action must contain
+            since (datetime, optional): Earliest log_time, inclusive
+            until (datetime, optional): Latest log_time, exclusive
+            limit (int, optional): Maximum rows, defaults to Settings.LOG_PAGE_SIZE
+            conn: Optional psycopg2 connection
+
+        Returns:
+            list: Rows of (log_id, staff_id, action, log_time), newest first
+        """
+        limit = limit or Settings.LOG_PAGE_SIZE
+        clauses, params = _filter_clauses(staff_id, action, since, until)
+        clauses.append("log_id > %s")
+        params.append(log_id)
+
+        sql = f"""
+            SELECT {LOG_COLUMNS}
+            FROM activity_log
+            WHERE {" AND ".join(clauses)}
+            ORDER BY log_id
+            LIMIT %s
+        """
+        rows = self._fetch(sql, params + [limit], conn)
+        rows.reverse()
+        return rows
+
+    def _fetch(self, sql, params, conn):
+        """Run a query on the given or a pooled connection"""
+        if conn is None:
+            with self.db.pooled_cursor() as cur:
+                cur.execute(sql, params)
+                return cur.fetchall()
+
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            return cur.fetchall()
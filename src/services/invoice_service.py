@@ -0,0 +1,149 @@
+"""
+Invoice service - atomic checkout of a sales invoice
+"""
+
+from ..core.query_recorder import query_budget
+
+
+# One statement does the whole checkout, so it runs in a single round trip
+# and is atomic on its own:
+# - `available` locks every medicine row that still has enough stock
+# - if any line is short, nothing is decremented or inserted
+# - otherwise stock is decremented set-based and the invoice plus all its
+#   detail rows are inserted
+COMMIT_INVOICE_SQL = """
+    WITH lines (medicine_id, quantity, sale_price) AS (
+        SELECT * FROM unnest(%(medicine_ids)s::int[], %(quantities)s::int[],
+                             %(prices)s::numeric[])
+    ),
+    available AS (
+        SELECT m.medicine_id
+        FROM medicine m
+        JOIN lines l ON l.medicine_id = m.medicine_id
+        WHERE m.stock_quantity >= l.quantity
+        FOR UPDATE OF m
+    ),
+    short AS (
+        SELECT medicine_id FROM lines
+        EXCEPT
+        SELECT medicine_id FROM available
+    ),
+    decremented AS (
+        UPDATE medicine m
+        SET stock_quantity = m.stock_quantity - l.quantity
+        FROM lines l
+        WHERE m.medicine_id = l.medicine_id
+          AND NOT EXISTS (SELECT 1 FROM short)
+        RETURNING m.medicine_id
+    ),
+    new_invoice AS (
+        INSERT INTO invoice (invoice_date, customer_id, staff_id, total_amount,
+                             payment_method_id, payment_status)
+        SELECT %(invoice_date)s, %(customer_id)s, %(staff_id)s,
+               (SELECT SUM(quantity * sale_price) FROM lines),
+               %(payment_method_id)s, %(payment_status)s
+        WHERE NOT EXISTS (SELECT 1 FROM short)
+        RETURNING invoice_id, total_amount
+    ),
+    details AS (
+        INSERT INTO invoice_detail (invoice_id, medicine_id, quantity,
+                                    sale_price, total_price)
+        SELECT i.invoice_id, l.medicine_id, l.quantity, l.sale_price,
+               l.quantity * l.sale_price
+        FROM new_invoice i
+        CROSS JOIN lines l
+        RETURNING invoice_detail_id
+    )
+    SELECT (SELECT invoice_id FROM new_invoice),
+           (SELECT total_amount FROM new_invoice),
+           ARRAY(SELECT medicine_id FROM short),
+           (SELECT COUNT(*) FROM decremented),
+           (SELECT COUNT(*) FROM details)
+"""
+
+
+class InsufficientStockError(Exception):
+    """Raised when an invoice would sell more than is in stock"""
+
+    def __init__(self, medicine_ids):
+        """
+        Args:
+            medicine_ids (list): IDs of medicines without enough stock
+        """
+        super().__init__(f"Insufficient stock for medicine IDs: {medicine_ids}")
+        self.medicine_ids = medicine_ids
+
+
+class InvoiceService:
+    """Service for committing sales invoices"""
+
+    def __init__(self, context):
+        """
+        Initialize invoice service
+
+        Args:
+            context: Application context with database connection
+        """
+        self.context = context
+        self.db = context.db_manager
+
+    @query_budget(1, "commit invoice")
+    def commit_invoice(self, customer_id, staff_id, payment_method_id,
+                       invoice_date, lines, payment_status="Đã thanh toán"):
+        """
+        Create an invoice, its details and decrement stock atomically
+
+        Args:
+            customer_id (int): Customer ID
+            staff_id (str): Staff creating the invoice
+            payment_method_id (int): Payment method ID
+            invoice_date (str): Date in YYYY-MM-DD format
+            lines (list): (medicine_id, quantity, sale_price) tuples
+            payment_status (str): Initial payment status
+
+        Returns:
+            tuple: (invoice_id, total_amount)
+
+        Raises:
+            ValueError: If there are no lines or a quantity is not positive
+            InsufficientStockError: If any medicine lacks stock; nothing is written
+        """
+        merged = self._merge_lines(lines)
+
+        params = {
+            'medicine_ids': [line[0] for line in merged],
+            'quantities': [line[1] for line in merged],
+            'prices': [line[2] for line in merged],
+            'invoice_date': invoice_date,
+            'customer_id': customer_id,
+            'staff_id': staff_id,
+            'payment_method_id': payment_method_id,
+            'payment_status': payment_status,
+        }
+
+        with self.db.pooled_connection(autocommit=True) as conn:
+            with conn.cursor() as cur:
+                cur.execute(COMMIT_INVOICE_SQL, params)
+                invoice_id, total, short, _, _ = cur.fetchone()
+
+        if invoice_id is None:
+            raise InsufficientStockError(short)
+
+        return invoice_id, total
+
+    @staticmethod
+    def _merge_lines(lines):
+        """Combine lines for the same medicine and validate quantities"""
+        if not lines:
+            raise ValueError("Invoice has no lines")
+
+        merged = {}
+        for medicine_id, quantity, sale_price in lines:
+            if quantity <= 0:
+                raise ValueError(f"Invalid quantity {quantity} for medicine {medicine_id}")
+            if medicine_id in merged:
+                merged[medicine_id][1] += quantity
+            else:
+                merged[medicine_id] = [medicine_id, quantity, sale_price]
+
+        return list(merged.values())
@@ -3,188 +3,304 @@ Report generation service for PDF exports
 """
 
 import os
+import time
 from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 
+from ..config.database import DatabaseConfig
 from ..config.settings import Settings
+from ..core.date_ranges import between, day_bounds, days_from_today
+from .table_pdf_renderer import TablePdfRenderer
 
 
-class ReportService:
-    """Service for generating various reports"""
+# Report kinds accepted by build_report()
+REPORT_KINDS = ('stock', 'invoice', 'expiry')
 
-    def __init__(self, context):
+# Seconds between progress messages from a report worker
+PROGRESS_INTERVAL = 0.2
+
+
+class ReportCancelled(Exception):
+    """A report job was cancelled before its PDF was saved"""
+
+
+class Report:
+    """A report's query, table layout and output file name"""
+
+    def __init__(self, kind, title, headers, col_x, sql, params=(), filename=None,
+                 log_message=None):
         """
-        Initialize report service
+        Initialize report
 
         Args:
-            context: Application context with database connection
+            kind (str): Report kind, one of REPORT_KINDS
+            title (str): Title drawn on the first page
+            headers (list): Column headers
+            col_x (list): Left edge of each column
+            sql (str): Query returning the rows, in column order
+            params (tuple): Query parameters
+            filename (str, optional): Default file name in the exports folder
+            log_message (str, optional): Activity log entry, "{file}" is
+                replaced with the file name
         """
-        self.context = context
-        self.db = context.db_manager
+        self.kind = kind
+        self.title = title
+        self.headers = headers
+        self.col_x = col_x
+        self.sql = sql
+        self.params = params
+        self.filename = filename or f"report_{kind}.pdf"
+        self.log_message = log_message or f"Exported {kind} report"
+
+    def default_path(self, taken=()):
+        """
+        Path of the report in the exports folder, created if missing
 
-        # Register Vietnamese font
-        font_path = os.path.join(Settings.FONTS_DIR, "Arial.ttf")
-        if os.path.exists(font_path):
-            pdfmetrics.registerFont(TTFont('ArialUnicode', font_path))
+        Args:
+            taken (collection, optional): Paths that must not be used, e.g.
+                those of reports still being written; a numbered name
+                (report_x_2.pdf) is chosen instead of one of these or of a
+                file that already exists
 
-    def export_stock_report(self, filepath=None):
+        Returns:
+            str: Output file path
         """
-        Export stock inventory report to PDF
+        Settings.ensure_exports_dir()
+        path = os.path.join(Settings.EXPORTS_DIR, self.filename)
+        if not taken:
+            return path
+
+        stem, ext = os.path.splitext(path)
+        number = 1
+        while path in taken or os.path.exists(path):
+            number += 1
+            path = f"{stem}_{number}{ext}"
+        return path
+
+    def log_entry(self, filepath):
+        """Activity log entry for the report written to filepath"""
+        return self.log_message.replace("{file}", os.path.basename(filepath))
+
+    def render(self, filepath, rows, on_page=None):
+        """
+        Draw the report to a PDF file
 
         Args:
-            filepath (str, optional): Output file path
+            filepath (str): Output file path
+            rows (iterable): Rows to draw, consumed as they arrive
+            on_page (callable, optional): Called with the rows drawn so far
+                after each page
 
         Returns:
-            str: Path to generated PDF file
+            int: Number of rows drawn
         """
-        if filepath is None:
-            filename = f"report_stock_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            Settings.ensure_exports_dir()
-            filepath = os.path.join(Settings.EXPORTS_DIR, filename)
-
-        sql = """
+        renderer = TablePdfRenderer(self.title, self.headers, self.col_x)
+        return renderer.render(filepath, rows, on_page)
+
+
+def build_report(kind, date=None):
+    """
+    Describe a report
+
+    Args:
+        kind (str): 'stock', 'invoice' or 'expiry'
+        date (str, optional): Day of an invoice report, YYYY-MM-DD; today by default
+
+    Returns:
+        Report: The report's query and layout
+    """
+    if kind == 'stock':
+        return Report(
+            kind, "BÁO CÁO TỒN KHO",
+            ["Tên thuốc", "Đơn vị", "Tồn kho", "Số lô", "Giá bán"],
+            [50, 150, 250, 350, 450],
+            """
             SELECT medicine_name, unit, stock_quantity, batch_number, sale_price
             FROM medicine
             ORDER BY medicine_name
-        """
-        self.db.execute(sql)
-        results = self.db.fetchall()
-
-        c = canvas.Canvas(filepath, pagesize=A4)
-        c.setFont("ArialUnicode", 14)
-        c.drawString(50, 800, "BÁO CÁO TỒN KHO")
+            """,
+            filename=f"report_stock_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+            log_message="Exported stock report: {file}",
+        )
+
+    if kind == 'invoice':
+        date = date or datetime.now().strftime('%Y-%m-%d')
+        return Report(
+            kind, f"BÁO CÁO HÓA ĐƠN NGÀY {date}",
+            ["ID", "Thời gian", "KH", "Tổng tiền", "NV", "Trạng thái"],
+            [50, 130, 210, 290, 370, 450],
+            f"""
+            SELECT invoice_id, invoice_date, customer_id, total_amount, staff_id, payment_status
+            FROM invoice
+            WHERE {between('invoice_date')}
+            ORDER BY invoice_date DESC
+            """,
+            day_bounds(date),
+            filename=f"report_invoice_{date}.pdf",
+            log_message=f"Exported invoice report for date: {date}",
+        )
+
+    if kind == 'expiry':
+        return Report(
+            kind, "BÁO CÁO THUỐC SẮP HẾT HẠN",
+            ["Tên thuốc", "SL", "ĐV", "Số lô", "Hạn dùng", "Còn lại (ngày)"],
+            [50, 150, 200, 270, 370, 500],
+            f"""
+            SELECT medicine_name, stock_quantity, unit, batch_number, expiration_date,
+                   (expiration_date::date - CURRENT_DATE) AS days_left
+            FROM medicine
+            WHERE {days_from_today('expiration_date', 0, Settings.EXPIRY_WARNING_DAYS)}
+            ORDER BY expiration_date ASC
+            """,
+            filename=f"report_expiring_{datetime.now().strftime('%Y%m%d')}.pdf",
+            log_message="Exported expiry warning report",
+        )
+
+    raise ValueError(f"Unknown report: {kind}")
+
+
+def run_report_job(kind, date, filepath, progress=None, cancel_event=None, job_id=None):
+    """
+    Generate a report in a worker process (ReportJobQueue entry point)
+
+    The worker has no pool or AppContext; it opens its own connection with
+    read-only transactions and streams the rows from a server-side cursor.
+    Nothing is logged here, the GUI process logs the export when it is done.
+
+    Args:
+        kind (str): Report kind
+        date (str, optional): Day of an invoice report
+        filepath (str): Output file path
+        progress (queue, optional): Receives (job_id, rows drawn) while drawing
+        cancel_event (Event, optional): Checked before connecting, after each
+            page and before the file is saved; when set the job stops and no
+            file is written
+        job_id (int, optional): Job identifier sent with progress messages
+
+    Returns:
+        int: Number of rows in the report
+
+    Raises:
+        ReportCancelled: cancel_event was set
+    """
+    import psycopg2
+    from ..core.db_manager import DBManager
+
+    report = build_report(kind, date)
+    last_sent = 0.0
+
+    def check_cancelled():
+        if cancel_event is not None and cancel_event.is_set():
+            raise ReportCancelled(f"{kind} report cancelled")
+
+    def on_page(rows):
+        nonlocal last_sent
+        check_cancelled()
+        now = time.monotonic()
+        if progress is not None and now - last_sent >= PROGRESS_INTERVAL:
+            progress.put((job_id, rows))
+            last_sent = now
+
+    # A job cancelled while it sat in the pool's call queue stops here
+    check_cancelled()
+    if progress is not None:
+        progress.put((job_id, 0))  # Started
+
+    conn = psycopg2.connect(**DatabaseConfig.get_connection_params())
+    batches = None
+    try:
+        conn.set_session(readonly=True)
+        batches = DBManager().stream(report.sql, report.params, conn=conn)
+        # on_page is last called just before the canvas is saved, so a
+        # cancelled job writes no file and none is removed: the path may
+        # belong to someone else
+        count = report.render(filepath, (row for batch in batches for row in batch), on_page)
+    finally:
+        if batches is not None:
+            batches.close()
+        conn.close()
+
+    if progress is not None:
+        progress.put((job_id, count))
+    return count
 
-        c.setFont("ArialUnicode", 10)
-        y = 780
-        headers = ["Tên thuốc", "Đơn vị", "Tồn kho", "Số lô", "Giá bán"]
-        for i, header in enumerate(headers):
-            c.drawString(50 + i * 100, y, header)
 
-        y -= 20
-        for row in results:
-            if y < 50:
-                c.showPage()
-                y = 800
-                c.setFont("ArialUnicode", 10)
-            for i, value in enumerate(row):
-                c.drawString(50 + i * 100, y, str(value or ''))
-            y -= 20
+class ReportService:
+    """
+    Service for generating various reports
 
-        c.save()
+    Reports are drawn by TablePdfRenderer straight from a server-side
+    cursor. reportlab and the report font are loaded when the first report
+    is drawn, once per process, not when the service is created.
+    The UI runs reports through ReportJobQueue instead, in worker processes;
+    this service draws on the calling thread.
+    """
 
-        # Log action
-        self.context.log_action(f"Exported stock report: {filename}")
+    def __init__(self, context):
+        """
+        Initialize report service
 
-        return filepath
+        Args:
+            context: Application context with database connection
+        """
+        self.context = context
+        self.db = context.db_manager
 
-    def export_invoice_report(self, date, filepath=None):
+    def export(self, kind, filepath=None, date=None):
         """
-        Export invoice report for specific date to PDF
+        Export a report to PDF
 
         Args:
-            date (str): Date in YYYY-MM-DD format
+            kind (str): Report kind, one of REPORT_KINDS
             filepath (str, optional): Output file path
+            date (str, optional): Day of an invoice report
 
         Returns:
             str: Path to generated PDF file
         """
-        if filepath is None:
-            filename = f"report_invoice_{date}.pdf"
-            Settings.ensure_exports_dir()
-            filepath = os.path.join(Settings.EXPORTS_DIR, filename)
-
-        sql = """
-            SELECT invoice_id, invoice_date, customer_id, total_amount, staff_id, payment_status
-            FROM invoice
-            WHERE DATE(invoice_date) = %s
-            ORDER BY invoice_date DESC
-        """
-        self.db.execute(sql, (date,))
-        results = self.db.fetchall()
+        report = build_report(kind, date)
+        filepath = filepath or report.default_path()
 
-        c = canvas.Canvas(filepath, pagesize=A4)
-        c.setFont("ArialUnicode", 14)
-        c.drawString(50, 800, f"BÁO CÁO HÓA ĐƠN NGÀY {date}")
+        # Streamed from a server-side cursor: drawing starts with the first batch
+        report.render(filepath, self.db.iter_rows(report.sql, report.params))
 
-        c.setFont("ArialUnicode", 10)
-        y = 780
-        headers = ["ID", "Thời gian", "KH", "Tổng tiền", "NV", "Trạng thái"]
-        for i, header in enumerate(headers):
-            c.drawString(50 + i * 80, y, header)
+        # Log action
+        self.context.log_action(report.log_entry(filepath))
 
-        y -= 20
-        for row in results:
-            if y < 50:
-                c.showPage()
-                y = 800
-                c.setFont("ArialUnicode", 10)
-            for i, value in enumerate(row):
-                c.drawString(50 + i * 80, y, str(value or ''))
-            y -= 20
+        return filepath
 
-        c.save()
+    def export_stock_report(self, filepath=None):
+        """
+        Export stock inventory report to PDF
 
-        # Log action
-        self.context.log_action(f"Exported invoice report for date: {date}")
+        Args:
+            filepath (str, optional): Output file path
 
-        return filepath
+        Returns:
+            str: Path to generated PDF file
+        """
+        return self.export('stock', filepath)
 
-    def export_expiry_warning_report(self, filepath=None):
+    def export_invoice_report(self, date, filepath=None):
         """
-        Export expiring medicines report to PDF
+        Export invoice report for specific date to PDF
 
         Args:
+            date (str): Date in YYYY-MM-DD format
             filepath (str, optional): Output file path
 
         Returns:
             str: Path to generated PDF file
         """
-        if filepath is None:
-            filename = f"report_expiring_{datetime.now().strftime('%Y%m%d')}.pdf"
-            Settings.ensure_exports_dir()
-            filepath = os.path.join(Settings.EXPORTS_DIR, filename)
+        return self.export('invoice', filepath, date)
 
-        sql = """
-            SELECT medicine_name, stock_quantity, unit, batch_number, expiration_date,
-                   (expiration_date::date - CURRENT_DATE) AS days_left
-            FROM medicine
-            WHERE (expiration_date::date - CURRENT_DATE) <= 60
-              AND (expiration_date::date - CURRENT_DATE) >= 0
-            ORDER BY expiration_date ASC
+    def export_expiry_warning_report(self, filepath=None):
         """
-        self.db.execute(sql)
-        results = self.db.fetchall()
-
-        c = canvas.Canvas(filepath, pagesize=A4)
-        c.setFont("ArialUnicode", 14)
-        c.drawString(50, 800, "BÁO CÁO THUỐC SẮP HẾT HẠN")
-
-        c.setFont("ArialUnicode", 10)
-        y = 780
-        col_x = [50, 150, 200, 270, 370, 500]
-        headers = ["Tên thuốc", "SL", "ĐV", "Số lô", "Hạn dùng", "Còn lại (ngày)"]
-        for i, header in enumerate(headers):
-            c.drawString(col_x[i], y, header)
-
-        y -= 20
-        for row in results:
-            if y < 50:
-                c.showPage()
-                y = 800
-                c.setFont("ArialUnicode", 10)
-                for i, header in enumerate(headers):
-                    c.drawString(col_x[i], y, header)
-                y -= 20
-            for i, value in enumerate(row):
-                c.drawString(col_x[i], y, str(value or ''))
-            y -= 20
-
-        c.save()
+        Export expiring medicines report to PDF
 
-        # Log action
-        self.context.log_action("Exported expiry warning report")
+        Args:
+            filepath (str, optional): Output file path
 
-        return filepath
+        Returns:
+            str: Path to generated PDF file
+        """
+        return self.export('expiry', filepath)
@@ -0,0 +1,153 @@
+"""
+Search service - ranked, paginated server-side search
+"""
+
+from ..config.settings import Settings
+
+
+# Normalized search term and LIKE pattern. f_unaccent() is IMMUTABLE, so both
+# are folded to constants at plan time and the trigram indexes can be used.
+_TERM = "lower(f_unaccent(%(term)s))"
+_PATTERN = "('%%' || lower(f_unaccent(%(like)s)) || '%%')"
+_PREFIX = "(lower(f_unaccent(%(like)s)) || '%%')"
+
+
+def _norm(column):
+    """SQL expression matching the trigram expression indexes"""
+    return f"lower(f_unaccent({column}))"
+
+
+# Substring matches on any name, plus fuzzy (trigram similarity) matches on
+# the medicine name for typos. Prefix matches rank first, then similarity.
+MEDICINE_SEARCH_SQL = f"""
+    SELECT m.medicine_id, m.medicine_name, c.category_name,
+           m.created_at, m.updated_at,
+           GREATEST(similarity({_norm('m.medicine_name')}, {_TERM}),
+                    similarity({_norm('m.generic_name')}, {_TERM}),
+                    similarity({_norm('m.brand_name')}, {_TERM})) AS score
+    FROM medicine m
+    JOIN category c ON m.category_id = c.category_id
+    WHERE {_norm('m.medicine_name')} LIKE {_PATTERN}
+       OR {_norm('m.generic_name')} LIKE {_PATTERN}
+       OR {_norm('m.brand_name')} LIKE {_PATTERN}
+       OR {_norm('m.medicine_name')} %% {_TERM}
+    ORDER BY ({_norm('m.medicine_name')} LIKE {_PREFIX}) IS TRUE DESC,
+             score DESC, m.medicine_name, m.medicine_id
+    LIMIT %(limit)s OFFSET %(offset)s
+"""
+
+CUSTOMER_SEARCH_SQL = f"""
+    SELECT customer_id, customer_name, customer_phone, customer_email,
+           similarity({_norm('customer_name')}, {_TERM}) AS score
+    FROM customer
+    WHERE {_norm('customer_name')} LIKE {_PATTERN}
+       OR customer_phone LIKE ('%%' || %(like)s || '%%')
+       OR {_norm('customer_name')} %% {_TERM}
+    ORDER BY (customer_phone LIKE (%(like)s || '%%')) IS TRUE DESC,
+             score DESC NULLS LAST, customer_name, customer_id
+    LIMIT %(limit)s OFFSET %(offset)s
+"""
+
+# Medicines are matched through their trigram index first, then joined to
+# their stock lines, newest receipt first among equally ranked hits
+STOCK_SEARCH_SQL = f"""
+    SELECT s.stock_id, sd.medicine_id, m.medicine_name,
+           sd.quantity, sd.price, sd.batch_number,
+           sd.expiration_date, sup.supplier_name,
+           s.staff_id, s.created_at,
+           similarity({_norm('m.medicine_name')}, {_TERM}) AS score
+    FROM medicine m
+    JOIN stock_detail sd ON sd.medicine_id = m.medicine_id
+    JOIN stock s ON s.stock_id = sd.stock_id
+    JOIN supplier sup ON s.supplier_id = sup.supplier_id
+    WHERE {_norm('m.medicine_name')} LIKE {_PATTERN}
+    ORDER BY score DESC, s.created_at DESC, s.stock_id DESC, sd.stock_detail_id
+    LIMIT %(limit)s OFFSET %(offset)s
+"""
+
+
+def escape_like(term):
+    """Escape LIKE wildcards so user input matches literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class SearchService:
+    """Service for indexed, accent-insensitive search"""
+
+    def __init__(self, context):
+        """
+        Initialize search service
+
+        Args:
+            context: Application context with database connection
+        """
+        self.context = context
+        self.db = context.db_manager
+
+    def search_medicines(self, term, limit=None, offset=0, conn=None):
+        """
+        Search medicines by name, generic name or brand name
+
+        Args:
+            term (str): Search text, accents and case are ignored
+            limit (int, optional): Page size, defaults to Settings.SEARCH_PAGE_SIZE
+            offset (int): Hits to skip
+            conn: Optional psycopg2 connection (e.g. from a QueryRunner task)
+
+        Returns:
+            tuple: (rows, has_more). Rows match the medicine window columns
+                followed by a relevance score
+        """
+        return self._search(MEDICINE_SEARCH_SQL, term, limit, offset, conn)
+
+    def search_customers(self, term, limit=None, offset=0, conn=None):
+        """
+        Search customers by name or phone number
+
+        Args:
+            term (str): Search text, accents and case are ignored
+            limit (int, optional): Page size, defaults to Settings.SEARCH_PAGE_SIZE
+            offset (int): Hits to skip
+            conn: Optional psycopg2 connection
+
+        Returns:
+            tuple: (rows, has_more)
+        """
+        return self._search(CUSTOMER_SEARCH_SQL, term, limit, offset, conn)
+
+    def search_stock(self, term, limit=None, offset=0, conn=None):
+        """
+        Search stock receipt lines by medicine name
+
+        Args:
+            term (str): Search text, accents and case are ignored
+            limit (int, optional): Page size, defaults to Settings.SEARCH_PAGE_SIZE
+            offset (int): Hits to skip
+            conn: Optional psycopg2 connection
+
+        Returns:
+            tuple: (rows, has_more)
+        """
+        return self._search(STOCK_SEARCH_SQL, term, limit, offset, conn)
+
+    def _search(self, sql, term, limit, offset, conn):
+        """Run a search query, fetching one extra row to detect more pages"""
+        limit = limit or Settings.SEARCH_PAGE_SIZE
+        term = term.strip()
+        params = {
+            'term': term,
+            'like': escape_like(term),
+            'limit': limit + 1,
+            'offset': offset,
+        }
+
+        if conn is None:
+            with self.db.pooled_cursor() as cur:
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+        else:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+
+        return rows[:limit], len(rows) > limit
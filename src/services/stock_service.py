@@ -0,0 +1,144 @@
+"""
+Stock service - bulk receipt of supplier deliveries
+"""
+
+from ..core.query_recorder import query_budget
+
+
+# One statement receives a whole delivery:
+# - creates the stock entry
+# - resolves every (medicine_name, batch_number) pair against medicine at once
+# - adds quantities to existing batches and inserts the new ones, set-based
+# - inserts one stock_detail row per delivery line
+# Lines repeating a pair are summed into the batch; the last line's prices win.
+RECEIVE_STOCK_SQL = """
+    WITH input AS (
+        SELECT *
+        FROM unnest(%(names)s::text[], %(quantities)s::int[], %(prices)s::numeric[],
+                    %(sale_prices)s::numeric[], %(batches)s::text[],
+                    %(expiration_dates)s::timestamp[])
+             WITH ORDINALITY AS t(medicine_name, quantity, price, sale_price,
+                                  batch_number, expiration_date, line_no)
+    ),
+    new_stock AS (
+        INSERT INTO stock (supplier_id, staff_id, payment_method_id, created_at)
+        VALUES (%(supplier_id)s, %(staff_id)s, %(payment_method_id)s, %(stock_date)s)
+        RETURNING stock_id
+    ),
+    batches AS (
+        SELECT DISTINCT ON (medicine_name, batch_number)
+               medicine_name, batch_number, price, sale_price, expiration_date,
+               SUM(quantity) OVER (PARTITION BY medicine_name, batch_number) AS quantity
+        FROM input
+        ORDER BY medicine_name, batch_number, line_no DESC
+    ),
+    existing AS (
+        SELECT DISTINCT ON (m.medicine_name, m.batch_number)
+               m.medicine_id, m.medicine_name, m.batch_number
+        FROM medicine m
+        JOIN batches b ON b.medicine_name = m.medicine_name
+                      AND b.batch_number = m.batch_number
+        ORDER BY m.medicine_name, m.batch_number, m.medicine_id
+    ),
+    updated AS (
+        UPDATE medicine m SET
+            stock_quantity = COALESCE(m.stock_quantity, 0) + b.quantity,
+            unit_price = b.price,
+            sale_price = b.sale_price,
+            expiration_date = b.expiration_date,
+            updated_at = CURRENT_TIMESTAMP
+        FROM existing e
+        JOIN batches b ON b.medicine_name = e.medicine_name
+                      AND b.batch_number = e.batch_number
+        WHERE m.medicine_id = e.medicine_id
+        RETURNING m.medicine_id, m.medicine_name, m.batch_number
+    ),
+    inserted AS (
+        INSERT INTO medicine (medicine_name, supplier_id, stock_quantity,
+                              unit_price, sale_price, batch_number, expiration_date)
+        SELECT b.medicine_name, %(supplier_id)s, b.quantity,
+               b.price, b.sale_price, b.batch_number, b.expiration_date
+        FROM batches b
+        WHERE NOT EXISTS (
+            SELECT 1 FROM existing e
+            WHERE e.medicine_name = b.medicine_name
+              AND e.batch_number = b.batch_number
+        )
+        RETURNING medicine_id, medicine_name, batch_number
+    ),
+    resolved AS (
+        SELECT * FROM updated
+        UNION ALL
+        SELECT * FROM inserted
+    ),
+    details AS (
+        INSERT INTO stock_detail (stock_id, medicine_id, quantity, price,
+                                  batch_number, expiration_date, note)
+        SELECT s.stock_id, r.medicine_id, i.quantity, i.price,
+               i.batch_number, i.expiration_date, ''
+        FROM input i
+        JOIN resolved r ON r.medicine_name = i.medicine_name
+                       AND r.batch_number = i.batch_number
+        CROSS JOIN new_stock s
+        ORDER BY i.line_no
+        RETURNING stock_detail_id
+    )
+    SELECT (SELECT stock_id FROM new_stock),
+           (SELECT COUNT(*) FROM details),
+           (SELECT COUNT(*) FROM inserted)
+"""
+
+
+class StockService:
+    """Service for receiving stock from suppliers"""
+
+    def __init__(self, context):
+        """
+        Initialize stock service
+
+        Args:
+            context: Application context with database connection
+        """
+        self.context = context
+        self.db = context.db_manager
+
+    @query_budget(1, "receive stock")
+    def receive_stock(self, supplier_id, staff_id, payment_method_id, stock_date, lines):
+        """
+        Record a supplier delivery in a single statement and transaction
+
+        Args:
+            supplier_id (int): Supplier ID
+            staff_id (str): Staff receiving the delivery
+            payment_method_id (int): Payment method ID
+            stock_date (str): Date in YYYY-MM-DD format
+            lines (list): (medicine_name, quantity, price, sale_price,
+                batch_number, expiration_date) tuples
+
+        Returns:
+            tuple: (stock_id, detail_count, new_medicine_count)
+
+        Raises:
+            ValueError: If there are no lines
+        """
+        if not lines:
+            raise ValueError("Stock entry has no lines")
+
+        names, quantities, prices, sale_prices, batches, expiration_dates = map(list, zip(*lines))
+        params = {
+            'names': names,
+            'quantities': quantities,
+            'prices': prices,
+            'sale_prices': sale_prices,
+            'batches': batches,
+            'expiration_dates': expiration_dates,
+            'supplier_id': supplier_id,
+            'staff_id': staff_id,
+            'payment_method_id': payment_method_id,
+            'stock_date': stock_date,
+        }
+
+        with self.db.pooled_connection(autocommit=True) as conn:
+            with conn.cursor() as cur:
+                cur.execute(RECEIVE_STOCK_SQL, params)
+                return cur.fetchone()
@@ -0,0 +1,136 @@
+"""
+Tabular PDF rendering shared by the reports
+"""
+
+import zlib
+
+from ..utils.fonts import register_font
+
+
+class TablePdfRenderer:
+    """
+    Draws a titled table on A4 pages from an iterable of rows
+
+    Rows are consumed one at a time and never collected, so a report can be
+    fed straight from DBManager.iter_rows() and starts drawing with the first
+    batch. The column layout is fixed when the renderer is created, the
+    header row is repeated at the top of every page, and each page is
+    written as one text object and compressed as soon as it is full.
+
+    Memory is not constant: reportlab writes the file only in save(), so
+    every finished page stays in memory until then. Compressed early, the
+    pages hold about 100 bytes per row, a quarter of reportlab's default.
+
+    Example:
+        renderer = TablePdfRenderer("BÁO CÁO TỒN KHO", ["Tên thuốc", "Tồn kho"], [50, 250])
+        renderer.render(filepath, db.iter_rows(sql))
+    """
+
+    PAGE_TOP = 800
+    PAGE_BOTTOM = 50
+    ROW_HEIGHT = 20
+
+    def __init__(self, title, headers, col_x, font_name="ArialUnicode", font_size=10,
+                 title_size=14):
+        """
+        Initialize renderer
+
+        Args:
+            title (str): Title drawn at the top of the first page
+            headers (list): Column headers
+            col_x (list): Left edge of each column, in points
+            font_name (str): Report font (see utils.fonts) or a reportlab built-in,
+                registered on the first render
+            font_size (int): Size of the header and row text
+            title_size (int): Size of the title
+        """
+        if len(headers) != len(col_x):
+            raise ValueError("Each column needs one header and one x position")
+
+        self.title = title
+        self.headers = list(headers)
+        self.col_x = list(col_x)
+        self.font_name = font_name
+        self.font_size = font_size
+        self.title_size = title_size
+
+    def render(self, filepath, rows, on_page=None):
+        """
+        Draw the table to a PDF file
+
+        Args:
+            filepath (str): Output file path
+            rows (iterable): Row tuples, values in column order
+            on_page (callable, optional): Called with the number of rows
+                drawn so far each time a page is finished, the last time
+                just before the file is written; raising stops the render
+
+        Returns:
+            int: Number of rows drawn
+        """
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+
+        register_font(self.font_name)
+        c = canvas.Canvas(filepath, pagesize=A4, pageCompression=1)
+        c.setFont(self.font_name, self.title_size)
+        c.drawString(self.col_x[0], self.PAGE_TOP, self.title)
+
+        text, y = self._start_page(c, self.PAGE_TOP - self.ROW_HEIGHT)
+        count = 0
+        for row in rows:
+            if y < self.PAGE_BOTTOM:
+                c.drawText(text)
+                c.showPage()
+                self._compress_last_page(c)
+                if on_page:
+                    on_page(count)
+                text, y = self._start_page(c, self.PAGE_TOP)
+
+            for x, value in zip(self.col_x, row):
+                text.setTextOrigin(x, y)
+                text.textOut('' if value is None else str(value))
+            y -= self.ROW_HEIGHT
+            count += 1
+
+        c.drawText(text)
+        # Before save(), so a callback that raises (a cancelled job) stops
+        # the report before any file is written
+        if on_page:
+            on_page(count)
+        c.save()
+        return count
+
+    @staticmethod
+    def _compress_last_page(c):
+        """
+        Compress the page just finished instead of when the file is saved
+
+        reportlab keeps every finished page's content as text until save()
+        and only compresses it then. Compressing it here keeps about a tenth
+        of that per page; the page objects themselves still stay until save().
+        """
+        from reportlab.pdfbase.pdfdoc import PDFArray, PDFName, PDFStream
+
+        page = c._doc.Pages.pages[-1]
+        if page.Contents is not None or not page.stream:
+            return
+        contents = PDFStream(content=zlib.compress(page.stream.encode('utf8')))
+        contents.dictionary["Filter"] = PDFArray([PDFName("FlateDecode")])
+        contents.__Comment__ = "page stream"
+        page.Contents = contents
+        page.stream = None
+
+    def _start_page(self, c, y):
+        """
+        Begin a page's text object with the header row
+
+        Returns:
+            tuple: (text object, y of the first row)
+        """
+        text = c.beginText()
+        text.setFont(self.font_name, self.font_size)
+        for x, header in zip(self.col_x, self.headers):
+            text.setTextOrigin(x, y)
+            text.textOut(header)
+        return text, y - self.ROW_HEIGHT
@@ -4,5 +4,8 @@ Base classes for UI components
 
 from .base_window import BaseWindow
 from .base_dialog import BaseDialog
+from .table_model import Column, RowTableModel, RowFilterProxyModel
+from .server_search import ServerSearch
 
-__all__ = ['BaseWindow', 'BaseDialog']
+__all__ = ['BaseWindow', 'BaseDialog', 'Column', 'RowTableModel', 'RowFilterProxyModel',
+           'ServerSearch']
@@ -6,9 +6,9 @@ import os
 from PyQt6.QtWidgets import QDialog, QMessageBox
 from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import Qt
-from PyQt6 import uic
 
 from src.config import Settings
+from src.ui.base.form_loader import load_form
 
 
 class BaseDialog(QDialog):
@@ -47,13 +47,8 @@ class BaseDialog(QDialog):
         self.setModal(True)
 
     def _load_ui(self, ui_filename):
-        """Load UI file from forms directory"""
-        ui_path = Settings.get_ui_file(ui_filename)
-
-        if not os.path.exists(ui_path):
-            raise FileNotFoundError(f"UI file not found: {ui_path}")
-
-        uic.loadUi(ui_path, self)
+        """Build the form's widgets (form classes are cached per process)"""
+        load_form(self, ui_filename)
 
     def _setup_window_icon(self):
         """Setup dialog icon based on current theme"""
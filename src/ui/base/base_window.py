@@ -3,12 +3,13 @@ Base window class for all main windows
 """
 
 import os
-from PyQt6.QtWidgets import QMainWindow, QMessageBox
+from PyQt6.QtWidgets import QMainWindow, QMessageBox, QProgressBar
 from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import Qt
-from PyQt6 import uic
 
 from src.config import Settings
+from src.ui.base.form_loader import load_form
+from src.ui.base.table_model import RowTableModel, RowFilterProxyModel
 
 
 class BaseWindow(QMainWindow):
@@ -19,6 +20,8 @@ class BaseWindow(QMainWindow):
     - UI file loading
     - Window icon setup
     - Context management
+    - Background queries with loading indicator
+    - Model/view table setup
     - Common utility methods
     """
 
@@ -35,6 +38,8 @@ class BaseWindow(QMainWindow):
 
         self.context = context
         self.db = context.db_manager
+        self._pending_queries = []
+        self._loading_bar = None
 
         # Load UI file
         self._load_ui(ui_filename)
@@ -45,13 +50,8 @@ class BaseWindow(QMainWindow):
         self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
 
     def _load_ui(self, ui_filename):
-        """Load UI file from forms directory"""
-        ui_path = Settings.get_ui_file(ui_filename)
-
-        if not os.path.exists(ui_path):
-            raise FileNotFoundError(f"UI file not found: {ui_path}")
-
-        uic.loadUi(ui_path, self)
+        """Build the form's widgets (form classes are cached per process)"""
+        load_form(self, ui_filename)
 
     def _setup_window_icon(self):
         """Setup window icon based on current theme"""
@@ -100,6 +100,162 @@ class BaseWindow(QMainWindow):
         )
         return reply == QMessageBox.StandardButton.Yes
 
+    def setup_table(self, view, columns, search_columns=()):
+        """
+        Attach a row model and filter proxy to a QTableView
+
+        Args:
+            view: QTableView from the .ui form
+            columns: Column descriptions
+            search_columns: Column indexes matched by the search box
+
+        Returns:
+            tuple: (RowTableModel, RowFilterProxyModel)
+        """
+        model = RowTableModel(columns, self)
+        proxy = RowFilterProxyModel(search_columns, self)
+        proxy.setSourceModel(model)
+        view.setModel(proxy)
+
+        for index, column in enumerate(columns):
+            if column.width:
+                view.setColumnWidth(index, column.width)
+            view.setColumnHidden(index, column.hidden)
+
+        # Keep the query's ORDER BY until a header is clicked
+        view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        view.setSortingEnabled(True)
+        return model, proxy
+
+    def run_query(self, sql, params=None, on_result=None, error_message="Error loading data"):
+        """
+        Run a query on a background thread without blocking the UI
+
+        The loading indicator is shown while queries are pending, and
+        pending queries are cancelled when the window closes.
+
+        Args:
+            sql: SQL query
+            params: Optional query parameters
+            on_result: Called on the GUI thread with the fetched rows
+            error_message: Prefix of the error shown if the query fails
+
+        Returns:
+            QueryTask: Task handle
+        """
+        task = self.context.query_runner.submit(sql, params)
+        self._track_query(task, on_result, error_message)
+        return task
+
+    def run_in_background(self, work, on_result=None, error_message="Error loading data"):
+        """
+        Run a function taking a pooled connection on a background thread
+
+        Args:
+            work: Callable receiving a psycopg2 connection
+            on_result: Called on the GUI thread with the function's return value
+            error_message: Prefix of the error shown if the function raises
+
+        Returns:
+            QueryTask: Task handle
+        """
+        task = self.context.query_runner.submit_call(work)
+        self._track_query(task, on_result, error_message)
+        return task
+
+    def run_stream(self, sql, params=None, on_batch=None, on_done=None,
+                   error_message="Error loading data"):
+        """
+        Run a SELECT on a background thread and receive its rows in batches
+
+        The first batch arrives while the rest is still being fetched, so a
+        table can be filled before the whole result is read.
+
+        Args:
+            sql: Query to execute
+            params: Query parameters
+            on_batch: Called on the GUI thread with (rows, first) for each batch
+            on_done: Called on the GUI thread with the total row count
+            error_message: Prefix of the error shown if the query fails
+
+        Returns:
+            QueryTask: Task handle
+        """
+        received = []
+
+        def handle_batch(rows):
+            if task.cancelled or not on_batch:
+                return
+            on_batch(rows, not received)
+            received.append(len(rows))
+
+        def handle_done(count):
+            if not received and on_batch:
+                on_batch([], True)  # Empty result: clear the view
+            if on_done:
+                on_done(count)
+
+        task = self.context.query_runner.submit_stream(sql, params, on_batch=handle_batch)
+        self._track_query(task, handle_done, error_message)
+        return task
+
+    def _track_query(self, task, on_result, error_message):
+        """Wire task signals to window callbacks and the loading indicator"""
+        def handle_result(result):
+            if task.cancelled:
+                return
+            self._finish_query(task)
+            if on_result:
+                on_result(result)
+
+        def handle_error(error):
+            if task.cancelled:
+                return
+            self._finish_query(task)
+            self.show_error(f"{error_message}: {error}")
+
+        task.signals.finished.connect(handle_result)
+        task.signals.failed.connect(handle_error)
+
+        self._pending_queries.append(task)
+        self._update_loading_indicator()
+
+    def _finish_query(self, task):
+        """Forget a completed task and update the loading indicator"""
+        if task in self._pending_queries:
+            self._pending_queries.remove(task)
+        self._update_loading_indicator()
+
+    def _update_loading_indicator(self):
+        """Show a busy indicator in the status bar while queries are pending"""
+        loading = bool(self._pending_queries)
+
+        if loading and self._loading_bar is None:
+            self._loading_bar = QProgressBar()
+            self._loading_bar.setRange(0, 0)  # Busy (indeterminate) mode
+            self._loading_bar.setMaximumWidth(120)
+            self._loading_bar.setMaximumHeight(14)
+            self._loading_bar.setTextVisible(False)
+            self.statusBar().addPermanentWidget(self._loading_bar)
+
+        if self._loading_bar is not None:
+            self._loading_bar.setVisible(loading)
+        if loading:
+            self.statusBar().showMessage("Loading...")
+        else:
+            self.statusBar().clearMessage()
+
+    def cancel_query(self, task):
+        """Cancel one background query started by this window"""
+        task.cancel()
+        self._finish_query(task)
+
+    def cancel_pending_queries(self):
+        """Cancel all background queries started by this window"""
+        for task in self._pending_queries:
+            task.cancel()
+        self._pending_queries = []
+
     def refresh_data(self):
         """
         Refresh window data - to be overridden by subclasses
@@ -108,5 +264,6 @@ class BaseWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close event"""
-        # Can be overridden by subclasses for cleanup
+        # Results must not be delivered to a closed (deleted) window
+        self.cancel_pending_queries()
         event.accept()
@@ -0,0 +1,133 @@
+"""
+Form loading with a process-wide form class cache
+
+uic.loadUi() parses the .ui XML and builds the widgets through the
+generic loader on every call. Here each form is turned into a Ui_* class
+once per process, either by importing the module precompiled from it or,
+in development, by compiling the .ui file with uic.loadUiType(). Opening
+a window or dialog then only runs the class's generated setupUi() code.
+
+Precompile all forms (e.g. before packaging) with:
+
+    python -m src.ui.base.form_loader
+"""
+
+import importlib
+import os
+
+from PyQt6 import uic
+
+from src.config import Settings
+
+
+COMPILED_PACKAGE = "src.ui.forms.compiled"
+COMPILED_DIR = os.path.join(Settings.UI_FORMS_DIR, "compiled")
+
+_form_classes = {}  # ui filename -> Ui_* class
+
+
+def compiled_module_path(ui_filename):
+    """Path of the module precompiled from a form"""
+    return os.path.join(COMPILED_DIR, _module_name(ui_filename) + ".py")
+
+
+def form_class(ui_filename):
+    """
+    Get the generated Ui_* class of a form, building it on first use
+
+    The precompiled module is used unless the .ui file is newer, so a form
+    edited in Qt Designer takes effect without recompiling.
+
+    Args:
+        ui_filename (str): Form file name, e.g. 'main.ui'
+
+    Returns:
+        type: Class with setupUi(widget) and retranslateUi(widget)
+    """
+    cls = _form_classes.get(ui_filename)
+    if cls is None:
+        cls = _load_compiled(ui_filename) or _compile(ui_filename)
+        _form_classes[ui_filename] = cls
+    return cls
+
+
+def load_form(widget, ui_filename):
+    """
+    Build a form's widgets on a window or dialog
+
+    Like uic.loadUi(), the child widgets become attributes of the widget.
+
+    Args:
+        widget: QMainWindow, QDialog or QWidget matching the form's root
+        ui_filename (str): Form file name, e.g. 'main.ui'
+    """
+    form = form_class(ui_filename)()
+    form.setupUi(widget)
+    for name, child in vars(form).items():
+        setattr(widget, name, child)
+
+
+def clear_cache():
+    """Forget the cached form classes (e.g. for benchmarks)"""
+    _form_classes.clear()
+
+
+def compile_forms():
+    """
+    Precompile every .ui file under src/ui/forms
+
+    Returns:
+        list: Paths of the generated modules
+    """
+    os.makedirs(COMPILED_DIR, exist_ok=True)
+    init_path = os.path.join(COMPILED_DIR, "__init__.py")
+    if not os.path.exists(init_path):
+        with open(init_path, "w", encoding="utf-8") as f:
+            f.write('"""Form classes generated from ../*.ui by form_loader.py"""\n')
+
+    generated = []
+    for name in sorted(os.listdir(Settings.UI_FORMS_DIR)):
+        if not name.endswith(".ui"):
+            continue
+        path = compiled_module_path(name)
+        with open(Settings.get_ui_file(name), encoding="utf-8") as ui_file, \
+                open(path, "w", encoding="utf-8") as py_file:
+            uic.compileUi(ui_file, py_file)
+        generated.append(path)
+    return generated
+
+
+def _module_name(ui_filename):
+    """Module name of a precompiled form: main.ui -> main_ui"""
+    return os.path.splitext(ui_filename)[0] + "_ui"
+
+
+def _load_compiled(ui_filename):
+    """Import the precompiled form class, or None if missing or outdated"""
+    ui_path = Settings.get_ui_file(ui_filename)
+    py_path = compiled_module_path(ui_filename)
+    if not os.path.exists(py_path):
+        return None
+    if os.path.exists(ui_path) and os.path.getmtime(ui_path) > os.path.getmtime(py_path):
+        return None
+
+    module = importlib.import_module(f"{COMPILED_PACKAGE}.{_module_name(ui_filename)}")
+    for name, value in vars(module).items():
+        if name.startswith("Ui_") and isinstance(value, type):
+            return value
+    return None
+
+
+def _compile(ui_filename):
+    """Compile a .ui file in memory"""
+    ui_path = Settings.get_ui_file(ui_filename)
+    if not os.path.exists(ui_path):
+        raise FileNotFoundError(f"UI file not found: {ui_path}")
+
+    cls, _base = uic.loadUiType(ui_path)
+    return cls
+
+
+if __name__ == "__main__":
+    for path in compile_forms():
+        print(f"✔ {path}")
@@ -0,0 +1,114 @@
+"""
+Debounced search-as-you-type backed by the database
+"""
+
+from PyQt6.QtCore import QObject, QTimer
+
+from src.config import Settings
+
+
+class ServerSearch(QObject):
+    """
+    Binds a search box to a paginated server-side search
+
+    Keystrokes restart a short timer, so a query is only sent once typing
+    pauses. A new query cancels the one still in flight, and late results
+    for an older term are dropped. The first page of ranked hits replaces
+    the table rows, and further pages load when the view is scrolled to the
+    bottom. An empty search box restores the window's full list.
+    """
+
+    def __init__(self, window, search_input, view, model, search, reload,
+                 page_size=None, delay_ms=None):
+        """
+        Initialize server search
+
+        Args:
+            window: BaseWindow running the queries
+            search_input: QLineEdit with the search text
+            view: QTableView showing the results
+            model: RowTableModel behind the view
+            search (callable): search(term, limit=, offset=, conn=) returning
+                (rows, has_more), e.g. a SearchService method
+            reload (callable): Loads the unfiltered list, returns its QueryTask
+            page_size (int, optional): Hits per page
+            delay_ms (int, optional): Debounce delay
+        """
+        super().__init__(window)
+        self.window = window
+        self.search_input = search_input
+        self.view = view
+        self.model = model
+        self.search = search
+        self.reload = reload
+        self.page_size = page_size or Settings.SEARCH_PAGE_SIZE
+
+        self.term = ""
+        self._task = None
+        self._offset = 0
+        self._has_more = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms or Settings.SEARCH_DEBOUNCE_MS)
+        self._timer.timeout.connect(self.refresh)
+
+        search_input.textChanged.connect(self._schedule)
+        view.verticalScrollBar().valueChanged.connect(self._on_scroll)
+
+    def refresh(self):
+        """Run the current search now (or reload the full list when empty)"""
+        self._timer.stop()
+        self._cancel()
+
+        self.term = self.search_input.text().strip()
+        self._offset = 0
+        self._has_more = False
+
+        if self.term:
+            self._fetch()
+        else:
+            self._task = self.reload()
+
+    def _schedule(self, _text):
+        """Restart the debounce timer on every keystroke"""
+        self._timer.start()
+
+    def _fetch(self):
+        """Request the next page for the current term"""
+        term, offset, limit = self.term, self._offset, self.page_size
+
+        def work(conn):
+            return self.search(term, limit=limit, offset=offset, conn=conn)
+
+        self._task = self.window.run_in_background(
+            work,
+            on_result=lambda page: self._show(term, offset, page),
+            error_message="Search failed"
+        )
+
+    def _show(self, term, offset, page):
+        """Display a page of hits unless a newer search superseded it"""
+        if term != self.term or offset != self._offset:
+            return
+
+        self._task = None
+        rows, self._has_more = page
+        if offset == 0:
+            self.model.set_rows(rows)
+        else:
+            self.model.append_rows(rows)
+        self._offset = offset + len(rows)
+
+    def _on_scroll(self, value):
+        """Load the next page when the view reaches the bottom"""
+        if not (self.term and self._has_more and self._task is None):
+            return
+        if value >= self.view.verticalScrollBar().maximum():
+            self._fetch()
+
+    def _cancel(self):
+        """Cancel the query in flight, if any"""
+        if self._task is not None:
+            self.window.cancel_query(self._task)
+            self._task = None
@@ -0,0 +1,388 @@
+"""
+Table model and proxy shared by the list windows
+
+Rows are kept as the tuples returned by the query. Cell text, fonts and
+tooltips are produced on demand, so the view only pays for visible cells
+instead of one QTableWidgetItem per cell.
+"""
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+from PyQt6.QtGui import QFont
+
+
+def default_sort_key(value):
+    """Sort strings case-insensitively and everything else by its own type"""
+    if isinstance(value, str):
+        return value.casefold()
+    return value
+
+
+class Column:
+    """Description of one table column"""
+
+    def __init__(self, title, field=None, text=None, width=None, hidden=False,
+                 link=False, bold=False, tooltip=None, formatter=None, sort_key=None):
+        """
+        Initialize column
+
+        Args:
+            title (str): Header label
+            field (int, optional): Index of the value in each row tuple
+            text (str, optional): Fixed cell text for columns without a field,
+                such as "View Details"
+            width (int, optional): Initial width in pixels
+            hidden (bool): Hide the column
+            link (bool): Underline the cell to show that clicking opens details
+            bold (bool): Bold cell font
+            tooltip (str, optional): Cell tooltip
+            formatter (callable, optional): Turns a value into its display text,
+                defaults to str()
+            sort_key (callable, optional): Turns a value into its sort key,
+                defaults to the value itself (strings case-insensitive)
+        """
+        self.title = title
+        self.field = field
+        self.text = text
+        self.width = width
+        self.hidden = hidden
+        self.link = link
+        self.bold = bold
+        self.tooltip = tooltip
+        self.formatter = formatter
+        self.sort_key = sort_key or default_sort_key
+
+    def make_font(self):
+        """Build the shared cell font, or None for the default font"""
+        if not (self.link or self.bold):
+            return None
+        font = QFont()
+        font.setUnderline(self.link)
+        font.setBold(self.bold)
+        return font
+
+
+class RowTableModel(QAbstractTableModel):
+    """
+    Read-only model over a list of row tuples
+
+    Sorting is done here with typed keys (numeric IDs, real datetimes), so
+    "10" sorts after "9" and dates sort chronologically.
+    """
+
+    def __init__(self, columns, parent=None):
+        """
+        Initialize table model
+
+        Args:
+            columns (list): Column descriptions
+            parent: Optional parent QObject
+        """
+        super().__init__(parent)
+        self.columns = columns
+        self._rows = []
+        self._fonts = [column.make_font() for column in columns]
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self._search_cache = {}
+
+    def set_rows(self, rows):
+        """
+        Replace the model contents
+
+        Args:
+            rows (list): Row tuples from a query
+        """
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._search_cache = {}
+        self._apply_sort()
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        """
+        Add rows after the existing ones (e.g. the next page of results)
+
+        Args:
+            rows (list): Row tuples from a query
+        """
+        if not rows:
+            return
+
+        if self._sort_key() is not None:
+            # Merged into the current sort order, after equal rows
+            self._insert_sorted(rows, after_equal=True)
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self._search_cache = {}
+        self.endInsertRows()
+
+    def prepend_rows(self, rows):
+        """
+        Add rows before the existing ones (e.g. newly arrived log entries)
+
+        Args:
+            rows (list): Row tuples from a query
+        """
+        if not rows:
+            return
+
+        if self._sort_key() is not None:
+            # Merged into the current sort order, before equal rows
+            self._insert_sorted(rows, after_equal=False)
+            return
+
+        self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+        self._rows[:0] = rows
+        self._search_cache = {}
+        self.endInsertRows()
+
+    def row_data(self, row):
+        """Get the raw row tuple at a model row"""
+        return self._rows[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        """Number of rows"""
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        """Number of columns"""
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        """Column titles for the horizontal header"""
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.columns[section].title
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Cell data, computed only when the view asks for it"""
+        if not index.isValid():
+            return None
+
+        column = self.columns[index.column()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display_text(index.row(), column)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.FontRole:
+            return self._fonts[index.column()]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return column.tooltip
+        return None
+
+    def display_text(self, row, column):
+        """
+        Get the text shown in a cell
+
+        Args:
+            row (int): Model row
+            column (Column): Column description
+
+        Returns:
+            str: Cell text
+        """
+        if column.field is None:
+            return column.text or ''
+
+        value = self._rows[row][column.field]
+        if value is None:
+            return ''
+        return column.formatter(value) if column.formatter else str(value)
+
+    def search_text(self, row, columns):
+        """
+        Get the lowercased text of a row's searchable columns
+
+        Built once per column set for all rows and reused for every keystroke.
+
+        Args:
+            row (int): Model row
+            columns (tuple): Indexes of the searchable columns
+
+        Returns:
+            str: Text to match keywords against
+        """
+        texts = self._search_cache.get(columns)
+        if texts is None:
+            searchable = [self.columns[c] for c in columns]
+            texts = [
+                "\n".join(self.display_text(r, column) for column in searchable).lower()
+                for r in range(len(self._rows))
+            ]
+            self._search_cache[columns] = texts
+        return texts[row]
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Sort rows by a column's typed key (column -1 keeps query order)"""
+        self._sort_column = column
+        self._sort_order = order
+
+        if column < 0 or not self._rows:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        old_positions = self._apply_sort()
+
+        # Keep selections and other persistent indexes on the same rows
+        new_positions = [0] * len(old_positions)
+        for new_row, old_row in enumerate(old_positions):
+            new_positions[old_row] = new_row
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(persistent, [
+            self.index(new_positions[index.row()], index.column()) for index in persistent
+        ])
+
+        self.layoutChanged.emit()
+
+    def _sort_key(self):
+        """
+        Get the key function of the current sort column
+
+        Returns:
+            callable: Row tuple -> sort key, or None when rows keep query order
+        """
+        if self._sort_column < 0 or self._sort_column >= len(self.columns):
+            return None
+
+        column = self.columns[self._sort_column]
+        if column.field is None:
+            return None
+
+        field = column.field
+        key = column.sort_key
+
+        # NULLs sort last ascending (first descending) without comparing to values
+        def row_key(row):
+            value = row[field]
+            return (1, 0) if value is None else (0, key(value))
+
+        return row_key
+
+    def _apply_sort(self):
+        """
+        Reorder rows by the current sort column
+
+        Returns:
+            list: Old row position of each row in the new order
+        """
+        positions = list(range(len(self._rows)))
+        row_key = self._sort_key()
+        if row_key is None:
+            return positions
+
+        rows = self._rows
+        positions.sort(key=lambda position: row_key(rows[position]),
+                       reverse=self._sort_order == Qt.SortOrder.DescendingOrder)
+        self._rows = [rows[position] for position in positions]
+        self._search_cache = {}
+        return positions
+
+    def _insert_sorted(self, rows, after_equal):
+        """
+        Merge rows into the sorted rows without re-sorting or resetting
+
+        Only the new rows are sorted; each is placed by binary search, and
+        every contiguous run is announced with beginInsertRows, so the view
+        keeps its scroll position and selection.
+
+        Args:
+            rows (list): Row tuples from a query
+            after_equal (bool): Place rows after existing rows with an equal
+                key (appending) instead of before them (prepending)
+        """
+        row_key = self._sort_key()
+        descending = self._sort_order == Qt.SortOrder.DescendingOrder
+        keyed = sorted(((row_key(row), row) for row in rows),
+                       key=lambda item: item[0], reverse=descending)
+
+        # Insertion point of each new row in the existing rows; the points
+        # only grow, so each search starts at the previous one
+        existing = self._rows
+        runs = []  # [insertion point, rows] in order
+        lo = 0
+        for key, row in keyed:
+            hi = len(existing)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                other = row_key(existing[mid])
+                if descending:
+                    before = other < key or (not after_equal and other == key)
+                else:
+                    before = other > key or (not after_equal and other == key)
+                if before:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            if runs and runs[-1][0] == lo:
+                runs[-1][1].append(row)
+            else:
+                runs.append([lo, [row]])
+
+        self._search_cache = {}
+        inserted = 0
+        for point, run in runs:
+            first = point + inserted
+            self.beginInsertRows(QModelIndex(), first, first + len(run) - 1)
+            existing[first:first] = run
+            self.endInsertRows()
+            inserted += len(run)
+
+
+class RowFilterProxyModel(QSortFilterProxyModel):
+    """
+    Keyword filter in front of a RowTableModel
+
+    Sorting is delegated to the source model, which sorts with Python keys
+    in one pass instead of one data() call per comparison.
+    """
+
+    def __init__(self, search_columns=(), parent=None):
+        """
+        Initialize filter proxy
+
+        Args:
+            search_columns (tuple): Column indexes matched against the keyword
+            parent: Optional parent QObject
+        """
+        super().__init__(parent)
+        self.search_columns = tuple(search_columns)
+        self._keyword = ""
+
+    def set_filter_text(self, text):
+        """
+        Show only rows containing the text (case-insensitive)
+
+        Args:
+            text (str): Keyword, empty to show all rows
+        """
+        keyword = text.strip().lower()
+        if keyword == self._keyword:
+            return
+        self._keyword = keyword
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        """Match the keyword against the row's searchable columns"""
+        if not self._keyword or not self.search_columns:
+            return True
+        return self._keyword in self.sourceModel().search_text(source_row, self.search_columns)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Sort the source model (the proxy keeps source order)"""
+        self.sourceModel().sort(column, order)
+
+    def row_data(self, index):
+        """
+        Get the raw row tuple behind a view index
+
+        Args:
+            index (QModelIndex): Index from the view (proxy index)
+
+        Returns:
+            tuple: Row from the query
+        """
+        return self.sourceModel().row_data(self.mapToSource(index).row())
@@ -1,31 +1,43 @@
 """
 Dialog windows for various operations
+
+Dialog modules are imported on first access (PEP 562), so importing one
+dialog does not load every other dialog and the services they use.
 """
 
-from .login_dialog import LoginDialog
-from .register_dialog import RegisterDialog
-from .supplier_information_dialog import SupplierInformationDialog
-from .customer_information_dialog import CustomerInformationDialog
-from .staff_information_dialog import StaffInformationDialog
-from .medicine_information_dialog import MedicineInformationDialog
-from .medicine_add_dialog import MedicineAddDialog
-from .invoice_information_dialog import InvoiceInformationDialog
-from .create_invoice_dialog import CreateInvoiceDialog
-from .stock_information_dialog import StockInformationDialog
-from .create_stock_dialog import CreateStockDialog
-from .report_dialog import ReportDialog
-
-__all__ = [
-    'LoginDialog',
-    'RegisterDialog',
-    'SupplierInformationDialog',
-    'CustomerInformationDialog',
-    'StaffInformationDialog',
-    'MedicineInformationDialog',
-    'MedicineAddDialog',
-    'InvoiceInformationDialog',
-    'CreateInvoiceDialog',
-    'StockInformationDialog',
-    'CreateStockDialog',
-    'ReportDialog',
-]
+import importlib
+
+
+# Class name -> module, imported when first used
+_DIALOGS = {
+    'LoginDialog': 'login_dialog',
+    'RegisterDialog': 'register_dialog',
+    'SupplierInformationDialog': 'supplier_information_dialog',
+    'CustomerInformationDialog': 'customer_information_dialog',
+    'StaffInformationDialog': 'staff_information_dialog',
+    'MedicineInformationDialog': 'medicine_information_dialog',
+    'MedicineAddDialog': 'medicine_add_dialog',
+    'InvoiceInformationDialog': 'invoice_information_dialog',
+    'MedicinePickerDialog': 'medicine_picker_dialog',
+    'CreateInvoiceDialog': 'create_invoice_dialog',
+    'StockInformationDialog': 'stock_information_dialog',
+    'CreateStockDialog': 'create_stock_dialog',
+    'ReportDialog': 'report_dialog',
+}
+
+__all__ = list(_DIALOGS)
+
+
+def __getattr__(name):
+    """Import a dialog class on first access"""
+    module = _DIALOGS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the lazily imported classes too"""
+    return sorted(set(globals()) | set(__all__))
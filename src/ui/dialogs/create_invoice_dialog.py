@@ -3,11 +3,13 @@ Create invoice dialog for creating new invoices
 """
 
 from PyQt6.QtWidgets import (
-    QTableWidgetItem, QPushButton, QInputDialog
+    QApplication, QTableWidgetItem, QPushButton, QInputDialog
 )
-from PyQt6.QtCore import QDate
+from PyQt6.QtCore import QDate, QTimer
 
 from src.ui.base import BaseDialog
+from src.ui.dialogs.medicine_picker_dialog import MedicinePickerDialog
+from src.services.invoice_service import InvoiceService, InsufficientStockError
 from src.utils.constants import MSG_SUCCESS_ADD, MSG_ERROR_ADD
 
 
@@ -19,6 +21,8 @@ class CreateInvoiceDialog(BaseDialog):
 
         self.invoice_id_param = invoice_id  # None for new, int for view/edit
         self.customer_id = None
+        self.customer_id_phone = None  # Phone that customer_id was resolved from
+        self.invoice_service = InvoiceService(context)
         self.medicine_list = []  # [(medicine_id, name, unit, sale_price, quantity, total_price)]
 
         # Set default values
@@ -34,9 +38,26 @@ class CreateInvoiceDialog(BaseDialog):
         # Load payment methods
         self.load_payment_methods()
 
+        # Scans only touch the cart list; the table is redrawn once the
+        # event loop is idle again, i.e. after the whole burst
+        self._cart_timer = QTimer(self)
+        self._cart_timer.setSingleShot(True)
+        self._cart_timer.setInterval(0)
+        self._cart_timer.timeout.connect(self._redraw_cart)
+
+        # Load the catalog, or pick up batches, barcodes and stock changed
+        # since it was last read, so scans see the current catalog
+        self.catalog = self.context.catalog_index
+        self.catalog.refresh_async(self.context.query_runner)
+
+        # The scanner ends every code with Enter, which must not press a button
+        for button in self.findChildren(QPushButton):
+            button.setAutoDefault(False)
+
         # Connect signals
         self.customer_phone.editingFinished.connect(self.lookup_customer)
         self.add_medicine.clicked.connect(self.show_add_medicine_dialog)
+        self.barcode_input.returnPressed.connect(self.handle_scan)
         self.add_medicine_2.clicked.connect(self.create_new_customer)
         self.save_button.clicked.connect(self.save_invoice)
         self.cancel_button.clicked.connect(self.reject)
@@ -44,19 +65,14 @@ class CreateInvoiceDialog(BaseDialog):
     def load_payment_methods(self):
         """Load payment methods into combo box"""
         try:
-            sql = """
-                SELECT payment_method_id, payment_name
-                FROM payment_method
-                WHERE payment_method_id IN (3, 4)
-                ORDER BY payment_name
-            """
-            self.db.execute(sql)
-            results = self.db.fetchall()
+            results = self.context.reference_cache.get('payment_methods')
 
             self.payment_term.clear()
             self.payment_methods_map = {}
 
             for pid, name in results:
+                if pid not in (3, 4):
+                    continue
                 self.payment_term.addItem(name, pid)
                 self.payment_methods_map[name] = pid
 
@@ -69,20 +85,21 @@ class CreateInvoiceDialog(BaseDialog):
 
         if not phone:
             self.customer_id = None
+            self.customer_id_phone = None
             self.label_6.setText("No customer phone entered")
             self.customer_phone.setStyleSheet("")
             return
 
         try:
-            self.db.execute(
+            result = self.db.fetch_one(
                 "SELECT customer_id, customer_name FROM customer WHERE customer_phone = %s",
                 (phone,)
             )
-            result = self.db.fetchone()
 
             if result:
                 # Customer found
                 self.customer_id = result[0]
+                self.customer_id_phone = phone
                 self.label_6.setText(f"{result[1]} ({phone})")
                 self.customer_phone.setStyleSheet("background-color: #eaffea;")
             else:
@@ -102,18 +119,12 @@ class CreateInvoiceDialog(BaseDialog):
         if ok and name.strip():
             try:
                 # Insert new customer
-                self.db.execute(
-                    "INSERT INTO customer (customer_name, customer_phone) VALUES (%s, %s)",
+                self.customer_id = self.db.fetch_one(
+                    "INSERT INTO customer (customer_name, customer_phone) VALUES (%s, %s) "
+                    "RETURNING customer_id",
                     (name.strip(), phone)
-                )
-                self.db.commit()
-
-                # Get new customer ID
-                self.db.execute(
-                    "SELECT customer_id FROM customer WHERE customer_phone = %s",
-                    (phone,)
-                )
-                self.customer_id = self.db.fetchone()[0]
+                )[0]
+                self.customer_id_phone = phone
 
                 self.label_6.setText(f"{name.strip()} ({phone})")
                 self.customer_phone.setStyleSheet("background-color: #eaffea;")
@@ -121,12 +132,13 @@ class CreateInvoiceDialog(BaseDialog):
                 self.show_success(f"Customer {name.strip()} added successfully")
 
             except Exception as e:
-                self.db.rollback()
                 self.show_error(f"Error adding customer: {e}")
                 self.customer_id = None
+                self.customer_id_phone = None
                 self.customer_phone.setStyleSheet("background-color: #ffeaea;")
         else:
             self.customer_id = None
+            self.customer_id_phone = None
             self.label_6.setText("Customer name required")
             self.customer_phone.setStyleSheet("background-color: #ffeaea;")
 
@@ -140,11 +152,10 @@ class CreateInvoiceDialog(BaseDialog):
 
         # Check if customer already exists
         try:
-            self.db.execute(
+            if self.db.fetch_one(
                 "SELECT customer_id FROM customer WHERE customer_phone = %s",
                 (phone,)
-            )
-            if self.db.fetchone():
+            ):
                 self.show_warning("This phone number already exists")
                 return
 
@@ -154,18 +165,12 @@ class CreateInvoiceDialog(BaseDialog):
             )
 
             if ok and name.strip():
-                self.db.execute(
-                    "INSERT INTO customer (customer_name, customer_phone) VALUES (%s, %s)",
+                self.customer_id = self.db.fetch_one(
+                    "INSERT INTO customer (customer_name, customer_phone) VALUES (%s, %s) "
+                    "RETURNING customer_id",
                     (name.strip(), phone)
-                )
-                self.db.commit()
-
-                # Get new customer ID
-                self.db.execute(
-                    "SELECT customer_id FROM customer WHERE customer_phone = %s",
-                    (phone,)
-                )
-                self.customer_id = self.db.fetchone()[0]
+                )[0]
+                self.customer_id_phone = phone
 
                 self.label_6.setText(f"{name.strip()} ({phone})")
                 self.customer_phone.setStyleSheet("background-color: #eaffea;")
@@ -173,72 +178,100 @@ class CreateInvoiceDialog(BaseDialog):
                 self.show_success(f"Customer {name.strip()} added successfully")
 
         except Exception as e:
-            self.db.rollback()
             self.show_error(f"Error adding customer: {e}")
 
     def show_add_medicine_dialog(self):
-        """Show dialog to select and add medicine to cart"""
-        try:
-            # Get available medicines
-            self.db.execute(
-                """SELECT medicine_id, medicine_name, unit, sale_price, stock_quantity
-                   FROM medicine WHERE stock_quantity > 0
-                   ORDER BY medicine_name"""
-            )
-            meds = self.db.fetchall()
-
-            if not meds:
-                self.show_warning("No medicines in stock")
-                return
-
-            # Create selection list
-            med_names = [
-                f"{row[1]} ({row[2]}) - Price: {row[3]} - Stock: {row[4]}"
-                for row in meds
-            ]
+        """Show the type-ahead picker and add the chosen medicine to cart"""
+        in_cart = {med[0]: med[4] for med in self.medicine_list}
+        picker = MedicinePickerDialog(self.context, in_cart, self)
+        if not picker.exec() or picker.selected is None:
+            return
 
-            # Show selection dialog
-            idx, ok = QInputDialog.getItem(
-                self, "Select Medicine", "Choose medicine:", med_names, 0, False
-            )
+        entry, qty = picker.selected
+        self.add_to_cart(entry, qty)
+
+    def add_to_cart(self, entry, qty):
+        """
+        Add a catalog entry to the cart, merging with an existing line
+
+        Stock is checked against the in-memory catalog here and verified
+        again by the atomic commit in save_invoice().
+
+        Args:
+            entry (CatalogEntry): Medicine from the catalog index
+            qty (int): Quantity to add
+
+        Returns:
+            bool: True if the cart changed
+        """
+        error = self._merge_into_cart(entry, qty)
+        if error:
+            self.show_warning(error)
+            return False
+
+        self.refresh_medicine_table()
+        self.update_total()
+        return True
+
+    def handle_scan(self):
+        """
+        Add one unit of the scanned batch to the cart
+
+        Scanners type the code and press Enter faster than a person can, so
+        each scan is a dict lookup in the resident catalog and the table is
+        redrawn once the burst of scans has been processed. Unknown codes and
+        stock shortfalls are flagged in the scan box instead of a modal
+        dialog, which would swallow the following scans.
+        """
+        code = self.barcode_input.text().strip()
+        self.barcode_input.clear()
+        if not code:
+            return
 
-            if ok and idx:
-                med = meds[med_names.index(idx)]
+        entry = self.catalog.by_barcode(code)
+        error = (f"Unknown barcode {code}" if entry is None
+                 else self._merge_into_cart(entry, 1))
+        if error:
+            QApplication.beep()
+            self.barcode_input.setPlaceholderText(error)
+            self.barcode_input.setStyleSheet("QLineEdit { border: 1px solid red; }")
+            return
 
-                # Get quantity
-                qty, ok2 = QInputDialog.getInt(
-                    self, "Quantity",
-                    f"Enter quantity (1 - {med[4]}):",
-                    1, 1, med[4]
+        self.barcode_input.setPlaceholderText(f"{entry.medicine_name} +1")
+        self.barcode_input.setStyleSheet("")
+        self._cart_timer.start()
+
+    def _merge_into_cart(self, entry, qty):
+        """
+        Add quantity to the cart list without redrawing the table
+
+        Returns:
+            str: Reason the line was rejected, or None if it was added
+        """
+        for i, m in enumerate(self.medicine_list):
+            if m[0] == entry.medicine_id:
+                # Update quantity
+                new_qty = m[4] + qty
+                if new_qty > entry.stock_quantity:
+                    return f"Total quantity exceeds stock ({entry.stock_quantity})"
+                self.medicine_list[i] = (
+                    m[0], m[1], m[2], m[3], new_qty, m[3] * new_qty
                 )
-
-                if ok2:
-                    # Check if medicine already in cart
-                    existed = False
-                    for i, m in enumerate(self.medicine_list):
-                        if m[0] == med[0]:
-                            # Update quantity
-                            new_qty = m[4] + qty
-                            if new_qty > med[4]:
-                                self.show_warning(f"Total quantity exceeds stock ({med[4]})")
-                                return
-                            self.medicine_list[i] = (
-                                m[0], m[1], m[2], m[3], new_qty, m[3] * new_qty
-                            )
-                            existed = True
-                            break
-
-                    if not existed:
-                        # Add new medicine to cart
-                        self.medicine_list.append((
-                            med[0], med[1], med[2], med[3], qty, med[3] * qty
-                        ))
-
-                    self.refresh_medicine_table()
-                    self.update_total()
-
-        except Exception as e:
-            self.show_error(f"Error adding medicine: {e}")
+                return None
+
+        if qty > entry.stock_quantity:
+            return f"Quantity exceeds stock ({entry.stock_quantity})"
+        # Add new medicine to cart
+        self.medicine_list.append((
+            entry.medicine_id, entry.medicine_name, entry.unit,
+            entry.sale_price, qty, entry.sale_price * qty
+        ))
+        return None
+
+    def _redraw_cart(self):
+        """Redraw the cart after a burst of scans"""
+        self.refresh_medicine_table()
+        self.update_total()
 
     def refresh_medicine_table(self):
         """Refresh medicine table display"""
@@ -260,6 +293,7 @@ class CreateInvoiceDialog(BaseDialog):
 
             # Add delete button
             btn = QPushButton("Delete")
+            btn.setAutoDefault(False)
             btn.clicked.connect(lambda _, row=i: self.remove_medicine_row(row))
             self.buy_list.setCellWidget(i, 6, btn)
 
@@ -276,63 +310,57 @@ class CreateInvoiceDialog(BaseDialog):
         self.sum_money.setText(str(total))
 
     def save_invoice(self):
-        """Save invoice to database"""
-        try:
-            # Validate customer
+        """Save invoice, its details and the stock decrement in one transaction"""
+        # Only look the customer up again if the phone changed since the last lookup
+        if self.customer_phone.text().strip() != self.customer_id_phone:
             self.lookup_customer()
 
-            if not self.customer_id:
-                self.show_warning("Please select a customer")
-                return
+        if not self.customer_id:
+            self.show_warning("Please select a customer")
+            return
 
-            if not self.medicine_list:
-                self.show_warning("Please add at least one medicine")
-                return
+        if not self.medicine_list:
+            self.show_warning("Please add at least one medicine")
+            return
 
-            # Get form data
-            payment_method_id = self.payment_term.currentData()
-            invoice_date = self.invoice_date.date().toString("yyyy-MM-dd")
-            staff_id = self.context.staff_id
-            total = self.sum_money.text()
-
-            # Insert invoice
-            sql = """
-                INSERT INTO invoice (invoice_date, customer_id, staff_id,
-                                    total_amount, payment_method_id, payment_status)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            self.db.execute(sql, (
-                invoice_date, self.customer_id, staff_id,
-                total, payment_method_id, "Đã thanh toán"
-            ))
-            self.db.commit()
-
-            # Get invoice ID (PostgreSQL)
-            self.db.execute("SELECT lastval()")
-            invoice_id = self.db.fetchone()[0]
-
-            # Insert invoice details and update stock
-            for med in self.medicine_list:
-                # Insert detail
-                self.db.execute(
-                    """INSERT INTO invoice_detail (invoice_id, medicine_id, quantity,
-                                                   sale_price, total_price)
-                       VALUES (%s, %s, %s, %s, %s)""",
-                    (invoice_id, med[0], med[4], med[3], med[5])
-                )
+        # Get form data
+        payment_method_id = self.payment_term.currentData()
+        invoice_date = self.invoice_date.date().toString("yyyy-MM-dd")
+        staff_id = self.context.staff_id
+        lines = [(med[0], med[4], med[3]) for med in self.medicine_list]
 
-                # Update stock
-                self.db.execute(
-                    "UPDATE medicine SET stock_quantity = stock_quantity - %s WHERE medicine_id = %s",
-                    (med[4], med[0])
+        try:
+            invoice_id, total = self.invoice_service.commit_invoice(
+                self.customer_id, staff_id, payment_method_id, invoice_date, lines
+            )
+        except InsufficientStockError as e:
+            # A batch deleted since the last catalog refresh is reported as short too
+            try:
+                deleted = self.catalog.evict_missing(e.medicine_ids)
+            except Exception as lookup_error:
+                print(f"❌ Catalog eviction failed: {lookup_error}")
+                deleted = set()
+            # Stock was sold elsewhere: re-read it before the cart is adjusted
+            self.catalog.refresh_async(self.context.query_runner)
+            if deleted:
+                names = [med[1] for med in self.medicine_list if med[0] in deleted]
+                self.show_warning(
+                    "No longer in the catalog: " + ", ".join(names) +
+                    "\nThese medicines were deleted. Please remove them from the invoice."
                 )
-
-            self.db.commit()
-
-            self.log_action(f"Created invoice: {invoice_id} (Customer: {self.customer_id}, Total: {total})")
-            self.show_success(f"{MSG_SUCCESS_ADD} - Invoice #{invoice_id}")
-            self.accept()
-
+                return
+            names = [med[1] for med in self.medicine_list if med[0] in e.medicine_ids]
+            self.show_warning(
+                "Not enough stock for: " + ", ".join(names) +
+                "\nStock may have been sold from another counter. Please adjust the quantities."
+            )
+            return
         except Exception as e:
-            self.db.rollback()
             self.show_error(f"{MSG_ERROR_ADD}: {e}")
+            return
+
+        # The sale changed stock; the next invoice should see it
+        self.catalog.refresh_async(self.context.query_runner)
+        self.log_action(f"Created invoice: {invoice_id} (Customer: {self.customer_id}, Total: {total})")
+        self.show_success(f"{MSG_SUCCESS_ADD} - Invoice #{invoice_id}")
+        self.accept()
@@ -10,6 +10,7 @@ from PyQt6.QtCore import Qt, QDate
 
 from src.ui.base import BaseDialog
 from src.ui.dialogs.medicine_add_dialog import MedicineAddDialog
+from src.services.stock_service import StockService
 from src.utils.constants import MSG_SUCCESS_ADD, MSG_ERROR_ADD
 
 
@@ -19,6 +20,8 @@ class CreateStockDialog(BaseDialog):
     def __init__(self, context, parent=None):
         super().__init__(context, 'create_stock.ui', 'Create Stock Entry', parent)
 
+        self.stock_service = StockService(context)
+
         # Initialize default values
         self.stock_date.setDate(QDate.currentDate())
         self.staff_name.setText(str(self.context.staff_id))
@@ -49,9 +52,7 @@ class CreateStockDialog(BaseDialog):
     def load_supplier_list(self):
         """Load supplier list into combo box"""
         try:
-            sql = "SELECT supplier_id, supplier_name FROM supplier ORDER BY supplier_name"
-            self.db.execute(sql)
-            results = self.db.fetchall()
+            results = self.context.reference_cache.get('suppliers')
 
             self.supplier_map = {}
             self.supplier.clear()
@@ -66,19 +67,14 @@ class CreateStockDialog(BaseDialog):
     def load_payment_methods(self):
         """Load payment methods into combo box"""
         try:
-            sql = """
-                SELECT payment_method_id, payment_name
-                FROM payment_method
-                WHERE payment_name IN ('COD', 'prepayment')
-                ORDER BY payment_name
-            """
-            self.db.execute(sql)
-            results = self.db.fetchall()
+            results = self.context.reference_cache.get('payment_methods')
 
             self.payment_method_map = {}
             self.payment_term.clear()
 
             for payment_method_id, payment_name in results:
+                if payment_name not in ('COD', 'prepayment'):
+                    continue
                 self.payment_term.addItem(payment_name)
                 self.payment_method_map[payment_name] = payment_method_id
 
@@ -88,9 +84,7 @@ class CreateStockDialog(BaseDialog):
     def load_medicine_name_list(self):
         """Load medicine names for combo boxes"""
         try:
-            sql = "SELECT DISTINCT medicine_name FROM medicine ORDER BY medicine_name"
-            self.db.execute(sql)
-            results = self.db.fetchall()
+            results = self.context.reference_cache.get('medicine_names')
 
             self.medicine_names = [row[0] for row in results] if results else []
 
@@ -190,141 +184,74 @@ class CreateStockDialog(BaseDialog):
             sale_item.setText(str(sale_price))
             self.update_sum_money()
 
-    def insert_stock(self, supplier_id, staff_id, payment_method_id, stock_date):
-        """Insert new stock entry and return stock_id"""
-        sql = """
-            INSERT INTO stock (supplier_id, staff_id, payment_method_id, created_at)
-            VALUES (%s, %s, %s, %s)
+    def collect_lines(self):
         """
-        self.db.execute(sql, (supplier_id, staff_id, payment_method_id, stock_date))
-        self.db.commit()
-
-        # Get last insert ID (PostgreSQL)
-        self.db.execute("SELECT lastval()")
-        stock_id = self.db.fetchone()[0]
-        return stock_id
-
-    def insert_or_update_medicine(self, medicine_name, supplier_id, quantity,
-                                   price, sale_price, batch, exp_date):
-        """Insert new medicine or update existing one"""
-        # Check if medicine with same name and batch exists
-        self.db.execute(
-            "SELECT medicine_id FROM medicine WHERE medicine_name = %s AND batch_number = %s",
-            (medicine_name, batch)
-        )
-        med_exist = self.db.fetchone()
-
-        if med_exist:
-            # Update existing medicine
-            medicine_id = med_exist[0]
-            sql = """
-                UPDATE medicine SET
-                    stock_quantity = stock_quantity + %s,
-                    unit_price = %s,
-                    sale_price = %s,
-                    expiration_date = %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE medicine_id = %s
-            """
-            self.db.execute(sql, (quantity, price, sale_price, exp_date, medicine_id))
-            self.db.commit()
-        else:
-            # Insert new medicine
-            sql = """
-                INSERT INTO medicine (medicine_name, supplier_id, stock_quantity,
-                                     unit_price, sale_price, batch_number, expiration_date)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            self.db.execute(sql, (medicine_name, supplier_id, quantity,
-                                 price, sale_price, batch, exp_date))
-            self.db.commit()
-
-            # Get last insert ID
-            self.db.execute("SELECT lastval()")
-            medicine_id = self.db.fetchone()[0]
-
-        return medicine_id
-
-    def insert_stock_detail(self, stock_id, medicine_id, quantity, price,
-                           batch, exp_date, note=""):
-        """Insert stock detail record"""
-        sql = """
-            INSERT INTO stock_detail (stock_id, medicine_id, quantity, price,
-                                     batch_number, expiration_date, note)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        self.db.execute(sql, (stock_id, medicine_id, quantity, price, batch, exp_date, note))
-        self.db.commit()
-
-    def save_stock(self):
-        """Save stock entry to database"""
-        try:
-            staff_id = self.context.staff_id
-            supplier_name = self.supplier.currentText()
-            supplier_id = self.supplier_map.get(supplier_name)
-            payment_name = self.payment_term.currentText()
-            payment_method_id = self.payment_method_map.get(payment_name)
-            stock_date = self.stock_date.date().toString("yyyy-MM-dd")
-
-            # Validate
-            if not supplier_id:
-                self.show_warning("Please select a valid supplier")
-                return
-
-            if not payment_method_id:
-                self.show_warning("Please select a valid payment method")
-                return
-
-            # Insert stock entry
-            stock_id = self.insert_stock(supplier_id, staff_id, payment_method_id, stock_date)
-
-            # Process each medicine row
-            medicines = []
-            for row in range(self.buy_list.rowCount()):
-                combo = self.buy_list.cellWidget(row, 0)
-                medicine_name = combo.currentText().strip() if combo else ""
+        Read valid medicine rows from the table
 
-                spin_price = self.buy_list.cellWidget(row, 1)
-                price = spin_price.value() if spin_price else 0
+        Returns:
+            list: (medicine_name, quantity, price, sale_price, batch, exp_date) tuples
+        """
+        lines = []
+        for row in range(self.buy_list.rowCount()):
+            combo = self.buy_list.cellWidget(row, 0)
+            medicine_name = combo.currentText().strip() if combo else ""
 
-                sale_item = self.buy_list.item(row, 2)
-                sale_price = float(sale_item.text()) if sale_item and sale_item.text() else round(price * 1.2, 2)
+            spin_price = self.buy_list.cellWidget(row, 1)
+            price = spin_price.value() if spin_price else 0
 
-                spin_quantity = self.buy_list.cellWidget(row, 3)
-                quantity = spin_quantity.value() if spin_quantity else 0
+            sale_item = self.buy_list.item(row, 2)
+            sale_price = float(sale_item.text()) if sale_item and sale_item.text() else round(price * 1.2, 2)
 
-                batch_item = self.buy_list.item(row, 4)
-                batch = batch_item.text().strip() if batch_item else ""
+            spin_quantity = self.buy_list.cellWidget(row, 3)
+            quantity = spin_quantity.value() if spin_quantity else 0
 
-                exp_widget = self.buy_list.cellWidget(row, 5)
-                exp_date = exp_widget.date().toString("yyyy-MM-dd") if exp_widget else None
+            batch_item = self.buy_list.item(row, 4)
+            batch = batch_item.text().strip() if batch_item else ""
 
-                # Skip invalid rows
-                if not medicine_name or quantity <= 0:
-                    continue
+            exp_widget = self.buy_list.cellWidget(row, 5)
+            exp_date = exp_widget.date().toString("yyyy-MM-dd") if exp_widget else None
 
-                # Insert or update medicine
-                medicine_id = self.insert_or_update_medicine(
-                    medicine_name, supplier_id, quantity, price, sale_price, batch, exp_date
-                )
-                medicines.append((medicine_id, quantity, price, batch, exp_date))
+            # Skip invalid rows
+            if not medicine_name or quantity <= 0:
+                continue
 
-            # Validate at least one medicine
-            if not medicines:
-                # Delete the stock entry if no medicines
-                self.db.execute("DELETE FROM stock WHERE stock_id = %s", (stock_id,))
-                self.db.commit()
-                self.show_warning("Please add at least one valid medicine")
-                return
+            lines.append((medicine_name, quantity, price, sale_price, batch, exp_date))
 
-            # Insert stock details
-            for medicine_id, quantity, price, batch, exp_date in medicines:
-                self.insert_stock_detail(stock_id, medicine_id, quantity, price, batch, exp_date)
+        return lines
 
-            self.log_action(f"Created stock entry: {stock_id}")
-            self.show_success(MSG_SUCCESS_ADD)
-            self.accept()
+    def save_stock(self):
+        """Save stock entry, medicine batches and stock details in one transaction"""
+        staff_id = self.context.staff_id
+        supplier_name = self.supplier.currentText()
+        supplier_id = self.supplier_map.get(supplier_name)
+        payment_name = self.payment_term.currentText()
+        payment_method_id = self.payment_method_map.get(payment_name)
+        stock_date = self.stock_date.date().toString("yyyy-MM-dd")
+
+        # Validate
+        if not supplier_id:
+            self.show_warning("Please select a valid supplier")
+            return
+
+        if not payment_method_id:
+            self.show_warning("Please select a valid payment method")
+            return
+
+        lines = self.collect_lines()
+        if not lines:
+            self.show_warning("Please add at least one valid medicine")
+            return
 
+        try:
+            stock_id, _, _ = self.stock_service.receive_stock(
+                supplier_id, staff_id, payment_method_id, stock_date, lines
+            )
         except Exception as e:
-            self.db.rollback()
             self.show_error(f"{MSG_ERROR_ADD}: {e}")
+            return
+
+        # New batches may have added medicine names
+        self.context.reference_cache.invalidate('medicine_names')
+        self.log_action(f"Created stock entry: {stock_id}")
+        self.show_success(MSG_SUCCESS_ADD)
+        self.accept()
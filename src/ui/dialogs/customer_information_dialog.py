@@ -38,8 +38,7 @@ class CustomerInformationDialog(BaseDialog):
                 FROM customer
                 WHERE customer_id = %s
             """
-            self.db.execute(sql, (self.customer_id_value,))
-            result = self.db.fetchone()
+            result = self.db.fetch_one(sql, (self.customer_id_value,))
 
             if result:
                 self.customer_id.setText(str(result[0]))
@@ -119,14 +118,13 @@ class CustomerInformationDialog(BaseDialog):
                 self.customer_id.text()
             )
 
-            self.db.execute(sql, values)
-            self.db.commit()
+            with self.db.transaction() as cur:
+                cur.execute(sql, values)
 
             self.log_action(f"Updated customer: {self.customer_id.text()}")
             self.show_success(MSG_SUCCESS_UPDATE)
 
         except Exception as e:
-            self.db.rollback()
             self.show_error(f"{MSG_ERROR_UPDATE}: {e}")
             self.edit_mode = True
             self.edit_button.setText("💾 Save")
@@ -136,13 +134,12 @@ class CustomerInformationDialog(BaseDialog):
         if self.confirm_action("Delete this customer?"):
             try:
                 sql = "DELETE FROM customer WHERE customer_id = %s"
-                self.db.execute(sql, (self.customer_id_value,))
-                self.db.commit()
+                with self.db.transaction() as cur:
+                    cur.execute(sql, (self.customer_id_value,))
 
                 self.log_action(f"Deleted customer: {self.customer_id_value}")
                 self.show_success(MSG_SUCCESS_DELETE)
                 self.accept()
 
             except Exception as e:
-                self.db.rollback()
                 self.show_error(f"Error deleting customer: {e}")
@@ -4,6 +4,7 @@ Invoice information dialog (view-only)
 
 from PyQt6.QtWidgets import QTableWidgetItem, QTableWidget
 
+from src.core.query_recorder import query_budget
 from src.ui.base import BaseDialog
 
 
@@ -27,6 +28,7 @@ class InvoiceInformationDialog(BaseDialog):
         self.cancel_button.setText("Close")
         self.add_medicine.setDisabled(True)
         self.add_medicine_2.setDisabled(True)
+        self.barcode_input.setDisabled(True)
         self.customer_phone.setReadOnly(True)
         self.staff_name.setReadOnly(True)
         self.invoice_date.setReadOnly(True)
@@ -35,53 +37,50 @@ class InvoiceInformationDialog(BaseDialog):
         self.buy_list.setSelectionMode(QTableWidget.SelectionMode.NoSelection)
         self.cancel_button.clicked.connect(self.accept)
 
+    @query_budget(1, "open invoice detail")
     def load_data(self):
-        """Load invoice data from database"""
+        """Load invoice, customer and lines in one query"""
         try:
-            # Load invoice info
+            # One row per invoice line (a single row with NULL line columns
+            # when the invoice has none)
             sql = """
-                SELECT invoice_id, invoice_date, customer_id, staff_id,
-                       total_amount, payment_method_id, payment_status
-                FROM invoice
-                WHERE invoice_id = %s
+                SELECT i.invoice_id, i.invoice_date, i.staff_id, i.total_amount,
+                       i.payment_method_id, p.payment_name,
+                       c.customer_name, c.customer_phone,
+                       d.invoice_detail_id, m.medicine_id, m.medicine_name, m.unit,
+                       d.sale_price, d.quantity, d.total_price
+                FROM invoice i
+                LEFT JOIN payment_method p ON p.payment_method_id = i.payment_method_id
+                LEFT JOIN customer c ON c.customer_id = i.customer_id
+                LEFT JOIN invoice_detail d ON d.invoice_id = i.invoice_id
+                LEFT JOIN medicine m ON m.medicine_id = d.medicine_id
+                WHERE i.invoice_id = %s
+                ORDER BY d.invoice_detail_id
             """
-            self.db.execute(sql, (int(self.invoice_id_value),))
-            invoice_info = self.db.fetchone()
+            rows = self.db.fetch_all(sql, (int(self.invoice_id_value),))
 
-            if not invoice_info:
+            if not rows:
                 self.show_warning("Invoice not found")
                 self.reject()
                 return
 
             # Set invoice fields
+            invoice_info = rows[0]
             self.invoice_id.setText(str(invoice_info[0]))
             self.invoice_date.setDate(invoice_info[1])
-            self.staff_name.setText(str(invoice_info[3]))
-            self.sum_money.setText(str(invoice_info[4]))
-            self.payment_term.setCurrentIndex(
-                self.payment_term.findData(invoice_info[5])
-            )
-
-            # Load customer info
-            self.db.execute(
-                "SELECT customer_name, customer_phone FROM customer WHERE customer_id = %s",
-                (invoice_info[2],)
-            )
-            cinfo = self.db.fetchone()
-            if cinfo:
-                self.customer_phone.setText(cinfo[1])
-                self.label_6.setText(f"{cinfo[0]} ({cinfo[1]})")
-
-            # Load invoice details (medicines)
-            sql = """
-                SELECT m.medicine_id, m.medicine_name, m.unit,
-                       d.sale_price, d.quantity, d.total_price
-                FROM invoice_detail d
-                JOIN medicine m ON d.medicine_id = m.medicine_id
-                WHERE d.invoice_id = %s
-            """
-            self.db.execute(sql, (invoice_info[0],))
-            meds = self.db.fetchall()
+            self.staff_name.setText(str(invoice_info[2]))
+            self.sum_money.setText(str(invoice_info[3]))
+            self.payment_term.clear()
+            if invoice_info[4] is not None:
+                self.payment_term.addItem(str(invoice_info[5]), invoice_info[4])
+
+            # Set customer info
+            if invoice_info[7] is not None:
+                self.customer_phone.setText(invoice_info[7])
+                self.label_6.setText(f"{invoice_info[6]} ({invoice_info[7]})")
+
+            # Invoice details (medicines)
+            meds = [row[9:] for row in rows if row[8] is not None]
 
             # Configure table
             self.buy_list.setRowCount(len(meds))
@@ -13,7 +13,13 @@ from src.utils.constants import MSG_LOGIN_SUCCESS, MSG_LOGIN_FAILED
 
 
 class LoginDialog(BaseDialog):
-    """Login dialog for user authentication"""
+    """
+    Login dialog for user authentication
+
+    Shown while the database is still connecting: a login waits for the
+    connection, and the lookup and bcrypt checks run on a worker thread so
+    the dialog stays responsive.
+    """
 
     def __init__(self, context):
         """
@@ -24,8 +30,6 @@ class LoginDialog(BaseDialog):
         """
         super().__init__(context, 'login.ui', 'MediManager - Login')
 
-        self.main_window = None
-
         # Setup UI
         self.setFixedSize(250, 110)
 
@@ -33,6 +37,9 @@ class LoginDialog(BaseDialog):
         self.register_label.linkActivated.connect(self.goto_register)
         self.login_button.clicked.connect(self.login)
         self.login_button.setDefault(True)
+        self._login_text = self.login_button.text()
+        self._login_task = None
+        self._awaiting_connection = False
 
         # Setup password field
         self._setup_password_field()
@@ -65,6 +72,9 @@ class LoginDialog(BaseDialog):
 
     def login(self):
         """Handle login button click"""
+        if self._login_task is not None or self._awaiting_connection:
+            return
+
         username = self.login_user.text().strip()
         password = self.login_password.text()
 
@@ -73,31 +83,94 @@ class LoginDialog(BaseDialog):
             self.show_warning("Please enter username and password")
             return
 
-        try:
-            # Query user from database
-            sql = 'SELECT staff_id, staff_psw FROM staff WHERE staff_id = %s'
-            self.db.execute(sql, (username,))
-            result = self.db.fetchone()
+        # Log in once the background connection is ready
+        if not self.context.ready:
+            self._awaiting_connection = True
+            self._set_busy("Connecting...")
+            self.context.when_ready(self._on_connected, self._on_connect_failed)
+            return
+
+        self._set_busy("Signing in...")
+        # Without a task connection: _authenticate holds a pooled connection
+        # only for its queries, not while bcrypt hashes
+        self._login_task = self.context.query_runner.submit_call(
+            lambda _conn: self._authenticate(username, password),
+            on_result=self._on_authenticated,
+            on_error=self._on_login_failed,
+            use_connection=False
+        )
+
+    def _authenticate(self, username, password):
+        """
+        Look up the user and check the password (runs on a worker thread)
 
-            if not result:
-                self.show_warning(MSG_LOGIN_FAILED)
-                return
+        Args:
+            username: Staff ID entered
+            password: Password entered
 
-            staff_id, stored_password = result
-            login_success = self._verify_password(password, stored_password, staff_id)
+        Returns:
+            str: Staff ID if the credentials are valid, otherwise None
+        """
+        sql = 'SELECT staff_id, staff_psw FROM staff WHERE staff_id = %s'
+        with self.db.pooled_cursor() as cur:
+            cur.execute(sql, (username,))
+            result = cur.fetchone()
+
+        if not result:
+            return None
+
+        staff_id, stored_password = result
+        if self._verify_password(password, stored_password, staff_id):
+            return staff_id
+        return None
+
+    def _on_authenticated(self, staff_id):
+        """Finish a login once the credentials were checked"""
+        self._login_task = None
+        self._set_busy(None)
+        if staff_id:
+            self._handle_successful_login(staff_id)
+        else:
+            self.show_warning(MSG_LOGIN_FAILED)
+
+    def _on_login_failed(self, error):
+        """Report an error from the credential check"""
+        self._login_task = None
+        self._set_busy(None)
+        self.show_error(f"Login error: {str(error)}")
+
+    def _on_connected(self):
+        """Continue the login that was waiting for the database"""
+        if not self._awaiting_connection:
+            return  # Dialog closed meanwhile
+        self._awaiting_connection = False
+        self._set_busy(None)
+        self.login()
+
+    def _on_connect_failed(self, error):
+        """Give the login button back; the next attempt reconnects"""
+        if not self._awaiting_connection:
+            return
+        self._awaiting_connection = False
+        self._set_busy(None)
+        self.show_error(f"Cannot connect to database: {str(error)}")
 
-            if login_success:
-                self._handle_successful_login(staff_id)
-            else:
-                self.show_warning(MSG_LOGIN_FAILED)
+    def _set_busy(self, text):
+        """
+        Disable the login button while a login is in progress
 
-        except Exception as e:
-            self.show_error(f"Login error: {str(e)}")
+        Args:
+            text (str): Button text while busy, None to restore the button
+        """
+        self.login_button.setEnabled(text is None)
+        self.login_button.setText(text or self._login_text)
 
     def _verify_password(self, input_password, stored_password, staff_id):
         """
         Verify password with bcrypt, with fallback for legacy passwords
 
+        Runs on a worker thread: bcrypt is deliberately slow.
+
         Args:
             input_password: User input password
             stored_password: Stored password hash
@@ -121,7 +194,7 @@ class LoginDialog(BaseDialog):
 
     def _upgrade_password(self, staff_id, plain_password):
         """
-        Upgrade legacy plain-text password to bcrypt hash
+        Upgrade legacy plain-text password to bcrypt hash (on a worker thread)
 
         Args:
             staff_id: Staff ID
@@ -129,11 +202,11 @@ class LoginDialog(BaseDialog):
         """
         try:
             new_hash = bcrypt.hashpw(plain_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-            self.db.execute(
-                "UPDATE staff SET staff_psw = %s WHERE staff_id = %s",
-                (new_hash, staff_id)
-            )
-            self.db.commit()
+            with self.db.pooled_cursor() as cur:
+                cur.execute(
+                    "UPDATE staff SET staff_psw = %s WHERE staff_id = %s",
+                    (new_hash, staff_id)
+                )
             print(f"Auto-upgraded password for user: {staff_id}")
         except Exception as e:
             print(f"Failed to upgrade password: {e}")
@@ -155,9 +228,7 @@ class LoginDialog(BaseDialog):
         self.show_success(MSG_LOGIN_SUCCESS)
 
         # Open main window
-        from src.ui.windows.main_window import MainWindow
-        self.main_window = MainWindow(self.context)
-        self.main_window.show()
+        self.context.navigator.show('main')
 
         # Close login dialog
         self.close()
@@ -200,3 +271,11 @@ class LoginDialog(BaseDialog):
         self.register_window = RegisterDialog(self.context)
         self.register_window.show()
         self.close()
+
+    def closeEvent(self, event):
+        """Drop a login still waiting or in progress"""
+        self._awaiting_connection = False
+        if self._login_task is not None:
+            self._login_task.cancel()
+            self._login_task = None
+        super().closeEvent(event)
@@ -15,6 +15,7 @@ class MedicineAddDialog(BaseDialog):
         super().__init__(context, 'medicine_information_add.ui', 'Add New Medicine', parent)
 
         # Initialize category combo
+        self.category_map = {}
         self.init_category_combo()
 
         # Connect save/cancel buttons
@@ -29,13 +30,14 @@ class MedicineAddDialog(BaseDialog):
     def init_category_combo(self):
         """Initialize category combo box with data from database"""
         try:
-            sql = "SELECT DISTINCT category_name FROM category ORDER BY category_name"
-            self.db.execute(sql)
-            results = self.db.fetchall()
+            results = self.context.reference_cache.get('categories')
 
+            self.category_map = {}
             self.comboBox.clear()
-            for row in results:
-                self.comboBox.addItem(row[0])
+            for category_id, category_name in results:
+                if category_name not in self.category_map:
+                    self.comboBox.addItem(category_name)
+                    self.category_map[category_name] = category_id
 
         except Exception as e:
             self.show_error(f"Error loading categories: {e}")
@@ -62,11 +64,7 @@ class MedicineAddDialog(BaseDialog):
             generic_name = self.generic_name.text().strip()
             category = self.comboBox.currentText().strip()
 
-            # Get category_id from category name
-            sql = "SELECT category_id FROM category WHERE category_name = %s"
-            self.db.execute(sql, (category,))
-            result = self.db.fetchone()
-            category_id = result[0] if result else None
+            category_id = self.category_map.get(category)
 
             if not category_id:
                 self.show_warning("Invalid category selected")
@@ -77,13 +75,13 @@ class MedicineAddDialog(BaseDialog):
                 INSERT INTO medicine (medicine_name, generic_name, category_id)
                 VALUES (%s, %s, %s)
             """
-            self.db.execute(sql_insert, (name, generic_name, category_id))
-            self.db.commit()
+            with self.db.transaction() as cur:
+                cur.execute(sql_insert, (name, generic_name, category_id))
+            self.context.reference_cache.invalidate('medicine_names')
 
             self.log_action(f"Added new medicine: {name}")
             self.show_success(MSG_SUCCESS_ADD)
             self.accept()
 
         except Exception as e:
-            self.db.rollback()
             self.show_error(f"{MSG_ERROR_ADD}: {e}")
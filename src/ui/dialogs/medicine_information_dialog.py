@@ -36,14 +36,13 @@ class MedicineInformationDialog(BaseDialog):
                 SELECT m.medicine_id, m.medicine_name, m.generic_name,
                        c.category_name, s.supplier_name,
                        m.batch_number, m.expiration_date, m.stock_quantity,
-                       m.unit_price, m.sale_price
+                       m.unit_price, m.sale_price, m.barcode
                 FROM medicine m
                 JOIN category c ON m.category_id = c.category_id
                 JOIN supplier s ON m.supplier_id = s.supplier_id
                 WHERE m.medicine_id = %s
             """
-            self.db.execute(sql, (self.medicine_id_value,))
-            result = self.db.fetchone()
+            result = self.db.fetch_one(sql, (self.medicine_id_value,))
 
             if result:
                 # Set form fields
@@ -62,6 +61,7 @@ class MedicineInformationDialog(BaseDialog):
                 self.stock_quantity.setValue(result[7] or 0)
                 self.unit_price.setValue(float(result[8]) if result[8] else 0.0)
                 self.sale_price.setValue(float(result[9]) if result[9] else 0.0)
+                self.barcode.setText(result[10] or "")
 
                 # Set all fields to read-only initially
                 self.set_fields_editable(False)
@@ -79,6 +79,7 @@ class MedicineInformationDialog(BaseDialog):
         self.category_name.setReadOnly(True)   # Always read-only
         self.supplier_name.setReadOnly(True)   # Always read-only
         self.batch_number.setReadOnly(not editable)
+        self.barcode.setReadOnly(not editable)
 
         self.expiration_date.setEnabled(editable)
         self.stock_quantity.setEnabled(editable)
@@ -97,6 +98,7 @@ class MedicineInformationDialog(BaseDialog):
                 "category": self.category_name.text(),
                 "supplier": self.supplier_name.text(),
                 "batch": self.batch_number.text(),
+                "barcode": self.barcode.text(),
                 "exp_date": self.expiration_date.date(),
                 "quantity": self.stock_quantity.value(),
                 "unit_price": self.unit_price.value(),
@@ -139,6 +141,7 @@ class MedicineInformationDialog(BaseDialog):
                     stock_quantity = %s,
                     unit_price = %s,
                     sale_price = %s,
+                    barcode = NULLIF(%s, ''),
                     updated_at = CURRENT_TIMESTAMP
                 WHERE medicine_id = %s
             """
@@ -150,17 +153,18 @@ class MedicineInformationDialog(BaseDialog):
                 self.stock_quantity.value(),
                 self.unit_price.value(),
                 self.sale_price.value(),
+                self.barcode.text().strip(),
                 self.medicine_id.text()
             )
 
-            self.db.execute(sql, values)
-            self.db.commit()
+            with self.db.transaction() as cur:
+                cur.execute(sql, values)
+            self.context.reference_cache.invalidate('medicine_names')
 
             self.log_action(f"Updated medicine: {self.medicine_id.text()}")
             self.show_success(MSG_SUCCESS_UPDATE)
 
         except Exception as e:
-            self.db.rollback()
             self.show_error(f"{MSG_ERROR_UPDATE}: {e}")
             # Stay in edit mode
             self.edit_mode = True
@@ -175,6 +179,7 @@ class MedicineInformationDialog(BaseDialog):
             self.category_name.setText(self.original_data["category"])
             self.supplier_name.setText(self.original_data["supplier"])
             self.batch_number.setText(self.original_data["batch"])
+            self.barcode.setText(self.original_data["barcode"])
             self.expiration_date.setDate(self.original_data["exp_date"])
             self.stock_quantity.setValue(self.original_data["quantity"])
             self.unit_price.setValue(self.original_data["unit_price"])
@@ -197,8 +202,9 @@ class MedicineInformationDialog(BaseDialog):
         """Delete medicine from database"""
         try:
             sql = "DELETE FROM medicine WHERE medicine_id = %s"
-            self.db.execute(sql, (self.medicine_id.text(),))
-            self.db.commit()
+            with self.db.transaction() as cur:
+                cur.execute(sql, (self.medicine_id.text(),))
+            self.context.reference_cache.invalidate('medicine_names')
 
             self.log_action(f"Deleted medicine: {self.medicine_id.text()}")
             self.show_success(MSG_SUCCESS_DELETE)
@@ -208,5 +214,4 @@ class MedicineInformationDialog(BaseDialog):
             self.accept()
 
         except Exception as e:
-            self.db.rollback()
             self.show_error(f"Error deleting medicine: {e}")
@@ -0,0 +1,96 @@
+"""
+Type-ahead medicine picker for the point of sale
+"""
+
+from PyQt6.QtWidgets import QDialogButtonBox, QListWidgetItem
+from PyQt6.QtCore import Qt
+
+from src.ui.base import BaseDialog
+
+
+class MedicinePickerDialog(BaseDialog):
+    """
+    Pick a medicine and quantity from the in-memory catalog
+
+    Every keystroke filters the resident CatalogIndex, so typing never waits
+    on the database. The catalog is refreshed incrementally in the
+    background when the picker opens, and the list updates when it lands.
+    """
+
+    def __init__(self, context, in_cart=None, parent=None):
+        """
+        Initialize medicine picker
+
+        Args:
+            context: Application context with the catalog index
+            in_cart (dict, optional): medicine_id -> quantity already in the cart,
+                subtracted from the stock shown and allowed
+            parent: Parent window
+        """
+        super().__init__(context, 'medicine_picker.ui', 'Select Medicine', parent)
+
+        self.catalog = context.catalog_index
+        self.in_cart = in_cart or {}
+        self.selected = None
+
+        self.search_input.textChanged.connect(self.update_results)
+        self.result_list.currentItemChanged.connect(self._on_current_changed)
+        self.result_list.itemActivated.connect(lambda _item: self.accept())
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+
+        self.update_results()
+        self.catalog.refresh_async(context.query_runner, on_done=self._on_refreshed)
+
+    def available(self, entry):
+        """Stock still free for this cart"""
+        return entry.stock_quantity - self.in_cart.get(entry.medicine_id, 0)
+
+    def update_results(self):
+        """Show the best catalog matches for the typed text"""
+        current = self.result_list.currentItem()
+        current_id = current.data(Qt.ItemDataRole.UserRole) if current else None
+
+        self.result_list.clear()
+        for entry in self.catalog.search(self.search_input.text()):
+            if self.available(entry) <= 0:
+                continue
+            item = QListWidgetItem(entry.label())
+            item.setData(Qt.ItemDataRole.UserRole, entry.medicine_id)
+            self.result_list.addItem(item)
+            if entry.medicine_id == current_id:
+                self.result_list.setCurrentItem(item)
+
+        if self.result_list.currentItem() is None and self.result_list.count():
+            self.result_list.setCurrentRow(0)
+        self._on_current_changed(self.result_list.currentItem(), None)
+
+        if not self.catalog.loaded:
+            self.result_list.addItem("Loading catalog...")
+
+    def accept(self):
+        """Return the highlighted medicine and quantity"""
+        entry = self._current_entry()
+        if entry is None:
+            return
+        self.selected = (entry, self.quantity.value())
+        super().accept()
+
+    def _current_entry(self):
+        """Catalog entry for the highlighted row"""
+        item = self.result_list.currentItem()
+        medicine_id = item.data(Qt.ItemDataRole.UserRole) if item else None
+        return self.catalog.get(medicine_id) if medicine_id is not None else None
+
+    def _on_current_changed(self, current, _previous):
+        """Limit the quantity to the stock of the highlighted medicine"""
+        entry = self._current_entry()
+        ok_button = self.button_box.button(QDialogButtonBox.StandardButton.Ok)
+        ok_button.setEnabled(entry is not None)
+        if entry is not None:
+            self.quantity.setMaximum(max(1, self.available(entry)))
+
+    def _on_refreshed(self, changed):
+        """Re-run the filter once fresh catalog data arrives"""
+        if changed:
+            self.update_results()
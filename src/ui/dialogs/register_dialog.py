@@ -45,10 +45,15 @@ class RegisterDialog(BaseDialog):
             self.show_warning(error_msg)
             return
 
+        # Opened from the login dialog before the database finished connecting
+        if not self.context.ready:
+            self.register_button.setEnabled(False)
+            self.context.when_ready(self._on_connected, self._on_connect_failed)
+            return
+
         try:
             # Check if staff ID already exists
-            self.db.execute("SELECT staff_id FROM staff WHERE staff_id = %s", (staff_id,))
-            if self.db.fetchone():
+            if self.db.fetch_one("SELECT staff_id FROM staff WHERE staff_id = %s", (staff_id,)):
                 self.show_warning("Staff ID already exists. Please choose another ID.")
                 return
 
@@ -60,8 +65,8 @@ class RegisterDialog(BaseDialog):
                 INSERT INTO staff (staff_id, staff_psw, staff_name, staff_phone, staff_email, staff_position)
                 VALUES (%s, %s, %s, %s, %s, 'staff')
             """
-            self.db.execute(insert_sql, (staff_id, hashed_password, name, phone, email))
-            self.db.commit()
+            with self.db.transaction() as cur:
+                cur.execute(insert_sql, (staff_id, hashed_password, name, phone, email))
 
             # Log action (if admin is logged in)
             if self.context.is_authenticated():
@@ -77,9 +82,18 @@ class RegisterDialog(BaseDialog):
             # self.goto_login()
 
         except Exception as e:
-            self.db.rollback()
             self.show_error(f"Registration failed: {str(e)}")
 
+    def _on_connected(self):
+        """Submit the registration that was waiting for the database"""
+        self.register_button.setEnabled(True)
+        self.register()
+
+    def _on_connect_failed(self, error):
+        """Report that the database could not be reached"""
+        self.register_button.setEnabled(True)
+        self.show_error(f"Cannot connect to database: {str(error)}")
+
     def _validate_registration(self, staff_id, password, name, phone, email):
         """
         Validate registration form data
@@ -1,55 +1,148 @@
 """
-Report export dialog - Choose report type and export to PDF
+Report export dialog - Starts report exports and lists their progress
 """
 
+import os
 from datetime import datetime
-from PyQt6.QtWidgets import QMessageBox
 
+from PyQt6.QtCore import QUrl
+from PyQt6.QtGui import QDesktopServices
+from PyQt6.QtWidgets import QApplication, QHeaderView, QTableWidgetItem
+
+from src.core.report_jobs import ReportJob
 from src.ui.base import BaseDialog
-from src.services import ReportService
 
 
 class ReportDialog(BaseDialog):
-    """Dialog for selecting and exporting reports"""
+    """
+    Non-modal list of report jobs
+
+    The export_* methods queue a job on context.report_jobs and return at
+    once; the report is drawn in a worker process. The table shows each
+    job's progress, and when one finishes the parent window's status bar
+    says so and the window is flashed if it is not active.
+    """
+
+    # Table columns
+    REPORT, ROWS, STATUS, FILE = range(4)
+
+    STATUS_TEXT = {
+        ReportJob.QUEUED: "Queued",
+        ReportJob.RUNNING: "Drawing...",
+        ReportJob.DONE: "Done",
+        ReportJob.FAILED: "Failed",
+        ReportJob.CANCELLED: "Cancelled",
+    }
 
     def __init__(self, context, parent=None):
-        super().__init__(context, 'main.ui', 'Export Reports', parent)  # Reuse main.ui or create dedicated one
+        super().__init__(context, 'report.ui', 'Export Reports', parent)
+        self.setModal(False)
+
+        self.report_jobs = context.report_jobs
+        self._jobs = []  # ReportJob per table row
 
-        # Initialize report service
-        self.report_service = ReportService(context)
+        header = self.jobs_table.horizontalHeader()
+        header.setSectionResizeMode(self.REPORT, QHeaderView.ResizeMode.ResizeToContents)
 
-        # This is a simplified version
-        # In production, you'd create a dedicated report_dialog.ui with:
-        # - Radio buttons for report type selection
-        # - Date picker for invoice reports
-        # - Export button
+        self.report_jobs.progress.connect(self._update_row)
+        self.report_jobs.finished.connect(self._on_finished)
+        self.cancel_button.clicked.connect(self.cancel_selected)
+        self.open_button.clicked.connect(self.open_selected)
+        self.close_button.clicked.connect(self.hide)
+        self.jobs_table.cellDoubleClicked.connect(lambda _row, _column: self.open_selected())
+        self.jobs_table.itemSelectionChanged.connect(self._update_buttons)
+        self._update_buttons()
 
     def export_stock_report(self):
-        """Export stock inventory report"""
-        try:
-            filepath = self.report_service.export_stock_report()
-            self.show_success(f"Stock report exported successfully!\n{filepath}")
-            self.log_action("Exported stock report")
-        except Exception as e:
-            self.show_error(f"Failed to export stock report: {e}")
+        """Queue the stock inventory report"""
+        return self._submit('stock')
 
     def export_invoice_report(self, date=None):
-        """Export invoice report for specific date"""
-        if date is None:
+        """Queue the invoice report for a day (today by default)"""
+        if not date:  # Menu actions pass their checked state
             date = datetime.now().strftime('%Y-%m-%d')
-
-        try:
-            filepath = self.report_service.export_invoice_report(date)
-            self.show_success(f"Invoice report exported successfully!\n{filepath}")
-            self.log_action(f"Exported invoice report for {date}")
-        except Exception as e:
-            self.show_error(f"Failed to export invoice report: {e}")
+        return self._submit('invoice', date)
 
     def export_expiry_report(self):
-        """Export expiring medicines report"""
+        """Queue the expiring medicines report"""
+        return self._submit('expiry')
+
+    def cancel_selected(self):
+        """Cancel the selected job"""
+        job = self._selected_job()
+        if job is not None:
+            self.report_jobs.cancel(job)
+
+    def open_selected(self):
+        """Open the selected finished report"""
+        job = self._selected_job()
+        if job is not None and job.state == ReportJob.DONE:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.abspath(job.filepath)))
+
+    def _submit(self, kind, date=None):
+        """
+        Queue a report and add its row
+
+        Returns:
+            ReportJob: The job, or None if it could not be queued
+        """
         try:
-            filepath = self.report_service.export_expiry_warning_report()
-            self.show_success(f"Expiry warning report exported successfully!\n{filepath}")
-            self.log_action("Exported expiry warning report")
+            job = self.report_jobs.submit(kind, date)
         except Exception as e:
-            self.show_error(f"Failed to export expiry report: {e}")
+            self.show_error(f"Failed to start report: {e}")
+            return None
+
+        row = self.jobs_table.rowCount()
+        self.jobs_table.insertRow(row)
+        self._jobs.append(job)
+        self.jobs_table.setItem(row, self.REPORT, QTableWidgetItem(job.report.title))
+        self.jobs_table.setItem(row, self.FILE, QTableWidgetItem(job.filepath))
+        self._update_row(job)
+        self.jobs_table.selectRow(row)
+
+        self.show()
+        self.raise_()
+        return job
+
+    def _update_row(self, job):
+        """Show a job's row count and state"""
+        if job not in self._jobs:
+            return
+        row = self._jobs.index(job)
+        status = self.STATUS_TEXT[job.state]
+        if job.error is not None:
+            status = f"{status}: {job.error}"
+        self.jobs_table.setItem(row, self.ROWS, QTableWidgetItem(f"{job.rows:,}"))
+        self.jobs_table.setItem(row, self.STATUS, QTableWidgetItem(status))
+        self._update_buttons()
+
+    def _on_finished(self, job):
+        """Update the job's row and notify the user"""
+        if job not in self._jobs:
+            return
+        self._update_row(job)
+
+        if job.state == ReportJob.DONE:
+            message = f"Report ready: {job.filepath}"
+        elif job.state == ReportJob.FAILED:
+            message = f"Report failed: {job.report.title}"
+        else:
+            return
+
+        parent = self.parentWidget()
+        if parent is not None and hasattr(parent, 'statusBar'):
+            parent.statusBar().showMessage(message, 10000)
+        QApplication.alert(parent or self)
+        if job.state == ReportJob.FAILED:
+            self.show()
+
+    def _selected_job(self):
+        """Job of the selected row, or None"""
+        rows = self.jobs_table.selectionModel().selectedRows()
+        return self._jobs[rows[0].row()] if rows else None
+
+    def _update_buttons(self):
+        """Enable the buttons that apply to the selected job"""
+        job = self._selected_job()
+        self.cancel_button.setEnabled(job is not None and job.active)
+        self.open_button.setEnabled(job is not None and job.state == ReportJob.DONE)
@@ -25,8 +25,7 @@ class StaffInformationDialog(BaseDialog):
                 FROM staff
                 WHERE staff_id = %s
             """
-            self.db.execute(sql, (self.staff_id_value,))
-            result = self.db.fetchone()
+            result = self.db.fetch_one(sql, (self.staff_id_value,))
 
             if result:
                 # Set form fields
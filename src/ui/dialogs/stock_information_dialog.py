@@ -20,8 +20,7 @@ class StockInformationDialog(BaseDialog):
         """Load stock data from database"""
         try:
             sql = "SELECT * FROM stock WHERE stock_id = %s"
-            self.db.execute(sql, (self.stock_id_value,))
-            result = self.db.fetchone()
+            result = self.db.fetch_one(sql, (self.stock_id_value,))
 
             if result:
                 # Set form fields (assuming basic stock info)
@@ -34,8 +34,7 @@ class SupplierInformationDialog(BaseDialog):
                 FROM supplier
                 WHERE supplier_id = %s
             """
-            self.db.execute(sql, (self.supplier_id_value,))
-            result = self.db.fetchone()
+            result = self.db.fetch_one(sql, (self.supplier_id_value,))
 
             if result:
                 # Populate form fields (read-only initially)
@@ -153,14 +152,14 @@ class SupplierInformationDialog(BaseDialog):
                 self.supplier_id.text()
             )
 
-            self.db.execute(sql, values)
-            self.db.commit()
+            with self.db.transaction() as cur:
+                cur.execute(sql, values)
+            self.context.reference_cache.invalidate('suppliers')
 
             self.log_action(f"Updated supplier: {self.supplier_id.text()}")
             self.show_success(MSG_SUCCESS_UPDATE)
 
         except Exception as e:
-            self.db.rollback()
             self.show_error(f"{MSG_ERROR_UPDATE}: {e}")
             # Revert to edit mode
             self.edit_mode = True
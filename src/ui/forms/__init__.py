@@ -3,4 +3,5 @@ Qt Designer .ui form files
 All UI form files (.ui) are stored in this directory
 """
 
-# This directory contains .ui files only
+# This directory contains .ui files only; compiled/ holds the modules
+# generated from them by `python -m src.ui.base.form_loader`
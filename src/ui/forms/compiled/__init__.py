@@ -0,0 +1 @@
+"""Form classes generated from ../*.ui by form_loader.py"""
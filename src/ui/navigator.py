@@ -0,0 +1,203 @@
+"""
+Window navigation - one instance per window type, shown and hidden
+"""
+
+import os
+import time
+
+from PyQt6.QtCore import QObject
+
+from src.config import Settings
+from src.ui import windows
+
+try:
+    import psutil
+except ImportError:  # In requirements.txt; /proc is read without it
+    psutil = None
+
+
+def process_rss():
+    """
+    Resident memory of this process
+
+    Returns:
+        int: Bytes, or None without psutil on a system without /proc
+    """
+    if psutil:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+# Window name -> class in src.ui.windows, imported when first shown
+WINDOWS = {
+    'main': 'MainWindow',
+    'supplier': 'SupplierWindow',
+    'medicine': 'MedicineWindow',
+    'stock': 'StockWindow',
+    'customer': 'CustomerWindow',
+    'staff': 'StaffWindow',
+    'invoice': 'InvoiceWindow',
+    'logs': 'LogsWindow',
+}
+
+
+class Navigator(QObject):
+    """
+    Switches between the main windows
+
+    Each window type is created once and then hidden and shown again, so
+    going back to the dashboard does not reload its form or re-run its
+    queries. A window is refreshed when it is shown again only if it was
+    marked stale with invalidate(), or was hidden longer than
+    Settings.WINDOW_STALE_AFTER. Windows with panels (refresh_panels())
+    reload only the panels that went stale.
+    """
+
+    def __init__(self, context, parent=None):
+        """
+        Initialize navigator
+
+        Args:
+            context: Application context passed to the windows
+            parent: Optional parent QObject
+        """
+        super().__init__(parent)
+        self.context = context
+        self._windows = {}    # name -> window
+        self._hidden_at = {}  # name -> monotonic time the window was hidden
+        self._stale = {}      # name -> set of stale panels, empty for the whole window
+        self._current = None
+
+    def window(self, name):
+        """Get the live window of a type, or None"""
+        return self._windows.get(name)
+
+    def show(self, name):
+        """
+        Show a window, creating it on first use, and hide the current one
+
+        Args:
+            name (str): Window name, a key of WINDOWS
+
+        Returns:
+            BaseWindow: The window shown
+        """
+        window = self._windows.get(name)
+        if window is None:
+            window = self._create(name)
+        else:
+            self._refresh_if_stale(name, window)
+
+        # Show the next window before hiding the current one, so there is
+        # always a visible window
+        window.show()
+        window.raise_()
+        window.activateWindow()
+
+        previous = self._windows.get(self._current)
+        if previous is not None and previous is not window:
+            previous.hide()
+            self._hidden_at[self._current] = time.monotonic()
+        self._current = name
+        return window
+
+    def invalidate(self, name, *panels):
+        """
+        Mark a window's data as changed
+
+        The visible window is refreshed at once; a hidden one when it is
+        next shown. Windows not created yet load fresh data anyway.
+
+        Args:
+            name (str): Window name
+            *panels: Stale panels, none for the whole window
+        """
+        window = self._windows.get(name)
+        if window is None:
+            return
+
+        if name == self._current and window.isVisible():
+            self._refresh(window, set(panels))
+            return
+
+        stale = self._stale.get(name)
+        if stale is None:
+            self._stale[name] = set(panels)
+        elif stale and panels:
+            stale.update(panels)
+        else:
+            stale.clear()
+
+    def close_all(self):
+        """Close every window (e.g. on logout)"""
+        for window in list(self._windows.values()):
+            window.close()
+        self._windows.clear()
+        self._hidden_at.clear()
+        self._stale.clear()
+        self._current = None
+
+    def stats(self, details=True):
+        """
+        Get live window counts and memory use
+
+        Args:
+            details (bool): Include per-window Qt object counts (walks every
+                widget tree, so leave off for frequent polling)
+
+        Returns:
+            dict: Window count, visible count, process resident memory in
+                bytes (see process_rss()) and optionally per-window details
+        """
+        stats = {
+            'windows': len(self._windows),
+            'visible': sum(1 for w in self._windows.values() if w.isVisible()),
+            'rss': process_rss(),
+        }
+        if details:
+            stats['details'] = {
+                name: {
+                    'visible': window.isVisible(),
+                    'objects': len(window.findChildren(QObject)),
+                }
+                for name, window in self._windows.items()
+            }
+        return stats
+
+    def _create(self, name):
+        """Build a window and forget it once Qt deletes it"""
+        window_class = getattr(windows, WINDOWS[name])
+        window = window_class(self.context)
+        self._windows[name] = window
+        window.destroyed.connect(lambda _obj=None: self._forget(name, window))
+        return window
+
+    def _forget(self, name, window):
+        """Drop a closed window (unless it was already replaced)"""
+        if self._windows.get(name) is window:
+            del self._windows[name]
+            self._hidden_at.pop(name, None)
+            self._stale.pop(name, None)
+            if self._current == name:
+                self._current = None
+
+    def _refresh_if_stale(self, name, window):
+        """Refresh a window being shown again if its data may be outdated"""
+        panels = self._stale.pop(name, None)
+        hidden_at = self._hidden_at.pop(name, None)
+        if hidden_at is not None and time.monotonic() - hidden_at >= Settings.WINDOW_STALE_AFTER:
+            panels = set()
+        if panels is not None:
+            self._refresh(window, panels)
+
+    @staticmethod
+    def _refresh(window, panels):
+        """Reload the given panels, or the whole window"""
+        if panels and hasattr(window, 'refresh_panels'):
+            window.refresh_panels(panels)
+        else:
+            window.refresh_data()
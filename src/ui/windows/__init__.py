@@ -1,23 +1,38 @@
 """
 Main application windows
+
+Window modules are imported on first access (PEP 562), so importing one
+window does not load every other window and the services they use.
 """
 
-from .main_window import MainWindow
-from .supplier_window import SupplierWindow
-from .customer_window import CustomerWindow
-from .staff_window import StaffWindow
-from .medicine_window import MedicineWindow
-from .invoice_window import InvoiceWindow
-from .stock_window import StockWindow
-from .logs_window import LogsWindow
-
-__all__ = [
-    'MainWindow',
-    'SupplierWindow',
-    'CustomerWindow',
-    'StaffWindow',
-    'MedicineWindow',
-    'InvoiceWindow',
-    'StockWindow',
-    'LogsWindow',
-]
+import importlib
+
+
+# Class name -> module, imported when first used
+_WINDOWS = {
+    'MainWindow': 'main_window',
+    'SupplierWindow': 'supplier_window',
+    'CustomerWindow': 'customer_window',
+    'StaffWindow': 'staff_window',
+    'MedicineWindow': 'medicine_window',
+    'InvoiceWindow': 'invoice_window',
+    'StockWindow': 'stock_window',
+    'LogsWindow': 'logs_window',
+}
+
+__all__ = list(_WINDOWS)
+
+
+def __getattr__(name):
+    """Import a window class on first access"""
+    module = _WINDOWS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the lazily imported classes too"""
+    return sorted(set(globals()) | set(__all__))
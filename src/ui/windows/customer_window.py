@@ -2,11 +2,8 @@
 Customer management window
 """
 
-from PyQt6.QtWidgets import QTableWidgetItem
-from PyQt6.QtGui import QFont
-from PyQt6.QtCore import Qt
-
-from src.ui.base import BaseWindow
+from src.ui.base import BaseWindow, Column, ServerSearch
+from src.services.search_service import SearchService
 from src.ui.dialogs.customer_information_dialog import CustomerInformationDialog
 
 
@@ -18,94 +15,60 @@ class CustomerWindow(BaseWindow):
 
         # Connect UI elements
         self.back_button.clicked.connect(self.goto_main)
-        self.search_input.textChanged.connect(self.search_customer)
-        self.tableWidget.cellClicked.connect(self.handle_cell_click)
-        self.tableWidget.setSortingEnabled(True)
+        self.tableView.clicked.connect(self.handle_cell_click)
+
+        # Configure table
+        self.table_model, self.table_proxy = self.setup_table(self.tableView, [
+            Column("ID", 0, hidden=True),
+            Column("Name", 1, link=True, bold=True,
+                   tooltip="Click to view customer details"),
+            Column("Phone", 2),
+            Column("Email", 3),
+            Column("Details", text="View Details", link=True,
+                   tooltip="Click to view customer details"),
+        ])
+
+        # Search runs server-side on the trigram indexes
+        self.search_service = SearchService(context)
+        self.server_search = ServerSearch(
+            self, self.search_input, self.tableView, self.table_model,
+            self.search_service.search_customers, self.load_customer_data
+        )
 
         # Load data
-        self.load_customer_data()
+        self.server_search.refresh()
 
     def load_customer_data(self):
         """Load customer data into table"""
-        try:
-            sql = """
-                SELECT customer_id, customer_name, customer_phone, customer_email
-                FROM customer
-                ORDER BY customer_name
-            """
-            self.db.execute(sql)
-            results = self.db.fetchall()
-
-            # Configure table
-            self.tableWidget.setRowCount(len(results))
-            self.tableWidget.setColumnCount(5)
-            self.tableWidget.setHorizontalHeaderLabels(["ID", "Name", "Phone", "Email", "Details"])
-            self.tableWidget.setColumnHidden(0, True)
-
-            # Populate table
-            for row_idx, row_data in enumerate(results):
-                customer_id = row_data[0]
-
-                for col_idx in range(4):
-                    item = QTableWidgetItem(str(row_data[col_idx] or ''))
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                    # Format name column (clickable)
-                    if col_idx == 1:
-                        font = QFont()
-                        font.setBold(True)
-                        font.setUnderline(True)
-                        item.setFont(font)
-                        item.setData(Qt.ItemDataRole.UserRole, customer_id)
-                        item.setToolTip("Click to view customer details")
-
-                    self.tableWidget.setItem(row_idx, col_idx, item)
-
-                # Add "View Details" column
-                detail_item = QTableWidgetItem("View Details")
-                font = QFont()
-                font.setUnderline(True)
-                detail_item.setFont(font)
-                detail_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                detail_item.setData(Qt.ItemDataRole.UserRole, customer_id)
-                detail_item.setToolTip("Click to view customer details")
-                self.tableWidget.setItem(row_idx, 4, detail_item)
-
-        except Exception as e:
-            self.show_error(f"Error loading customer data: {e}")
-
-    def search_customer(self):
-        """Search customers by name"""
-        keyword = self.search_input.text().strip().lower()
-
-        for row in range(self.tableWidget.rowCount()):
-            name_item = self.tableWidget.item(row, 1)
-            if name_item:
-                match = keyword in name_item.text().lower()
-                self.tableWidget.setRowHidden(row, not match)
-
-    def handle_cell_click(self, row, column):
+        sql = """
+            SELECT customer_id, customer_name, customer_phone, customer_email
+            FROM customer
+            ORDER BY customer_name
+        """
+        return self.run_query(sql, on_result=self._populate_customer_table,
+                              error_message="Error loading customer data")
+
+    def _populate_customer_table(self, results):
+        """Fill customer table with query results"""
+        self.table_model.set_rows(results)
+
+    def handle_cell_click(self, index):
         """Handle cell click to open detail dialog"""
-        if column in [1, 4]:  # Name or Details column
-            item = self.tableWidget.item(row, column)
-            if item:
-                customer_id = item.data(Qt.ItemDataRole.UserRole)
-                if customer_id:
-                    self.show_customer_detail(customer_id)
+        if index.column() in [1, 4]:  # Name or Details column
+            customer_id = self.table_proxy.row_data(index)[0]
+            if customer_id:
+                self.show_customer_detail(customer_id)
 
     def show_customer_detail(self, customer_id):
         """Show customer detail dialog"""
         dialog = CustomerInformationDialog(self.context, customer_id, self)
         if dialog.exec():
-            self.load_customer_data()
+            self.server_search.refresh()
 
     def goto_main(self):
         """Return to main window"""
-        from src.ui.windows.main_window import MainWindow
-        self.main_window = MainWindow(self.context)
-        self.main_window.show()
-        self.close()
+        self.context.navigator.show('main')
 
     def refresh_data(self):
         """Refresh table data"""
-        self.load_customer_data()
+        self.server_search.refresh()
@@ -2,87 +2,223 @@
 Activity logs window - View system activity history
 """
 
-from PyQt6.QtWidgets import QTableWidgetItem
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import QDate, QTimer
 
-from src.ui.base import BaseWindow
+from src.config import Settings
+from src.core.date_ranges import day_bounds
+from src.services import ActivityLogService
+from src.ui.base import BaseWindow, Column
 
 
 class LogsWindow(BaseWindow):
-    """Activity logs viewer window"""
+    """
+    Activity logs viewer window
+
+    Only the newest page is read when the window opens; older entries load
+    as the table is scrolled down. Filters are applied by the database, and
+    in live mode new entries are polled by log_id and added on top.
+    """
 
     def __init__(self, context):
         super().__init__(context, 'logs.ui', 'Activity Logs')
 
+        self.log_service = ActivityLogService(context)
+        self._filters = {}
+        self._generation = 0       # Bumped when filters change, to drop stale pages
+        self._page_task = None
+        self._tail_task = None
+        self._oldest = None        # (log_time, log_id) of the last row shown
+        self._newest_id = 0        # Highest log_id shown
+        self._tailed_ids = set()   # Ids added by the live tail, skipped in later pages
+        self._has_more = False
+
+        # Configure table
+        self.table_model, self.table_proxy = self.setup_table(self.tableView, [
+            Column("ID", 0, width=80),
+            Column("Staff ID", 1, width=120),
+            Column("Action", 2, width=400),
+            Column("Time", 3, width=200),
+        ])
+
+        today = QDate.currentDate()
+        self.date_from.setDate(today.addDays(-7))
+        self.date_to.setDate(today)
+
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(Settings.SEARCH_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self.load_logs)
+
+        self._tail_timer = QTimer(self)
+        self._tail_timer.setInterval(Settings.LOG_TAIL_INTERVAL_MS)
+        self._tail_timer.timeout.connect(self.poll_new_logs)
+
         # Connect UI elements
         self.back_button.clicked.connect(self.goto_main)
-        self.search_input.textChanged.connect(self.search_logs)
-        self.tableWidget.setSortingEnabled(True)
+        self.search_input.textChanged.connect(self._filter_timer.start)
+        self.staff_filter.textChanged.connect(self._filter_timer.start)
+        self.date_filter.toggled.connect(self.toggle_date_filter)
+        self.date_from.dateChanged.connect(self._filter_timer.start)
+        self.date_to.dateChanged.connect(self._filter_timer.start)
+        self.live_tail.toggled.connect(self.set_live_tail)
+        self.tableView.verticalScrollBar().valueChanged.connect(self._on_scroll)
 
         # Load logs
         self.load_logs()
 
+    def current_filters(self):
+        """
+        Read the filter widgets
+
+        Returns:
+            dict: Keyword arguments for ActivityLogService queries
+        """
+        filters = {
+            'staff_id': self.staff_filter.text().strip() or None,
+            'action': self.search_input.text().strip() or None,
+        }
+        if self.date_filter.isChecked():
+            filters['since'] = day_bounds(self.date_from.date().toPyDate())[0]
+            filters['until'] = day_bounds(self.date_to.date().toPyDate())[1]
+        return filters
+
     def load_logs(self):
-        """Load activity logs from database"""
-        try:
-            sql = """
-                SELECT log_id, staff_id, action, log_time
-                FROM activity_log
-                ORDER BY log_time DESC
-                LIMIT 1000
-            """
-            self.db.execute(sql)
-            results = self.db.fetchall()
-
-            # Configure table
-            self.tableWidget.setRowCount(len(results))
-            self.tableWidget.setColumnCount(4)
-
-            # Set column headers
-            self.tableWidget.setHorizontalHeaderLabels(['ID', 'Staff ID', 'Action', 'Time'])
-
-            # Set column widths
-            self.tableWidget.setColumnWidth(0, 80)   # ID
-            self.tableWidget.setColumnWidth(1, 120)  # Staff ID
-            self.tableWidget.setColumnWidth(2, 400)  # Action
-            self.tableWidget.setColumnWidth(3, 200)  # Time
-
-            # Populate table
-            for row_idx, row_data in enumerate(results):
-                for col_idx, value in enumerate(row_data):
-                    item = QTableWidgetItem(str(value or ''))
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                    # Make read-only
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-
-                    self.tableWidget.setItem(row_idx, col_idx, item)
-
-        except Exception as e:
-            self.show_error(f"Error loading activity logs: {e}")
-
-    def search_logs(self):
-        """Search logs by staff ID or action"""
-        keyword = self.search_input.text().strip().lower()
-
-        for row in range(self.tableWidget.rowCount()):
-            staff_item = self.tableWidget.item(row, 1)  # Staff ID
-            action_item = self.tableWidget.item(row, 2)  # Action
-
-            if staff_item and action_item:
-                staff_text = staff_item.text().lower()
-                action_text = action_item.text().lower()
-
-                match = keyword in staff_text or keyword in action_text
-                self.tableWidget.setRowHidden(row, not match)
+        """Load the newest page of logs matching the filters"""
+        self._filter_timer.stop()
+        self._generation += 1
+        self._cancel_tasks()
+
+        self._filters = self.current_filters()
+        self._oldest = None
+        self._newest_id = 0
+        self._tailed_ids = set()
+        self._has_more = False
+        self._fetch_page()
+
+    def _fetch_page(self):
+        """Request the page below the last row shown"""
+        generation, filters, before = self._generation, self._filters, self._oldest
+
+        def work(conn):
+            return self.log_service.page(before=before, conn=conn, **filters)
+
+        task = self.run_in_background(
+            work,
+            on_result=lambda page: self._show_page(generation, before, page),
+            error_message="Error loading activity logs"
+        )
+        # A failed page must not block scrolling and the tail from retrying
+        task.signals.failed.connect(lambda _error: self._page_failed(task))
+        self._page_task = task
+
+    def _page_failed(self, task):
+        """Forget a page request that failed so the next scroll asks again"""
+        if self._page_task is task:
+            self._page_task = None
+
+    def _show_page(self, generation, before, page):
+        """Display a page unless the filters changed since it was requested"""
+        if generation != self._generation:
+            return
+
+        self._page_task = None
+        rows, self._has_more = page
+        if rows:
+            self._oldest = (rows[-1][3], rows[-1][0])
+
+        if before is None:
+            self._newest_id = max(row[0] for row in rows) if rows else 0
+            self.table_model.set_rows(rows)
+        else:
+            self.table_model.append_rows(
+                [row for row in rows if row[0] not in self._tailed_ids]
+            )
+
+    def _on_scroll(self, value):
+        """Load older entries when the view reaches the bottom"""
+        if not self._has_more or self._page_task is not None:
+            return
+        if value >= self.tableView.verticalScrollBar().maximum():
+            self._fetch_page()
+
+    def toggle_date_filter(self, checked):
+        """Enable the date range and reload"""
+        self.date_from.setEnabled(checked)
+        self.date_to.setEnabled(checked)
+        self.load_logs()
+
+    def set_live_tail(self, enabled):
+        """Start or stop polling for new entries"""
+        if enabled:
+            self._tail_timer.start()
+            self.poll_new_logs()
+        else:
+            self._tail_timer.stop()
+
+    def poll_new_logs(self):
+        """Fetch entries newer than the newest one shown"""
+        # Wait for the first page, which sets the starting point
+        if self._tail_task is not None or (self._page_task is not None and self._oldest is None):
+            return
+
+        generation, filters, after = self._generation, self._filters, self._newest_id
+
+        def work(conn):
+            return self.log_service.newer_than(after, conn=conn, **filters)
+
+        # Submitted directly: polls should neither flash the loading
+        # indicator nor pop up an error every few seconds while offline
+        self._tail_task = self.context.query_runner.submit_call(
+            work,
+            on_result=lambda rows: self._show_new(generation, rows),
+            on_error=self._on_tail_failed
+        )
+
+    def _show_new(self, generation, rows):
+        """Add newly written entries on top"""
+        self._tail_task = None
+        if generation != self._generation or not rows:
+            return
+        self._newest_id = max(self._newest_id, rows[0][0])
+        self._tailed_ids.update(row[0] for row in rows)
+        self.table_model.prepend_rows(rows)
+
+    def _on_tail_failed(self, error):
+        """Skip this poll; the next one retries"""
+        self._tail_task = None
+        print(f"❌ Live log poll failed: {error}")
+
+    def _cancel_tasks(self):
+        """Cancel page and tail queries in flight"""
+        for task in (self._page_task, self._tail_task):
+            if task is not None:
+                self.cancel_query(task)
+        self._page_task = None
+        self._tail_task = None
 
     def goto_main(self):
         """Return to main window"""
-        from src.ui.windows.main_window import MainWindow
-        self.main_window = MainWindow(self.context)
-        self.main_window.show()
-        self.close()
+        self.context.navigator.show('main')
 
     def refresh_data(self):
         """Refresh logs data"""
         self.load_logs()
+
+    def showEvent(self, event):
+        """Resume live mode when the window is shown again"""
+        super().showEvent(event)
+        if self.live_tail.isChecked():
+            self._tail_timer.start()
+            self.poll_new_logs()
+
+    def hideEvent(self, event):
+        """Stop polling while the window is hidden"""
+        self._tail_timer.stop()
+        super().hideEvent(event)
+
+    def closeEvent(self, event):
+        """Stop polling before the window goes away"""
+        self._filter_timer.stop()
+        self._tail_timer.stop()
+        self._cancel_tasks()
+        super().closeEvent(event)
@@ -3,11 +3,13 @@ Main application window - Dashboard and navigation hub
 """
 
 from PyQt6.QtWidgets import QLabel, QTableWidgetItem, QMessageBox
+from PyQt6.QtGui import QAction
 from PyQt6.QtCore import QTimer, Qt
 from datetime import datetime
 
+from src.config import Settings
+from src.core.date_ranges import days_from_today, on_day
 from src.ui.base import BaseWindow
-from src.services import ReportService
 
 
 class MainWindow(BaseWindow):
@@ -22,6 +24,13 @@ class MainWindow(BaseWindow):
     - Export reports
     """
 
+    # Dashboard panel -> method loading it
+    PANELS = {
+        'stock': 'load_stock_overview',
+        'expiry': 'load_outdate_warning',
+        'invoices': 'load_today_invoice',
+    }
+
     def __init__(self, context):
         """
         Initialize main window
@@ -30,9 +39,7 @@ class MainWindow(BaseWindow):
             context: Application context with logged-in user
         """
         super().__init__(context, 'main.ui', 'MediManager - Dashboard')
-
-        # Services
-        self.report_service = ReportService(context)
+        self.report_dialog = None  # Created with the first export
 
         # Setup UI components
         self._setup_status_bar()
@@ -45,6 +52,11 @@ class MainWindow(BaseWindow):
         self.load_outdate_warning()
         self.load_today_invoice()
 
+        # Start loading the POS catalog and lookup data so the first invoice
+        # or stock entry doesn't wait for them
+        self.context.catalog_index
+        self.context.reference_cache
+
     def _setup_status_bar(self):
         """Setup status bar with user info and time"""
         self.status_label = QLabel()
@@ -68,6 +80,13 @@ class MainWindow(BaseWindow):
         self.actionLog_out.triggered.connect(self.goto_login)
         self.actionLogs.triggered.connect(self.goto_logs)
 
+        # Only when the app runs with QUERY_STATS=1
+        if self.db.query_stats() is not None:
+            action = QAction("Query statistics", self)
+            action.setShortcut("Ctrl+Shift+Q")
+            action.triggered.connect(self.dump_query_stats)
+            self.menuGeneral_Management.insertAction(self.actionLog_out, action)
+
     def _connect_button_actions(self):
         """Connect button click actions"""
         self.export_report.clicked.connect(self.show_report_dialog)
@@ -83,134 +102,133 @@ class MainWindow(BaseWindow):
         self.stock_medicine.setSortingEnabled(True)
         self.invoice_daily.setSortingEnabled(True)
 
+    def showEvent(self, event):
+        """Resume the status bar clock"""
+        super().showEvent(event)
+        self.update_status_info()
+        self.status_timer.start(1000)
+
+    def hideEvent(self, event):
+        """Pause the status bar clock while the dashboard is hidden"""
+        self.status_timer.stop()
+        super().hideEvent(event)
+
     def update_status_info(self):
         """Update status bar with current info"""
         current_time = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
         user_id = self.context.staff_id or "Unknown"
-        self.status_label.setText(f"User: {user_id} | {current_time}")
+        windows = self.context.navigator.stats(details=False)
+        memory = f" | {windows['rss'] / 2**20:.0f} MB" if windows['rss'] else ""
+        self.status_label.setText(
+            f"User: {user_id} | Windows: {windows['windows']}{memory} | {current_time}"
+        )
+
+    def dump_query_stats(self):
+        """Write the per-statement timing report to exports/"""
+        try:
+            path = self.db.query_stats().dump()
+            self.show_success(f"Query statistics saved to:\n{path}")
+        except Exception as e:
+            self.show_error(f"Error writing query statistics: {str(e)}")
 
     def load_stock_overview(self):
         """Load stock overview table"""
-        try:
-            sql = """
-                SELECT medicine_id, medicine_name, unit, stock_quantity, batch_number, sale_price
-                FROM medicine
-                ORDER BY medicine_name
-            """
-            self.db.execute(sql)
-            results = self.db.fetchall()
-
-            self.stock_medicine.setRowCount(len(results))
-            for row, data in enumerate(results):
-                for col, value in enumerate(data):
-                    item = QTableWidgetItem(str(value or ''))
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.stock_medicine.setItem(row, col, item)
+        sql = """
+            SELECT medicine_id, medicine_name, unit, stock_quantity, batch_number, sale_price
+            FROM medicine
+            ORDER BY medicine_name
+        """
+        self.run_query(sql, on_result=self._populate_stock_overview,
+                       error_message="Error loading stock overview")
 
-        except Exception as e:
-            self.show_error(f"Error loading stock overview: {e}")
+    def _populate_stock_overview(self, results):
+        """Fill stock overview table with query results"""
+        self._fill_table(self.stock_medicine, results)
 
     def load_outdate_warning(self):
         """Load expiring medicines warning table"""
-        try:
-            sql = """
-                SELECT medicine_name, stock_quantity, unit, batch_number, expiration_date,
-                       (expiration_date::date - CURRENT_DATE) AS days_left
-                FROM medicine
-                WHERE (expiration_date::date - CURRENT_DATE) <= 60
-                  AND (expiration_date::date - CURRENT_DATE) >= 0
-                ORDER BY expiration_date ASC
-            """
-            self.db.execute(sql)
-            results = self.db.fetchall()
-
-            self.outdate_medicine.setRowCount(len(results))
-            for row, data in enumerate(results):
-                for col, value in enumerate(data):
-                    item = QTableWidgetItem(str(value or ''))
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.outdate_medicine.setItem(row, col, item)
+        sql = f"""
+            SELECT medicine_name, stock_quantity, unit, batch_number, expiration_date,
+                   (expiration_date::date - CURRENT_DATE) AS days_left
+            FROM medicine
+            WHERE {days_from_today('expiration_date', 0, Settings.EXPIRY_WARNING_DAYS)}
+            ORDER BY expiration_date ASC
+        """
+        self.run_query(sql, on_result=self._populate_outdate_warning,
+                       error_message="Error loading expiry warnings")
 
-        except Exception as e:
-            self.show_error(f"Error loading expiry warnings: {e}")
+    def _populate_outdate_warning(self, results):
+        """Fill expiring medicines table with query results"""
+        self._fill_table(self.outdate_medicine, results)
 
     def load_today_invoice(self):
         """Load today's invoices"""
-        try:
-            sql = """
-                SELECT invoice_id, invoice_date, customer_id, total_amount, staff_id, payment_status
-                FROM invoice
-                WHERE DATE(invoice_date) = CURRENT_DATE
-                ORDER BY invoice_date DESC
-            """
-            self.db.execute(sql)
-            results = self.db.fetchall()
-
-            self.invoice_daily.setRowCount(len(results))
-            for row, data in enumerate(results):
-                for col, value in enumerate(data):
-                    item = QTableWidgetItem(str(value or ''))
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.invoice_daily.setItem(row, col, item)
-
-        except Exception as e:
-            self.show_error(f"Error loading today's invoices: {e}")
+        sql = f"""
+            SELECT invoice_id, invoice_date, customer_id, total_amount, staff_id, payment_status
+            FROM invoice
+            WHERE {on_day('invoice_date')}
+            ORDER BY invoice_date DESC
+        """
+        self.run_query(sql, on_result=self._populate_today_invoice,
+                       error_message="Error loading today's invoices")
+
+    def _populate_today_invoice(self, results):
+        """Fill today's invoice table with query results"""
+        self._fill_table(self.invoice_daily, results)
+
+    def _fill_table(self, table, results):
+        """Populate a dashboard table with centered read-only cells"""
+        table.setSortingEnabled(False)
+        table.setRowCount(len(results))
+        for row, data in enumerate(results):
+            for col, value in enumerate(data):
+                item = QTableWidgetItem(str(value or ''))
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                table.setItem(row, col, item)
+        table.setSortingEnabled(True)
 
     def refresh_data(self):
         """Refresh all dashboard data"""
-        self.load_stock_overview()
-        self.load_outdate_warning()
-        self.load_today_invoice()
+        self.refresh_panels(self.PANELS)
+
+    def refresh_panels(self, panels):
+        """
+        Reload only some dashboard tables
+
+        Args:
+            panels: Names from PANELS ('stock', 'expiry', 'invoices')
+        """
+        for panel in panels:
+            getattr(self, self.PANELS[panel])()
 
     # Navigation methods
     def goto_supplier(self):
         """Navigate to supplier management"""
-        from src.ui.windows.supplier_window import SupplierWindow
-        self.supplier_window = SupplierWindow(self.context)
-        self.supplier_window.show()
-        self.close()
+        self.context.navigator.show('supplier')
 
     def goto_medicine(self):
         """Navigate to medicine management"""
-        from src.ui.windows.medicine_window import MedicineWindow
-        self.medicine_window = MedicineWindow(self.context)
-        self.medicine_window.show()
-        self.close()
+        self.context.navigator.show('medicine')
 
     def goto_stock(self):
         """Navigate to stock management"""
-        from src.ui.windows.stock_window import StockWindow
-        self.stock_window = StockWindow(self.context)
-        self.stock_window.show()
-        self.close()
+        self.context.navigator.show('stock')
 
     def goto_customer(self):
         """Navigate to customer management"""
-        from src.ui.windows.customer_window import CustomerWindow
-        self.customer_window = CustomerWindow(self.context)
-        self.customer_window.show()
-        self.close()
+        self.context.navigator.show('customer')
 
     def goto_staff(self):
         """Navigate to staff management"""
-        from src.ui.windows.staff_window import StaffWindow
-        self.staff_window = StaffWindow(self.context)
-        self.staff_window.show()
-        self.close()
+        self.context.navigator.show('staff')
 
     def goto_invoice(self):
         """Navigate to invoice management"""
-        from src.ui.windows.invoice_window import InvoiceWindow
-        self.invoice_window = InvoiceWindow(self.context)
-        self.invoice_window.show()
-        self.close()
+        self.context.navigator.show('invoice')
 
     def goto_logs(self):
         """Navigate to activity logs"""
-        from src.ui.windows.logs_window import LogsWindow
-        self.logs_window = LogsWindow(self.context)
-        self.logs_window.show()
-        self.close()
+        self.context.navigator.show('logs')
 
     def goto_login(self):
         """Logout and return to login"""
@@ -220,12 +238,14 @@ class MainWindow(BaseWindow):
             from src.ui.dialogs.login_dialog import LoginDialog
             self.login_window = LoginDialog(self.context)
             self.login_window.show()
-            self.close()
+            self.context.navigator.close_all()
 
     def show_report_dialog(self):
-        """Show report export dialog"""
-        from src.ui.dialogs.report_dialog import ReportDialog
-        dialog = ReportDialog(self.context, self)
+        """Queue a report export; the report dialog lists the running jobs"""
+        if self.report_dialog is None:
+            from src.ui.dialogs.report_dialog import ReportDialog
+            self.report_dialog = ReportDialog(self.context, self)
+        dialog = self.report_dialog
 
         # Show quick menu for report type
         from PyQt6.QtWidgets import QMenu
@@ -233,6 +253,8 @@ class MainWindow(BaseWindow):
         menu.addAction("Stock Report", dialog.export_stock_report)
         menu.addAction("Invoice Report (Today)", dialog.export_invoice_report)
         menu.addAction("Expiry Warning", dialog.export_expiry_report)
+        menu.addSeparator()
+        menu.addAction("Show Report Jobs", dialog.show)
         menu.exec(self.export_report.mapToGlobal(self.export_report.rect().bottomLeft()))
 
     def show_create_invoice(self):
@@ -240,8 +262,9 @@ class MainWindow(BaseWindow):
         from src.ui.dialogs.create_invoice_dialog import CreateInvoiceDialog
         dialog = CreateInvoiceDialog(self.context, parent=self)
         if dialog.exec():
-            # Refresh today's invoice data
-            self.load_today_invoice()
+            # The sale shows in today's invoices and lowers stock
+            self.refresh_panels(('invoices', 'stock'))
+            self.context.navigator.invalidate('invoice')
 
     def handle_invoice_detail_click(self, row, col):
         """Handle invoice detail click"""
@@ -2,11 +2,7 @@
 Staff management window
 """
 
-from PyQt6.QtWidgets import QTableWidgetItem
-from PyQt6.QtGui import QFont
-from PyQt6.QtCore import Qt
-
-from src.ui.base import BaseWindow
+from src.ui.base import BaseWindow, Column
 from src.ui.dialogs.staff_information_dialog import StaffInformationDialog
 
 
@@ -19,87 +15,48 @@ class StaffWindow(BaseWindow):
         # Connect UI elements
         self.back_button.clicked.connect(self.goto_main)
         self.search_input.textChanged.connect(self.search_staff)
-        self.tableWidget.cellClicked.connect(self.handle_cell_click)
-        self.tableWidget.setSortingEnabled(True)
+        self.tableView.clicked.connect(self.handle_cell_click)
+
+        # Configure table
+        self.table_model, self.table_proxy = self.setup_table(self.tableView, [
+            Column("ID", 0, width=50),
+            Column("Name", 1, width=200, link=True,
+                   tooltip="Click to view staff details"),
+            Column("Position", 2, width=100, link=True,
+                   tooltip="Click to view staff details"),
+            Column("Created", 3, width=150),
+            Column("Updated", 4, width=150),
+            Column("Details", text="View Details", width=200, link=True,
+                   tooltip="Click to view staff details"),
+        ], search_columns=[1])
 
         # Load data
         self.load_staff_data()
 
     def load_staff_data(self):
         """Load staff data into table"""
-        try:
-            sql = """
-                SELECT staff_id, staff_name, staff_position, created_at, updated_at
-                FROM staff
-                ORDER BY staff_name
-            """
-            self.db.execute(sql)
-            results = self.db.fetchall()
-
-            # Configure table
-            self.tableWidget.setRowCount(len(results))
-            self.tableWidget.setColumnCount(6)
-            self.tableWidget.setHorizontalHeaderLabels(
-                ["ID", "Name", "Position", "Created", "Updated", "Details"]
-            )
-
-            # Set column widths
-            self.tableWidget.setColumnWidth(0, 50)
-            self.tableWidget.setColumnWidth(1, 200)
-            self.tableWidget.setColumnWidth(2, 100)
-            self.tableWidget.setColumnWidth(3, 150)
-            self.tableWidget.setColumnWidth(4, 150)
-            self.tableWidget.setColumnWidth(5, 200)
-
-            # Populate table
-            for row_idx, row_data in enumerate(results):
-                staff_id = row_data[0]
-
-                for col_idx in range(5):
-                    item = QTableWidgetItem(str(row_data[col_idx] or ''))
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                    # Format name and position columns (clickable)
-                    if col_idx in [1, 2]:
-                        font = QFont()
-                        font.setUnderline(True)
-                        item.setFont(font)
-                        item.setData(Qt.ItemDataRole.UserRole, staff_id)
-                        item.setToolTip("Click to view staff details")
-
-                    self.tableWidget.setItem(row_idx, col_idx, item)
-
-                # Add "View Details" column
-                detail_item = QTableWidgetItem("View Details")
-                font = QFont()
-                font.setUnderline(True)
-                detail_item.setFont(font)
-                detail_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                detail_item.setData(Qt.ItemDataRole.UserRole, staff_id)
-                detail_item.setToolTip("Click to view staff details")
-                self.tableWidget.setItem(row_idx, 5, detail_item)
-
-        except Exception as e:
-            self.show_error(f"Error loading staff data: {e}")
+        sql = """
+            SELECT staff_id, staff_name, staff_position, created_at, updated_at
+            FROM staff
+            ORDER BY staff_name
+        """
+        self.run_query(sql, on_result=self._populate_staff_table,
+                       error_message="Error loading staff data")
+
+    def _populate_staff_table(self, results):
+        """Fill staff table with query results"""
+        self.table_model.set_rows(results)
 
     def search_staff(self):
         """Search staff by name"""
-        keyword = self.search_input.text().strip().lower()
-
-        for row in range(self.tableWidget.rowCount()):
-            name_item = self.tableWidget.item(row, 1)
-            if name_item:
-                match = keyword in name_item.text().lower()
-                self.tableWidget.setRowHidden(row, not match)
+        self.table_proxy.set_filter_text(self.search_input.text())
 
-    def handle_cell_click(self, row, column):
+    def handle_cell_click(self, index):
         """Handle cell click to open detail dialog"""
-        if column in [1, 5]:  # Name or Details column
-            item = self.tableWidget.item(row, column)
-            if item:
-                staff_id = item.data(Qt.ItemDataRole.UserRole)
-                if staff_id:
-                    self.show_staff_detail(staff_id)
+        if index.column() in [1, 5]:  # Name or Details column
+            staff_id = self.table_proxy.row_data(index)[0]
+            if staff_id:
+                self.show_staff_detail(staff_id)
 
     def show_staff_detail(self, staff_id):
         """Show staff detail dialog"""
@@ -109,10 +66,7 @@ class StaffWindow(BaseWindow):
 
     def goto_main(self):
         """Return to main window"""
-        from src.ui.windows.main_window import MainWindow
-        self.main_window = MainWindow(self.context)
-        self.main_window.show()
-        self.close()
+        self.context.navigator.show('main')
 
     def refresh_data(self):
         """Refresh table data"""
@@ -2,10 +2,8 @@
 Stock management window
 """
 
-from PyQt6.QtWidgets import QTableWidgetItem
-from PyQt6.QtCore import Qt
-
-from src.ui.base import BaseWindow
+from src.ui.base import BaseWindow, Column, ServerSearch
+from src.services.search_service import SearchService
 from src.ui.dialogs.stock_information_dialog import StockInformationDialog
 from src.ui.dialogs.create_stock_dialog import CreateStockDialog
 
@@ -18,64 +16,58 @@ class StockWindow(BaseWindow):
 
         # Connect UI elements
         self.back_button.clicked.connect(self.goto_main)
-        self.search_input.textChanged.connect(self.search_stock)
-        self.tableWidget.cellClicked.connect(self.handle_cell_click)
-        self.tableWidget.setSortingEnabled(True)
+        self.tableView.clicked.connect(self.handle_cell_click)
         self.add_stock.clicked.connect(self.show_create_stock)
 
+        # Configure table
+        self.table_model, self.table_proxy = self.setup_table(self.tableView, [
+            Column("Stock ID", 0, hidden=True),
+            Column("Medicine ID", 1, hidden=True),
+            Column("Medicine Name", 2),
+            Column("Quantity", 3),
+            Column("Price", 4),
+            Column("Batch", 5),
+            Column("Exp. Date", 6),
+            Column("Supplier", 7),
+            Column("Staff", 8),
+            Column("Created At", 9),
+        ])
+
+        # Search runs server-side on the trigram indexes
+        self.search_service = SearchService(context)
+        self.server_search = ServerSearch(
+            self, self.search_input, self.tableView, self.table_model,
+            self.search_service.search_stock, self.load_stock_data
+        )
+
         # Load data
-        self.load_stock_data()
+        self.server_search.refresh()
 
     def load_stock_data(self):
         """Load stock data into table"""
-        try:
-            sql = """
-                SELECT s.stock_id, sd.medicine_id, m.medicine_name,
-                       sd.quantity, sd.price, sd.batch_number,
-                       sd.expiration_date, sup.supplier_name,
-                       s.staff_id, s.created_at
-                FROM stock_detail sd
-                JOIN stock s ON s.stock_id = sd.stock_id
-                JOIN medicine m ON sd.medicine_id = m.medicine_id
-                JOIN supplier sup ON s.supplier_id = sup.supplier_id
-                ORDER BY s.created_at DESC, s.stock_id DESC
-            """
-            self.db.execute(sql)
-            results = self.db.fetchall()
-
-            # Configure table
-            self.tableWidget.setRowCount(len(results))
-            self.tableWidget.setColumnCount(10)
-            self.tableWidget.setHorizontalHeaderLabels([
-                "Stock ID", "Medicine ID", "Medicine Name", "Quantity",
-                "Price", "Batch", "Exp. Date", "Supplier", "Staff", "Created At"
-            ])
-
-            # Hide ID columns
-            self.tableWidget.setColumnHidden(0, True)
-            self.tableWidget.setColumnHidden(1, True)
-
-            # Populate table
-            for row_idx, row_data in enumerate(results):
-                for col_idx, value in enumerate(row_data):
-                    item = QTableWidgetItem(str(value or ''))
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.tableWidget.setItem(row_idx, col_idx, item)
-
-        except Exception as e:
-            self.show_error(f"Error loading stock data: {e}")
-
-    def search_stock(self):
-        """Search stock by medicine name"""
-        keyword = self.search_input.text().strip().lower()
-
-        for row in range(self.tableWidget.rowCount()):
-            name_item = self.tableWidget.item(row, 2)  # Medicine name column
-            if name_item:
-                match = keyword in name_item.text().lower()
-                self.tableWidget.setRowHidden(row, not match)
-
-    def handle_cell_click(self, row, column):
+        sql = """
+            SELECT s.stock_id, sd.medicine_id, m.medicine_name,
+                   sd.quantity, sd.price, sd.batch_number,
+                   sd.expiration_date, sup.supplier_name,
+                   s.staff_id, s.created_at
+            FROM stock_detail sd
+            JOIN stock s ON s.stock_id = sd.stock_id
+            JOIN medicine m ON sd.medicine_id = m.medicine_id
+            JOIN supplier sup ON s.supplier_id = sup.supplier_id
+            ORDER BY s.created_at DESC, s.stock_id DESC
+        """
+        # Streamed: the first rows show while the rest of the history loads
+        return self.run_stream(sql, on_batch=self._populate_stock_table,
+                               error_message="Error loading stock data")
+
+    def _populate_stock_table(self, rows, first):
+        """Fill stock table with one batch of query results"""
+        if first:
+            self.table_model.set_rows(rows)
+        else:
+            self.table_model.append_rows(rows)
+
+    def handle_cell_click(self, index):
         """Handle cell click to open detail dialog"""
         # Currently no specific detail dialog for stock
         # Could open medicine detail if needed
@@ -85,15 +77,14 @@ class StockWindow(BaseWindow):
         """Show create stock dialog"""
         dialog = CreateStockDialog(self.context, self)
         if dialog.exec():
-            self.load_stock_data()
+            self.server_search.refresh()
+            self.context.navigator.invalidate('main', 'stock', 'expiry')
+            self.context.navigator.invalidate('medicine')
 
     def goto_main(self):
         """Return to main window"""
-        from src.ui.windows.main_window import MainWindow
-        self.main_window = MainWindow(self.context)
-        self.main_window.show()
-        self.close()
+        self.context.navigator.show('main')
 
     def refresh_data(self):
         """Refresh table data"""
-        self.load_stock_data()
+        self.server_search.refresh()
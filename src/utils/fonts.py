@@ -0,0 +1,61 @@
+"""
+Report fonts - registered with reportlab once per process
+"""
+
+import os
+import threading
+
+from ..config.settings import Settings
+
+
+# Font name used by the reports -> TrueType file in Settings.FONTS_DIR
+REPORT_FONTS = {
+    'ArialUnicode': 'arial.ttf',  # Covers Vietnamese
+}
+
+_registered = set()
+_lock = threading.Lock()
+
+
+def register_font(name):
+    """
+    Make a font available to reportlab, parsing its file once per process
+
+    Parsing a TrueType file takes tens of milliseconds and builds the font
+    tables again each time, so every report shares one registration, made
+    when the first PDF is drawn. reportlab's built-in fonts (Helvetica, ...)
+    need no file and are accepted as they are.
+
+    Args:
+        name (str): Font name, a key of REPORT_FONTS or a built-in font
+
+    Returns:
+        str: The font name, ready for setFont()
+
+    Raises:
+        FileNotFoundError: The font's file is missing
+        KeyError: The font is neither known nor built in
+    """
+    if name in _registered:
+        return name
+
+    with _lock:
+        if name in _registered:
+            return name
+
+        from reportlab.pdfbase import pdfmetrics
+
+        if name in pdfmetrics.standardFonts:
+            _registered.add(name)
+            return name
+        if name not in REPORT_FONTS:
+            raise KeyError(f"Unknown report font: {name}")
+
+        font_path = os.path.join(Settings.FONTS_DIR, REPORT_FONTS[name])
+        if not os.path.exists(font_path):
+            raise FileNotFoundError(f"Report font not found: {font_path}")
+
+        from reportlab.pdfbase.ttfonts import TTFont
+        pdfmetrics.registerFont(TTFont(name, font_path))
+        _registered.add(name)
+        return name
@@ -4,7 +4,7 @@ Helper utility functions
 
 import os
 import sys
-import darkdetect
+from functools import lru_cache
 
 
 def resource_path(relative_path):
@@ -24,14 +24,19 @@ def resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 
 
+@lru_cache(maxsize=None)
 def get_theme():
     """
     Detect system theme (dark/light)
 
+    Detected once per process: every window and dialog asks for its icon,
+    and darkdetect may spawn a subprocess to answer.
+
     Returns:
         str: 'dark' or 'light'
     """
     try:
+        import darkdetect
         if darkdetect.isDark():
             return 'dark'
         return 'light'
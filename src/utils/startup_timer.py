@@ -0,0 +1,59 @@
+"""
+Startup timing - how long each launch phase takes until the login dialog
+"""
+
+import time
+
+_started = time.perf_counter()  # run.py imports this module first
+_phases = []  # (label, milliseconds since start)
+
+
+def mark(label):
+    """
+    Record the end of a startup phase
+
+    Args:
+        label (str): Phase name, e.g. 'imports'
+    """
+    _phases.append((label, elapsed_ms()))
+
+
+def elapsed_ms():
+    """Milliseconds since the application started importing"""
+    return (time.perf_counter() - _started) * 1000
+
+
+def phases():
+    """
+    Get the recorded phases
+
+    Returns:
+        list: (label, phase duration ms, total ms) tuples in order
+    """
+    result = []
+    previous = 0.0
+    for label, total in _phases:
+        result.append((label, total - previous, total))
+        previous = total
+    return result
+
+
+def report(budget_ms=None, verbose=False):
+    """
+    Print the startup phases and warn when the budget is exceeded
+
+    Args:
+        budget_ms (float, optional): Time-to-login budget in milliseconds
+        verbose (bool): Print every phase, not only a budget warning
+
+    Returns:
+        float: Total milliseconds up to the last phase recorded
+    """
+    total = _phases[-1][1] if _phases else elapsed_ms()
+    if verbose:
+        print("⏱ Startup phases:")
+        for label, duration, at in phases():
+            print(f"   {label:<24} {duration:8.1f} ms  (at {at:.1f} ms)")
+    if budget_ms is not None and total > budget_ms:
+        print(f"⚠ Startup took {total:.0f} ms, over the {budget_ms} ms budget")
+    return total
@@ -1,10 +1,22 @@
 -- MediManager Database Schema for Supabase (PostgreSQL)
--- This script creates all necessary tables for the MediManager application
+-- Generated from src/core/migrations.py - do not edit by hand:
+--     python -m src.core.migrations > supabase_schema.sql
 
--- Enable UUID extension (if needed in the future)
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INT PRIMARY KEY,
+    description TEXT,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
 
--- Create staff table
+-- Migration 1: Baseline schema
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
 CREATE TABLE IF NOT EXISTS staff (
     staff_id VARCHAR(10) PRIMARY KEY,
     staff_psw TEXT NOT NULL,
@@ -17,20 +29,6 @@ CREATE TABLE IF NOT EXISTS staff (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
-
--- Create trigger for updated_at on staff
-CREATE OR REPLACE FUNCTION update_updated_at_column()
-RETURNS TRIGGER AS $$
-BEGIN
-    NEW.updated_at = CURRENT_TIMESTAMP;
-    RETURN NEW;
-END;
-$$ language 'plpgsql';
-
-CREATE TRIGGER update_staff_updated_at BEFORE UPDATE ON staff
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-
--- Create supplier table
 CREATE TABLE IF NOT EXISTS supplier (
     supplier_id SERIAL PRIMARY KEY,
     supplier_name TEXT,
@@ -42,11 +40,6 @@ CREATE TABLE IF NOT EXISTS supplier (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
-
-CREATE TRIGGER update_supplier_updated_at BEFORE UPDATE ON supplier
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-
--- Create customer table
 CREATE TABLE IF NOT EXISTS customer (
     customer_id SERIAL PRIMARY KEY,
     customer_name TEXT,
@@ -55,11 +48,14 @@ CREATE TABLE IF NOT EXISTS customer (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
-
-CREATE TRIGGER update_customer_updated_at BEFORE UPDATE ON customer
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-
--- Create medicine table
+CREATE TABLE IF NOT EXISTS category (
+    category_id SERIAL PRIMARY KEY,
+    category_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS payment_method (
+    payment_method_id SERIAL PRIMARY KEY,
+    payment_name TEXT NOT NULL
+);
 CREATE TABLE IF NOT EXISTS medicine (
     medicine_id SERIAL PRIMARY KEY,
     medicine_name TEXT,
@@ -76,40 +72,41 @@ CREATE TABLE IF NOT EXISTS medicine (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     unit TEXT
 );
-
-CREATE TRIGGER update_medicine_updated_at BEFORE UPDATE ON medicine
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-
--- Create stock table
 CREATE TABLE IF NOT EXISTS stock (
     stock_id SERIAL PRIMARY KEY,
     medicine_id INT REFERENCES medicine(medicine_id) ON DELETE CASCADE,
     supplier_id INT REFERENCES supplier(supplier_id) ON DELETE SET NULL,
+    staff_id VARCHAR(10) REFERENCES staff(staff_id) ON DELETE SET NULL,
+    payment_method_id INT REFERENCES payment_method(payment_method_id),
     quantity INT DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
-
-CREATE TRIGGER update_stock_updated_at BEFORE UPDATE ON stock
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-
--- Create invoice table
+ALTER TABLE stock ADD COLUMN IF NOT EXISTS staff_id VARCHAR(10) REFERENCES staff(staff_id) ON DELETE SET NULL;
+ALTER TABLE stock ADD COLUMN IF NOT EXISTS payment_method_id INT REFERENCES payment_method(payment_method_id);
+CREATE TABLE IF NOT EXISTS stock_detail (
+    stock_detail_id SERIAL PRIMARY KEY,
+    stock_id INT REFERENCES stock(stock_id) ON DELETE CASCADE,
+    medicine_id INT REFERENCES medicine(medicine_id) ON DELETE CASCADE,
+    quantity INT DEFAULT 0,
+    price DECIMAL(10,0) DEFAULT 0,
+    batch_number TEXT,
+    expiration_date TIMESTAMP,
+    note TEXT
+);
 CREATE TABLE IF NOT EXISTS invoice (
     invoice_id SERIAL PRIMARY KEY,
     invoice_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     customer_id INT REFERENCES customer(customer_id) ON DELETE SET NULL,
     staff_id VARCHAR(10) REFERENCES staff(staff_id) ON DELETE SET NULL,
     total_amount DECIMAL(10,0) DEFAULT 0,
+    payment_method_id INT REFERENCES payment_method(payment_method_id),
     payment_status TEXT DEFAULT 'pending',
     due_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
-
-CREATE TRIGGER update_invoice_updated_at BEFORE UPDATE ON invoice
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
-
--- Create invoice_detail table
+ALTER TABLE invoice ADD COLUMN IF NOT EXISTS payment_method_id INT REFERENCES payment_method(payment_method_id);
 CREATE TABLE IF NOT EXISTS invoice_detail (
     invoice_detail_id SERIAL PRIMARY KEY,
     invoice_id INT REFERENCES invoice(invoice_id) ON DELETE CASCADE,
@@ -118,16 +115,30 @@ CREATE TABLE IF NOT EXISTS invoice_detail (
     sale_price DECIMAL(10,0) DEFAULT 0,
     total_price DECIMAL(10,0) DEFAULT 0
 );
-
--- Create activity_log table
 CREATE TABLE IF NOT EXISTS activity_log (
     log_id SERIAL PRIMARY KEY,
     staff_id VARCHAR(10) REFERENCES staff(staff_id) ON DELETE SET NULL,
     action TEXT,
     log_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
-
--- Create indexes for better performance
+DROP TRIGGER IF EXISTS update_staff_updated_at ON staff;
+CREATE TRIGGER update_staff_updated_at BEFORE UPDATE ON staff
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+DROP TRIGGER IF EXISTS update_supplier_updated_at ON supplier;
+CREATE TRIGGER update_supplier_updated_at BEFORE UPDATE ON supplier
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+DROP TRIGGER IF EXISTS update_customer_updated_at ON customer;
+CREATE TRIGGER update_customer_updated_at BEFORE UPDATE ON customer
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+DROP TRIGGER IF EXISTS update_medicine_updated_at ON medicine;
+CREATE TRIGGER update_medicine_updated_at BEFORE UPDATE ON medicine
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+DROP TRIGGER IF EXISTS update_stock_updated_at ON stock;
+CREATE TRIGGER update_stock_updated_at BEFORE UPDATE ON stock
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+DROP TRIGGER IF EXISTS update_invoice_updated_at ON invoice;
+CREATE TRIGGER update_invoice_updated_at BEFORE UPDATE ON invoice
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE INDEX IF NOT EXISTS idx_medicine_supplier ON medicine(supplier_id);
 CREATE INDEX IF NOT EXISTS idx_medicine_category ON medicine(category_id);
 CREATE INDEX IF NOT EXISTS idx_medicine_expiration ON medicine(expiration_date);
@@ -136,24 +147,146 @@ CREATE INDEX IF NOT EXISTS idx_invoice_staff ON invoice(staff_id);
 CREATE INDEX IF NOT EXISTS idx_invoice_date ON invoice(invoice_date);
 CREATE INDEX IF NOT EXISTS idx_activity_log_staff ON activity_log(staff_id);
 CREATE INDEX IF NOT EXISTS idx_activity_log_time ON activity_log(log_time);
-
--- Insert default admin account (password: admin)
--- Note: The actual password hash will be generated by the application
 INSERT INTO staff (staff_id, staff_psw, staff_name, staff_position, staff_phone, staff_email)
-VALUES ('admin', '$2b$12$placeholder', 'Administrator', 'admin', '0000000000', 'admin@example.com')
+VALUES ('admin', crypt('admin', gen_salt('bf', 12)), 'Administrator', 'admin',
+        '0000000000', 'admin@example.com')
 ON CONFLICT (staff_id) DO NOTHING;
+INSERT INTO schema_version (version, description) VALUES (1, 'Baseline schema') ON CONFLICT (version) DO NOTHING;
+
+-- Migration 2: Trigram search indexes
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent SCHEMA public;
+CREATE OR REPLACE FUNCTION f_unaccent(text)
+RETURNS text AS $$
+    SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+CREATE INDEX IF NOT EXISTS idx_medicine_name_trgm ON medicine USING gin (lower(f_unaccent(medicine_name)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_medicine_generic_trgm ON medicine USING gin (lower(f_unaccent(generic_name)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_medicine_brand_trgm ON medicine USING gin (lower(f_unaccent(brand_name)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_customer_name_trgm ON customer USING gin (lower(f_unaccent(customer_name)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_customer_phone_trgm ON customer USING gin (customer_phone gin_trgm_ops);
+INSERT INTO schema_version (version, description) VALUES (2, 'Trigram search indexes') ON CONFLICT (version) DO NOTHING;
+
+-- Migration 3: Medicine barcode
+ALTER TABLE medicine ADD COLUMN IF NOT EXISTS barcode TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_medicine_barcode ON medicine(barcode) WHERE barcode IS NOT NULL;
+INSERT INTO schema_version (version, description) VALUES (3, 'Medicine barcode') ON CONFLICT (version) DO NOTHING;
+
+-- Migration 4: Foreign key and filter indexes
+CREATE INDEX IF NOT EXISTS idx_invoice_detail_invoice ON invoice_detail(invoice_id);
+CREATE INDEX IF NOT EXISTS idx_invoice_detail_medicine ON invoice_detail(medicine_id);
+CREATE INDEX IF NOT EXISTS idx_invoice_payment_method ON invoice(payment_method_id);
+CREATE INDEX IF NOT EXISTS idx_stock_medicine ON stock(medicine_id);
+CREATE INDEX IF NOT EXISTS idx_stock_supplier ON stock(supplier_id);
+CREATE INDEX IF NOT EXISTS idx_stock_staff ON stock(staff_id);
+CREATE INDEX IF NOT EXISTS idx_stock_payment_method ON stock(payment_method_id);
+CREATE INDEX IF NOT EXISTS idx_stock_detail_stock ON stock_detail(stock_id);
+CREATE INDEX IF NOT EXISTS idx_stock_detail_medicine ON stock_detail(medicine_id);
+CREATE INDEX IF NOT EXISTS idx_customer_phone ON customer(customer_phone);
+CREATE INDEX IF NOT EXISTS idx_medicine_updated_at ON medicine(updated_at);
+INSERT INTO schema_version (version, description) VALUES (4, 'Foreign key and filter indexes') ON CONFLICT (version) DO NOTHING;
+
+-- Migration 5: Activity log keyset indexes
+CREATE INDEX IF NOT EXISTS idx_activity_log_time_id ON activity_log(log_time, log_id);
+CREATE INDEX IF NOT EXISTS idx_activity_log_staff_time ON activity_log(staff_id, log_time, log_id);
+CREATE INDEX IF NOT EXISTS idx_activity_log_action_trgm ON activity_log USING gin (action gin_trgm_ops);
+DROP INDEX IF EXISTS idx_activity_log_time;
+DROP INDEX IF EXISTS idx_activity_log_staff;
+INSERT INTO schema_version (version, description) VALUES (5, 'Activity log keyset indexes') ON CONFLICT (version) DO NOTHING;
+
+-- Migration 6: Prepare activity_log for partitioning
+UPDATE activity_log SET log_time = 'epoch' WHERE log_time IS NULL;
+DO $$
+BEGIN
+    ALTER TABLE activity_log DROP CONSTRAINT IF EXISTS activity_log_partition_bound;
+    EXECUTE format(
+        'ALTER TABLE activity_log ADD CONSTRAINT activity_log_partition_bound '
+        'CHECK (log_time IS NOT NULL AND log_time < %L) NOT VALID',
+        (date_trunc('month', CURRENT_DATE) + INTERVAL '1 month')::date
+    );
+END
+$$;
+ALTER TABLE activity_log VALIDATE CONSTRAINT activity_log_partition_bound;
+CREATE UNIQUE INDEX IF NOT EXISTS activity_log_log_id_log_time_key ON activity_log(log_id, log_time);
+INSERT INTO schema_version (version, description) VALUES (6, 'Prepare activity_log for partitioning') ON CONFLICT (version) DO NOTHING;
+
+-- Migration 7: Monthly activity_log partitions
+CREATE OR REPLACE FUNCTION create_activity_log_partitions(first_month DATE, last_month DATE)
+RETURNS INT AS $$
+DECLARE
+    part_start DATE := date_trunc('month', first_month)::date;
+    part_end DATE;
+    part_name TEXT;
+    created INT := 0;
+BEGIN
+    WHILE part_start <= last_month LOOP
+        part_end := (part_start + INTERVAL '1 month')::date;
+        part_name := 'activity_log_' || to_char(part_start, 'YYYYMM');
+        IF to_regclass(part_name) IS NULL THEN
+            EXECUTE format('CREATE TABLE %I (LIKE activity_log INCLUDING DEFAULTS)', part_name);
+            IF to_regclass('activity_log_default') IS NOT NULL THEN
+                EXECUTE format(
+                    'WITH moved AS (DELETE FROM activity_log_default '
+                    'WHERE log_time >= %L AND log_time < %L RETURNING *) '
+                    'INSERT INTO %I SELECT * FROM moved',
+                    part_start, part_end, part_name
+                );
+            END IF;
+            EXECUTE format(
+                'ALTER TABLE activity_log ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                part_name, part_start, part_end
+            );
+            created := created + 1;
+        END IF;
+        part_start := part_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+DO $$
+DECLARE
+    bound DATE := (date_trunc('month', CURRENT_DATE) + INTERVAL '1 month')::date;
+    old_name TEXT := 'activity_log_' || to_char(CURRENT_DATE, 'YYYYMM');
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'activity_log'::regclass) = 'p' THEN
+        RETURN;
+    END IF;
+
+    ALTER TABLE activity_log ALTER COLUMN log_time SET NOT NULL;
+    ALTER TABLE activity_log DROP CONSTRAINT activity_log_pkey;
+    EXECUTE format(
+        'ALTER TABLE activity_log ADD CONSTRAINT %I PRIMARY KEY '
+        'USING INDEX activity_log_log_id_log_time_key', old_name || '_pkey'
+    );
+    EXECUTE format('ALTER INDEX idx_activity_log_time_id RENAME TO %I',
+                   old_name || '_log_time_log_id_idx');
+    EXECUTE format('ALTER INDEX idx_activity_log_staff_time RENAME TO %I',
+                   old_name || '_staff_id_log_time_log_id_idx');
+    EXECUTE format('ALTER INDEX idx_activity_log_action_trgm RENAME TO %I',
+                   old_name || '_action_idx');
+    EXECUTE format('ALTER TABLE activity_log RENAME TO %I', old_name);
+
+    CREATE TABLE activity_log (
+        log_id INT NOT NULL DEFAULT nextval('activity_log_log_id_seq'),
+        staff_id VARCHAR(10) REFERENCES staff(staff_id) ON DELETE SET NULL,
+        action TEXT,
+        log_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (log_id, log_time)
+    ) PARTITION BY RANGE (log_time);
+    -- Created on the parent, so every partition gets its own copy
+    CREATE INDEX idx_activity_log_time_id ON activity_log(log_time, log_id);
+    CREATE INDEX idx_activity_log_staff_time ON activity_log(staff_id, log_time, log_id);
+    CREATE INDEX idx_activity_log_action_trgm ON activity_log USING gin (action gin_trgm_ops);
 
--- Grant necessary permissions (if using Row Level Security)
--- Uncomment these if you want to enable RLS
--- ALTER TABLE staff ENABLE ROW LEVEL SECURITY;
--- ALTER TABLE supplier ENABLE ROW LEVEL SECURITY;
--- ALTER TABLE customer ENABLE ROW LEVEL SECURITY;
--- ALTER TABLE medicine ENABLE ROW LEVEL SECURITY;
--- ALTER TABLE stock ENABLE ROW LEVEL SECURITY;
--- ALTER TABLE invoice ENABLE ROW LEVEL SECURITY;
--- ALTER TABLE invoice_detail ENABLE ROW LEVEL SECURITY;
--- ALTER TABLE activity_log ENABLE ROW LEVEL SECURITY;
+    EXECUTE format(
+        'ALTER TABLE activity_log ATTACH PARTITION %I FOR VALUES FROM (MINVALUE) TO (%L)',
+        old_name, bound
+    );
+    EXECUTE format('ALTER TABLE %I DROP CONSTRAINT activity_log_partition_bound', old_name);
+    CREATE TABLE activity_log_default PARTITION OF activity_log DEFAULT;
+    ALTER SEQUENCE activity_log_log_id_seq OWNED BY activity_log.log_id;
 
--- Create policies (example - adjust based on your needs)
--- CREATE POLICY "Enable read access for all users" ON staff FOR SELECT USING (true);
--- CREATE POLICY "Enable insert for authenticated users only" ON staff FOR INSERT WITH CHECK (true);
+    PERFORM create_activity_log_partitions(bound, (CURRENT_DATE + INTERVAL '3 months')::date);
+END
+$$;
+INSERT INTO schema_version (version, description) VALUES (7, 'Monthly activity_log partitions') ON CONFLICT (version) DO NOTHING;